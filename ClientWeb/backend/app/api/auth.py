@@ -3,10 +3,15 @@ import logging
 from typing import Dict, Any
 
 import httpx
-from fastapi import APIRouter, HTTPException, status
+import jwt
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, EmailStr, Field
 
+from app.core.auth import verify_token
 from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.rate_limit import RateLimiter, client_ip, get_rate_limiter
+from app.core.resilience import UpstreamGuard, get_upstream_guard
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -49,43 +54,51 @@ class RefreshTokenRequest(BaseModel):
 
 
 @router.post("/login", response_model=LoginResponse)
-async def login(body: LoginRequest):
+async def login(
+    request: Request,
+    body: LoginRequest,
+    client: httpx.AsyncClient = Depends(get_http_client),
+    upstream: UpstreamGuard = Depends(get_upstream_guard),
+    limiter: RateLimiter = Depends(get_rate_limiter),
+):
     """
     Forward login request to main backend.
     Returns challenge_id and MFA setup info if needed.
     """
     logger.info(f"[ClientWeb -> Web] Login request for user: {body.email}")
+    await limiter.hit("login_ip", client_ip(request))
+    await limiter.hit("login_email", body.email.lower())
+    
     try:
         backend_url = f"{settings.backend_api_url}/api/token-user-auth/login"
         payload = {"email": body.email, "password": body.password}
         logger.debug(f"[ClientWeb -> Web] POST {backend_url}")
         logger.debug(f"[ClientWeb -> Web] Payload (password hidden): {{email: {body.email}}}")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(backend_url, json=payload)
-            
-            logger.info(f"[Web -> ClientWeb] Status: {response.status_code}")
-            logger.debug(f"[Web -> ClientWeb] Response headers: {dict(response.headers)}")
-            
-            if response.status_code == 401:
-                logger.warning(f"[ClientWeb] Authentication failed for: {body.email}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid email or password"
-                )
-            
-            if response.status_code != 200:
-                logger.error(f"[Web -> ClientWeb] Backend error: {response.status_code}")
-                logger.error(f"[Web -> ClientWeb] Error details: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Authentication service unavailable"
-                )
-            
-            result = response.json()
-            logger.info(f"[ClientWeb] Login successful for {body.email}, challenge_id: {result.get('challenge_id')}")
-            logger.debug(f"[ClientWeb] MFA setup required: {result.get('mfa_secret_base32') is not None}")
-            return result
+        response = await upstream.call("auth", lambda: client.post(backend_url, json=payload))
+        
+        logger.info(f"[Web -> ClientWeb] Status: {response.status_code}")
+        logger.debug(f"[Web -> ClientWeb] Response headers: {dict(response.headers)}")
+        
+        if response.status_code == 401:
+            logger.warning(f"[ClientWeb] Authentication failed for: {body.email}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid email or password"
+            )
+        
+        if response.status_code != 200:
+            logger.error(f"[Web -> ClientWeb] Backend error: {response.status_code}")
+            logger.error(f"[Web -> ClientWeb] Error details: {response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Authentication service unavailable"
+            )
+        
+        result = response.json()
+        logger.info(f"[ClientWeb] Login successful for {body.email}, challenge_id: {result.get('challenge_id')}")
+        logger.debug(f"[ClientWeb] MFA setup required: {result.get('mfa_secret_base32') is not None}")
+        return result
     
     except httpx.RequestError as e:
         logger.error(f"Failed to connect to backend: {e}")
@@ -96,42 +109,50 @@ async def login(body: LoginRequest):
 
 
 @router.post("/verify-otp", response_model=VerifyOtpResponse)
-async def verify_otp(body: VerifyOtpRequest):
+async def verify_otp(
+    request: Request,
+    body: VerifyOtpRequest,
+    client: httpx.AsyncClient = Depends(get_http_client),
+    upstream: UpstreamGuard = Depends(get_upstream_guard),
+    limiter: RateLimiter = Depends(get_rate_limiter),
+):
     """
     Forward OTP verification to main backend.
     Returns access/refresh tokens on success.
     """
     logger.info(f"[ClientWeb -> Web] Verify OTP for challenge: {body.challenge_id}")
+    await limiter.hit("otp_ip", client_ip(request))
+    await limiter.hit("otp_challenge", body.challenge_id)
+    
     try:
         backend_url = f"{settings.backend_api_url}/api/token-user-auth/verify-otp"
         payload = {"challenge_id": body.challenge_id, "otp": body.otp}
         logger.debug(f"[ClientWeb -> Web] POST {backend_url}")
         logger.debug(f"[ClientWeb -> Web] Payload: {{challenge_id: {body.challenge_id}, otp: ******}}")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(backend_url, json=payload)
-            
-            logger.info(f"[Web -> ClientWeb] Status: {response.status_code}")
-            
-            if response.status_code == 401:
-                logger.warning(f"[ClientWeb] OTP verification failed for challenge: {body.challenge_id}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid or expired OTP code"
-                )
-            
-            if response.status_code != 200:
-                logger.error(f"[Web -> ClientWeb] Backend error: {response.status_code}")
-                logger.error(f"[Web -> ClientWeb] Error details: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Authentication service unavailable"
-                )
-            
-            result = response.json()
-            logger.info(f"[ClientWeb] OTP verified, user: {result.get('user_email')}")
-            logger.debug(f"[ClientWeb] Token issued for user_id: {result.get('user_id')}")
-            return result
+        response = await upstream.call("auth", lambda: client.post(backend_url, json=payload))
+        
+        logger.info(f"[Web -> ClientWeb] Status: {response.status_code}")
+        
+        if response.status_code == 401:
+            logger.warning(f"[ClientWeb] OTP verification failed for challenge: {body.challenge_id}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired OTP code"
+            )
+        
+        if response.status_code != 200:
+            logger.error(f"[Web -> ClientWeb] Backend error: {response.status_code}")
+            logger.error(f"[Web -> ClientWeb] Error details: {response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Authentication service unavailable"
+            )
+        
+        result = response.json()
+        logger.info(f"[ClientWeb] OTP verified, user: {result.get('user_email')}")
+        logger.debug(f"[ClientWeb] Token issued for user_id: {result.get('user_id')}")
+        return result
     
     except httpx.RequestError as e:
         logger.error(f"Failed to connect to backend: {e}")
@@ -142,42 +163,59 @@ async def verify_otp(body: VerifyOtpRequest):
 
 
 @router.post("/refresh", response_model=VerifyOtpResponse)
-async def refresh_token(body: RefreshTokenRequest):
+async def refresh_token(
+    request: Request,
+    body: RefreshTokenRequest,
+    client: httpx.AsyncClient = Depends(get_http_client),
+    upstream: UpstreamGuard = Depends(get_upstream_guard),
+    limiter: RateLimiter = Depends(get_rate_limiter),
+):
     """
     Forward token refresh request to main backend.
     Returns new access/refresh tokens.
     """
     logger.info("[ClientWeb -> Web] Token refresh request")
+    await limiter.hit("refresh_ip", client_ip(request))
+    
+    if settings.jwt_local_validation:
+        try:
+            verify_token(body.refresh_token, token_type="refresh")
+        except jwt.InvalidTokenError as e:
+            logger.warning(f"[ClientWeb] Refresh token rejected locally: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired refresh token"
+            )
+    
     try:
         backend_url = f"{settings.backend_api_url}/api/token-user-auth/refresh"
         logger.debug(f"[ClientWeb -> Web] POST {backend_url}")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                backend_url,
-                json={"refresh_token": body.refresh_token}
+        response = await upstream.call(
+            "auth",
+            lambda: client.post(backend_url, json={"refresh_token": body.refresh_token})
+        )
+        
+        logger.info(f"[Web -> ClientWeb] Status: {response.status_code}")
+        
+        if response.status_code == 401:
+            logger.warning("[ClientWeb] Token refresh failed - invalid or expired")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired refresh token"
             )
-            
-            logger.info(f"[Web -> ClientWeb] Status: {response.status_code}")
-            
-            if response.status_code == 401:
-                logger.warning("[ClientWeb] Token refresh failed - invalid or expired")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid or expired refresh token"
-                )
-            
-            if response.status_code != 200:
-                logger.error(f"[Web -> ClientWeb] Backend error: {response.status_code}")
-                logger.error(f"[Web -> ClientWeb] Error details: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Authentication service unavailable"
-                )
-            
-            result = response.json()
-            logger.info(f"[ClientWeb] Token refreshed for user: {result.get('user_email')}")
-            return result
+        
+        if response.status_code != 200:
+            logger.error(f"[Web -> ClientWeb] Backend error: {response.status_code}")
+            logger.error(f"[Web -> ClientWeb] Error details: {response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Authentication service unavailable"
+            )
+        
+        result = response.json()
+        logger.info(f"[ClientWeb] Token refreshed for user: {result.get('user_email')}")
+        return result
     
     except httpx.RequestError as e:
         logger.error(f"Failed to connect to backend: {e}")
@@ -1,13 +1,20 @@
 """Shares API endpoints - proxy to main backend with authentication."""
+import asyncio
 import logging
-from typing import List
+from typing import Any, AsyncIterator, Dict, List
 
 import httpx
-from fastapi import APIRouter, HTTPException, Header, status
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 
+from app.core.auth import Principal, get_principal
+from app.core.cache import ResponseCache, get_response_cache
 from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.resilience import CircuitOpenError, UpstreamGuard, get_upstream_guard
+from app.core.singleflight import SingleFlight, get_singleflight
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -27,52 +34,62 @@ class ShareItem(BaseModel):
     last_downloaded_at_utc: str | None
 
 
-@router.get("/my-shares", response_model=List[ShareItem])
-async def get_my_shares(authorization: str = Header(None)):
+async def _fetch_user_view(
+    view: str,
+    backend_path: str,
+    principal: Principal,
+    client: httpx.AsyncClient,
+    cache: ResponseCache,
+    flights: SingleFlight,
+    upstream: UpstreamGuard,
+) -> List[Dict[str, Any]]:
     """
-    Get all shares assigned to the current user.
-    Forwards request to main backend with auth token.
+    Return a cached per-user view, or fetch it from the main backend and
+    cache it. Raises HTTPException for upstream errors.
     """
-    logger.info("[ClientWeb -> Web] Get my shares request")
-    
-    if not authorization:
-        logger.warning("[ClientWeb] Missing authorization header")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authorization header"
-        )
+    cached = await cache.get(principal, view)
+    if cached is not None:
+        logger.info(f"[ClientWeb] Retrieved {len(cached)} {view} entries from cache")
+        return cached
+    generation = cache.generation(principal)
     
     try:
-        backend_url = f"{settings.backend_api_url}/api/my-shares"
+        backend_url = f"{settings.backend_api_url}{backend_path}"
         logger.debug(f"[ClientWeb -> Web] GET {backend_url}")
-        logger.debug(f"[ClientWeb -> Web] Auth header present: {authorization[:20]}...")
+        logger.debug(f"[ClientWeb -> Web] Auth header present: {principal.authorization[:20]}...")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                backend_url,
-                headers={"Authorization": authorization}
+        # Identical concurrent requests from the same user share one upstream call;
+        # after an invalidation new requests start a fresh call instead of joining an older one
+        response = await flights.do(
+            ("GET", backend_url, principal.key, generation),
+            lambda: upstream.call(
+                "shares",
+                lambda: client.get(backend_url, headers=principal.upstream_headers()),
+                idempotent=True
             )
-            
-            logger.info(f"[Web -> ClientWeb] Status: {response.status_code}")
-            
-            if response.status_code == 401:
-                logger.warning("[ClientWeb] Token validation failed")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid or expired token"
-                )
-            
-            if response.status_code != 200:
-                logger.error(f"[Web -> ClientWeb] Backend error: {response.status_code}")
-                logger.error(f"[Web -> ClientWeb] Error details: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Service unavailable"
-                )
-            
-            result = response.json()
-            logger.info(f"[ClientWeb] Retrieved {len(result)} shares")
-            return result
+        )
+        
+        logger.info(f"[Web -> ClientWeb] Status: {response.status_code}")
+        
+        if response.status_code == 401:
+            logger.warning("[ClientWeb] Token validation failed")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token"
+            )
+        
+        if response.status_code != 200:
+            logger.error(f"[Web -> ClientWeb] Backend error: {response.status_code}")
+            logger.error(f"[Web -> ClientWeb] Error details: {response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Service unavailable"
+            )
+        
+        result = response.json()
+        logger.info(f"[ClientWeb] Retrieved {len(result)} {view} entries")
+        await cache.set(principal, view, result, generation)
+        return result
     
     except httpx.RequestError as e:
         logger.error(f"Failed to connect to backend: {e}")
@@ -82,71 +99,85 @@ async def get_my_shares(authorization: str = Header(None)):
         )
 
 
+@router.get("/my-shares", response_model=List[ShareItem])
+async def get_my_shares(
+    principal: Principal = Depends(get_principal),
+    client: httpx.AsyncClient = Depends(get_http_client),
+    cache: ResponseCache = Depends(get_response_cache),
+    flights: SingleFlight = Depends(get_singleflight),
+    upstream: UpstreamGuard = Depends(get_upstream_guard),
+):
+    """
+    Get all shares assigned to the current user.
+    Served from the per-user cache when fresh, otherwise forwarded to the
+    main backend with auth token.
+    """
+    logger.info("[ClientWeb -> Web] Get my shares request")
+    return await _fetch_user_view("my-shares", "/api/my-shares", principal, client, cache, flights, upstream)
+
+
+# Upstream headers relayed to the browser on a successful download
+DOWNLOAD_FORWARD_HEADERS = (
+    "content-disposition",
+    "content-length",
+    "content-encoding",
+    "x-share-number",
+    "x-token-name",
+    "x-download-count",
+)
+
+
+async def _relay_download(response: httpx.Response, assignment_id: str) -> AsyncIterator[bytes]:
+    """Relay the upstream body chunk by chunk and release the connection afterwards."""
+    size = 0
+    try:
+        async for chunk in response.aiter_raw():
+            size += len(chunk)
+            yield chunk
+        logger.info(f"[ClientWeb] Share download successful for assignment {assignment_id}, size: {size} bytes")
+    finally:
+        await response.aclose()
+
+
 @router.get("/download/{assignment_id}")
-async def download_share(assignment_id: str, authorization: str = Header(None)):
+async def download_share(
+    assignment_id: str,
+    principal: Principal = Depends(get_principal),
+    client: httpx.AsyncClient = Depends(get_http_client),
+    cache: ResponseCache = Depends(get_response_cache),
+    upstream: UpstreamGuard = Depends(get_upstream_guard),
+):
     """
     Download share file.
-    Forwards request to main backend with auth token.
+    Forwards request to main backend with auth token and streams the
+    upstream body to the client without buffering it in the proxy.
     """
     logger.info(f"[ClientWeb -> Web] Download share request for assignment: {assignment_id}")
     
-    if not authorization:
-        logger.warning("[ClientWeb] Missing authorization header")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authorization header"
-        )
-    
     try:
         backend_url = f"{settings.backend_api_url}/api/my-shares/download/{assignment_id}"
         logger.debug(f"[ClientWeb -> Web] GET {backend_url}")
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.get(
-                backend_url,
-                headers={"Authorization": authorization}
-            )
-            
-            logger.info(f"[Web -> ClientWeb] Status: {response.status_code}")
-            
-            if response.status_code == 401:
-                logger.warning("[ClientWeb] Token validation failed")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid or expired token"
-                )
-            
-            if response.status_code == 403:
-                logger.warning(f"[ClientWeb] Download not allowed for assignment: {assignment_id}")
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Download not allowed or already downloaded"
-                )
-            
-            if response.status_code == 404:
-                logger.warning(f"[ClientWeb] Share not found: {assignment_id}")
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Share not found"
-                )
-            
-            if response.status_code != 200:
-                logger.error(f"[Web -> ClientWeb] Backend error: {response.status_code}")
-                logger.error(f"[Web -> ClientWeb] Error details: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Service unavailable"
-                )
-            
-            logger.info(f"[ClientWeb] Share download successful, size: {len(response.content)} bytes")
-            # Forward the file download response
-            return Response(
-                content=response.content,
-                media_type=response.headers.get("content-type", "application/json"),
-                headers={
-                    "Content-Disposition": response.headers.get("content-disposition", "attachment")
-                }
-            )
+        upstream_request = client.build_request(
+            "GET",
+            backend_url,
+            headers=principal.upstream_headers(),
+            timeout=settings.upstream_download_timeout_seconds
+        )
+        # Downloads bump the upstream download counter, so they are never retried
+        response = await upstream.call(
+            "download",
+            lambda: client.send(upstream_request, stream=True)
+        )
+        
+        logger.info(f"[Web -> ClientWeb] Status: {response.status_code}")
+        
+        if response.status_code != 200:
+            # Error bodies are small; read them so the connection can be reused
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
     
     except httpx.RequestError as e:
         logger.error(f"Failed to connect to backend: {e}")
@@ -154,57 +185,124 @@ async def download_share(assignment_id: str, authorization: str = Header(None)):
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Service unavailable"
         )
+    
+    if response.status_code == 401:
+        logger.warning("[ClientWeb] Token validation failed")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token"
+        )
+    
+    if response.status_code == 403:
+        logger.warning(f"[ClientWeb] Download not allowed for assignment: {assignment_id}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Download not allowed or already downloaded"
+        )
+    
+    if response.status_code == 404:
+        logger.warning(f"[ClientWeb] Share not found: {assignment_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Share not found"
+        )
+    
+    if response.status_code != 200:
+        logger.error(f"[Web -> ClientWeb] Backend error: {response.status_code}")
+        logger.error(f"[Web -> ClientWeb] Error details: {response.text}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Service unavailable"
+        )
+    
+    try:
+        # Download counters and history changed upstream
+        await cache.invalidate(principal)
+    except BaseException:
+        await response.aclose()
+        raise
+    
+    headers = {
+        name: response.headers[name]
+        for name in DOWNLOAD_FORWARD_HEADERS
+        if name in response.headers
+    }
+    headers.setdefault("content-disposition", "attachment")
+    
+    # Forward the file download response as a stream. The background task
+    # releases the upstream connection even when the client disconnects
+    # before the body starts and the relay generator never runs; closing
+    # an already closed httpx response is a no-op.
+    return StreamingResponse(
+        _relay_download(response, assignment_id),
+        media_type=response.headers.get("content-type", "application/json"),
+        headers=headers,
+        background=BackgroundTask(response.aclose)
+    )
 
 
 @router.get("/history")
-async def get_download_history(authorization: str = Header(None)):
+async def get_download_history(
+    principal: Principal = Depends(get_principal),
+    client: httpx.AsyncClient = Depends(get_http_client),
+    cache: ResponseCache = Depends(get_response_cache),
+    flights: SingleFlight = Depends(get_singleflight),
+    upstream: UpstreamGuard = Depends(get_upstream_guard),
+):
     """
     Get download history for current user.
-    Forwards request to main backend with auth token.
+    Served from the per-user cache when fresh, otherwise forwarded to the
+    main backend with auth token.
     """
     logger.info("[ClientWeb -> Web] Get download history request")
+    return await _fetch_user_view("history", "/api/my-shares/history", principal, client, cache, flights, upstream)
+
+
+class DashboardResponse(BaseModel):
+    """Landing view payload; a section is null when it could not be loaded."""
+    shares: List[ShareItem] | None
+    history: List[Dict[str, Any]] | None
+    errors: Dict[str, str] = {}
+
+
+@router.get("/dashboard", response_model=DashboardResponse)
+async def get_dashboard(
+    principal: Principal = Depends(get_principal),
+    client: httpx.AsyncClient = Depends(get_http_client),
+    cache: ResponseCache = Depends(get_response_cache),
+    flights: SingleFlight = Depends(get_singleflight),
+    upstream: UpstreamGuard = Depends(get_upstream_guard),
+):
+    """
+    Get shares and download history in one call.
+    Both views are fetched concurrently; if only one fails, the other is
+    still returned and the failure is reported under `errors`.
+    """
+    logger.info("[ClientWeb -> Web] Get dashboard request")
     
-    if not authorization:
-        logger.warning("[ClientWeb] Missing authorization header")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authorization header"
-        )
+    sections = ("shares", "history")
+    results = await asyncio.gather(
+        _fetch_user_view("my-shares", "/api/my-shares", principal, client, cache, flights, upstream),
+        _fetch_user_view("history", "/api/my-shares/history", principal, client, cache, flights, upstream),
+        return_exceptions=True,
+    )
     
-    try:
-        backend_url = f"{settings.backend_api_url}/api/my-shares/history"
-        logger.debug(f"[ClientWeb -> Web] GET {backend_url}")
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                backend_url,
-                headers={"Authorization": authorization}
-            )
-            
-            logger.info(f"[Web -> ClientWeb] Status: {response.status_code}")
-            
-            if response.status_code == 401:
-                logger.warning("[ClientWeb] Token validation failed")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid or expired token"
-                )
-            
-            if response.status_code != 200:
-                logger.error(f"[Web -> ClientWeb] Backend error: {response.status_code}")
-                logger.error(f"[Web -> ClientWeb] Error details: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Service unavailable"
-                )
-            
-            result = response.json()
-            logger.info(f"[ClientWeb] Retrieved {len(result)} history entries")
-            return result
+    failures = {name: result for name, result in zip(sections, results) if isinstance(result, Exception)}
+    for result in failures.values():
+        # A rejected token or an unexpected error fails the whole request
+        if not isinstance(result, (HTTPException, CircuitOpenError)):
+            raise result
+        if isinstance(result, HTTPException) and result.status_code == status.HTTP_401_UNAUTHORIZED:
+            raise result
+    if len(failures) == len(sections):
+        raise failures["shares"]
     
-    except httpx.RequestError as e:
-        logger.error(f"Failed to connect to backend: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Service unavailable"
-        )
+    payload: Dict[str, Any] = {"errors": {}}
+    for name, result in zip(sections, results):
+        if name in failures:
+            logger.warning(f"[ClientWeb] Dashboard section '{name}' unavailable: {result}")
+            payload[name] = None
+            payload["errors"][name] = "Service unavailable"
+        else:
+            payload[name] = result
+    return payload
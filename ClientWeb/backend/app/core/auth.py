@@ -0,0 +1,115 @@
+"""Local bearer token pre-validation for proxied requests."""
+import hashlib
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict
+
+import jwt
+from fastapi import Header, HTTPException, status
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TOKEN_SHARE_USER_ROLE = "TokenShareUser"
+VERIFIED_USER_HEADER = "X-ClientWeb-Verified-User"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Caller of a proxied request, identified by its bearer token."""
+    authorization: str
+    user_id: str | None = None  # set only when the token was verified locally
+
+    @property
+    def key(self) -> str:
+        """Stable identity for per-user state (verified user id, else a token digest)."""
+        if self.user_id:
+            return f"user:{self.user_id}"
+        return "token:" + hashlib.sha256(self.authorization.encode()).hexdigest()
+
+    def upstream_headers(self) -> Dict[str, str]:
+        """Headers to send to the main backend for this caller."""
+        headers = {"Authorization": self.authorization}
+        if self.user_id:
+            headers[VERIFIED_USER_HEADER] = self.user_id
+        return headers
+
+
+@lru_cache(maxsize=1)
+def _verification_key() -> tuple[bytes, tuple[str, ...]]:
+    """Key material and allowed algorithms, resolved once per process."""
+    return settings.jwt_secret_key.encode(), (settings.jwt_algorithm,)
+
+
+def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
+    """
+    Verify signature, issuer, expiry, type and role of a main-backend JWT.
+    Raises jwt.InvalidTokenError when any check fails.
+    """
+    key, algorithms = _verification_key()
+    claims = jwt.decode(
+        token,
+        key,
+        algorithms=list(algorithms),
+        issuer=settings.jwt_issuer,
+        leeway=settings.jwt_leeway_seconds,
+        options={"require": ["iss", "iat", "exp", "sub"]},
+    )
+    if claims.get("type") != token_type:
+        raise jwt.InvalidTokenError("Invalid token type")
+    if claims.get("role") != TOKEN_SHARE_USER_ROLE:
+        raise jwt.InvalidTokenError("Invalid user type")
+    return claims
+
+
+def check_local_validation_settings() -> None:
+    """Refuse to start local validation that could not check the token issuer."""
+    if settings.jwt_local_validation and not settings.jwt_issuer:
+        raise RuntimeError(
+            "JWT_LOCAL_VALIDATION=true requires JWT_ISSUER "
+            "(the TOKENCONTROL_JWT_ISSUER of the main backend)"
+        )
+
+
+def _bearer_token(authorization: str) -> str | None:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
+
+
+async def get_principal(authorization: str = Header(None)) -> Principal:
+    """
+    Require a bearer token and, when local validation is enabled, verify it
+    without contacting the main backend. Bad tokens are rejected with 401.
+    """
+    if not authorization:
+        logger.warning("[ClientWeb] Missing authorization header")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing authorization header"
+        )
+
+    if not settings.jwt_local_validation:
+        return Principal(authorization=authorization)
+
+    token = _bearer_token(authorization)
+    if token is None:
+        logger.warning("[ClientWeb] Malformed authorization header")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token"
+        )
+
+    try:
+        claims = verify_token(token)
+    except jwt.InvalidTokenError as e:
+        logger.warning(f"[ClientWeb] Token rejected locally: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token"
+        )
+
+    return Principal(authorization=authorization, user_id=claims["sub"])
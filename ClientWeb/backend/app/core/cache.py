@@ -0,0 +1,210 @@
+"""Per-user TTL cache for proxied read-only responses."""
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterable
+
+from fastapi import Request
+
+from app.core.auth import Principal
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Cached views per user; a successful download invalidates all of them
+USER_CACHE_VIEWS = ("my-shares", "history")
+
+
+class CacheBackend(ABC):
+    """Storage interface for the response cache."""
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Stored value, or None when missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """Store `value` under `key` for `ttl_seconds`."""
+
+    @abstractmethod
+    async def delete(self, keys: Iterable[str]) -> None:
+        """Remove `keys`; missing keys are ignored."""
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Process-local LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared across workers through any Redis-compatible server."""
+
+    def __init__(self, url: str, prefix: str = "clientweb:cache:"):
+        import redis.asyncio as redis  # optional dependency
+
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self._client.set(self.prefix + key, value, px=int(ttl_seconds * 1000))
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        keys = [self.prefix + key for key in keys]
+        if keys:
+            await self._client.delete(*keys)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class ResponseCache:
+    """
+    JSON response cache keyed by principal and view, with hit/miss metrics.
+
+    Each user has a generation, bumped by `invalidate`. A fetch records the
+    generation before calling upstream and passes it to `set`, which drops
+    the write if the cache was invalidated meanwhile, so a read that started
+    before a download cannot put the pre-download view back. Generations are
+    per process, like the invalidation of the in-memory backend.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale_writes = 0
+        self.errors = 0
+        self._generations: Dict[str, int] = {}
+
+    @staticmethod
+    def key(principal: Principal, view: str) -> str:
+        return f"user:{principal.user_id}:{view}"
+
+    def _cacheable(self, principal: Principal) -> bool:
+        # A hit skips the upstream auth check, so only callers whose token was
+        # verified locally (signature, expiry) are served from or stored in the cache
+        return self.enabled and principal.user_id is not None
+
+    def generation(self, principal: Principal) -> int:
+        """Current generation of the principal's cached views."""
+        return self._generations.get(principal.key, 0)
+
+    async def get(self, principal: Principal, view: str) -> Any | None:
+        if not self._cacheable(principal):
+            return None
+        try:
+            raw = await self.backend.get(self.key(principal, view))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"[ClientWeb] Cache read failed: {e}")
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, principal: Principal, view: str, value: Any, generation: int | None = None) -> None:
+        """Store `value`; skipped when `generation` predates the last invalidation."""
+        if not self._cacheable(principal):
+            return
+        if generation is not None and generation != self.generation(principal):
+            self.stale_writes += 1
+            return
+        try:
+            await self.backend.set(self.key(principal, view), json.dumps(value).encode(), self.ttl_seconds)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"[ClientWeb] Cache write failed: {e}")
+
+    async def invalidate(self, principal: Principal) -> None:
+        """Drop every cached view of this principal."""
+        if not self._cacheable(principal):
+            return
+        self._generations[principal.key] = self.generation(principal) + 1
+        self.invalidations += 1
+        try:
+            await self.backend.delete(self.key(principal, view) for view in USER_CACHE_VIEWS)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"[ClientWeb] Cache invalidation failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "stale_writes": self.stale_writes,
+            "errors": self.errors,
+        }
+
+
+def create_response_cache() -> ResponseCache:
+    """
+    Build the response cache from settings (in-memory unless CACHE_BACKEND=redis).
+
+    The cache needs JWT_LOCAL_VALIDATION: without it callers are not verified
+    before a cache hit, so it stays off. The in-memory backend is per worker and
+    a download only invalidates the worker that served it; run several workers
+    with the redis backend.
+    """
+    if settings.cache_backend == "redis":
+        backend: CacheBackend = RedisCacheBackend(settings.cache_redis_url)
+    else:
+        backend = InMemoryCacheBackend(settings.cache_max_entries)
+    enabled = settings.cache_enabled and settings.jwt_local_validation
+    if settings.cache_enabled and not enabled:
+        logger.warning(
+            "[ClientWeb] CACHE_ENABLED=true has no effect: the response cache only serves "
+            "locally verified callers and JWT_LOCAL_VALIDATION is off; every my-shares/history "
+            "request goes to the main backend"
+        )
+    logger.info(
+        f"[ClientWeb] Response cache: backend={type(backend).__name__}, "
+        f"ttl={settings.cache_ttl_seconds}s, enabled={enabled}"
+    )
+    return ResponseCache(backend, settings.cache_ttl_seconds, enabled=enabled)
+
+
+def get_response_cache(request: Request) -> ResponseCache:
+    """FastAPI dependency returning the application's response cache."""
+    return request.app.state.response_cache
@@ -18,13 +18,66 @@ class Settings(BaseSettings):
     # Backend API URL (main Aegis Mint backend)
     backend_api_url: str = "http://127.0.0.1:8000"
     
+    # "http": proxy over the network to BACKEND_API_URL
+    # "asgi": load the Web backend into this process and call it without sockets
+    upstream_mode: str = "http"
+    web_backend_path: str = "../../Web/backend"
+    
+    # Upstream (main backend) HTTP client
+    upstream_timeout_seconds: float = 30.0
+    upstream_download_timeout_seconds: float = 60.0
+    upstream_connect_timeout_seconds: float = 5.0
+    upstream_pool_timeout_seconds: float = 5.0
+    upstream_max_connections: int = 100
+    upstream_max_keepalive_connections: int = 20
+    upstream_keepalive_expiry_seconds: float = 30.0
+    upstream_http2: bool = False  # requires the 'h2' package (httpx[http2])
+    
+    # Circuit breaker per upstream route group (auth, shares, download)
+    breaker_failure_threshold: int = 5
+    breaker_recovery_seconds: float = 30.0
+    breaker_half_open_max_calls: int = 1
+    
+    # Retries for idempotent GETs, limited by a global retry budget
+    retry_max_attempts: int = 2
+    retry_backoff_base_seconds: float = 0.1
+    retry_backoff_max_seconds: float = 2.0
+    retry_budget_ratio: float = 0.1  # retry tokens earned per upstream call
+    retry_budget_max_tokens: float = 20.0
+    
+    # Per-user response cache for my-shares/history
+    cache_enabled: bool = True
+    cache_ttl_seconds: float = 30.0
+    cache_max_entries: int = 10000
+    cache_backend: str = "memory"  # "memory" or "redis"
+    cache_redis_url: str = "redis://127.0.0.1:6379/0"
+    
+    # Token-bucket rate limits for /api/auth (requests per minute, also the burst size; 0 disables)
+    rate_limit_enabled: bool = True
+    rate_limit_login_per_ip_per_minute: int = 20
+    rate_limit_login_per_email_per_minute: int = 5
+    rate_limit_otp_per_ip_per_minute: int = 20
+    rate_limit_otp_per_challenge_per_minute: int = 5
+    rate_limit_refresh_per_ip_per_minute: int = 30
+    rate_limit_backend: str = "memory"  # "memory" or "redis"
+    rate_limit_redis_url: str = "redis://127.0.0.1:6379/0"
+    rate_limit_max_keys: int = 100000
+    rate_limit_trust_forwarded_for: bool = False  # only behind a trusted reverse proxy
+    
     # JWT Secret (should match main backend for token verification)
     jwt_secret_key: str = "your-secret-key-here-change-in-production"
     jwt_algorithm: str = "HS256"
+    jwt_issuer: str = ""  # must match TOKENCONTROL_JWT_ISSUER of the main backend
+    jwt_leeway_seconds: int = 10
+    # Verify bearer tokens locally and reject bad ones without an upstream call
+    jwt_local_validation: bool = False
     
     # Session
     session_timeout_minutes: int = 60
     
+    # GET /stats (runtime counters) is only served with this bearer token set
+    stats_token: str = ""
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
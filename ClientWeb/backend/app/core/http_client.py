@@ -0,0 +1,50 @@
+"""Shared HTTP client for proxying requests to the main backend."""
+import importlib.util
+import logging
+
+import httpx
+from fastapi import FastAPI, Request
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_client(web_app: FastAPI | None = None) -> httpx.AsyncClient:
+    """
+    Build the pooled AsyncClient used by all proxy routes.
+    Connections to the main backend are kept alive and reused across requests.
+    With `web_app` the client calls that application in-process instead.
+    """
+    if web_app is not None:
+        logger.info("[ClientWeb] Upstream client: in-process ASGI transport")
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=web_app, client=("127.0.0.1", 0)),
+            timeout=settings.upstream_timeout_seconds,
+        )
+    
+    http2 = settings.upstream_http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("[ClientWeb] UPSTREAM_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.upstream_max_connections,
+        max_keepalive_connections=settings.upstream_max_keepalive_connections,
+        keepalive_expiry=settings.upstream_keepalive_expiry_seconds,
+    )
+    timeout = httpx.Timeout(
+        settings.upstream_timeout_seconds,
+        connect=settings.upstream_connect_timeout_seconds,
+        pool=settings.upstream_pool_timeout_seconds,
+    )
+    logger.info(
+        f"[ClientWeb] Upstream client: max_connections={limits.max_connections}, "
+        f"keepalive={limits.max_keepalive_connections}, http2={http2}"
+    )
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=http2)
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """FastAPI dependency returning the application's shared upstream client."""
+    return request.app.state.http_client
@@ -0,0 +1,65 @@
+"""Load the main (Web) backend into this process for socket-free proxying."""
+import importlib
+import logging
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from dotenv import dotenv_values
+from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+WEB_ENV_PREFIX = "TOKENCONTROL_"
+
+
+def _is_app_module(name: str) -> bool:
+    return name == "app" or name.startswith("app.")
+
+
+def _clientweb_has(name: str) -> bool:
+    """True if ClientWeb's own `app` package provides the top-level subpackage of `name`."""
+    parts = name.split(".")
+    if len(parts) < 2:
+        return True
+    root = Path(__file__).resolve().parents[1]
+    return (root / parts[1]).is_dir() or (root / f"{parts[1]}.py").is_file()
+
+
+@lru_cache(maxsize=None)
+def load_web_app(backend_path: str) -> FastAPI:
+    """
+    Import the Web backend's FastAPI app from `backend_path` (the Web/backend directory).
+
+    Both backends use a top-level `app` package, so the Web package is imported
+    with ClientWeb's modules temporarily set aside. Afterwards ClientWeb's modules
+    are restored; Web modules outside the subpackages ClientWeb defines (app.db,
+    app.models, app.services, ...) stay registered so the Web code's
+    function-level imports keep resolving to the already loaded modules.
+    """
+    path = Path(backend_path).resolve()
+    if not (path / "app" / "main.py").is_file():
+        raise RuntimeError(f"Web backend not found at {path} (set WEB_BACKEND_PATH)")
+
+    # Web settings come from TOKENCONTROL_* variables; fall back to the Web backend's .env
+    for key, value in dotenv_values(path / ".env").items():
+        if key.upper().startswith(WEB_ENV_PREFIX) and value is not None:
+            os.environ.setdefault(key, value)
+
+    own = {name: module for name, module in sys.modules.items() if _is_app_module(name)}
+    for name in own:
+        del sys.modules[name]
+    sys.path.insert(0, str(path))
+    try:
+        web_main = importlib.import_module("app.main")
+    finally:
+        sys.path.remove(str(path))
+        web = {name: sys.modules.pop(name) for name in list(sys.modules) if _is_app_module(name)}
+        sys.modules.update(own)
+        for name, module in web.items():
+            if not _clientweb_has(name):
+                sys.modules[name] = module
+
+    logger.info(f"[ClientWeb] Loaded Web backend in-process from {path}")
+    return web_main.app
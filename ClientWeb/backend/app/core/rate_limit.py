@@ -0,0 +1,174 @@
+"""Token-bucket rate limiting for the authentication proxy routes."""
+import hashlib
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBackend(ABC):
+    """Storage interface for token buckets."""
+
+    @abstractmethod
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> Tuple[bool, float]:
+        """Take one token from the bucket; returns (allowed, seconds until a token is available)."""
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process buckets, least recently used evicted beyond max_keys."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / refill_per_second
+
+
+# Atomic refill-and-take; returns {allowed, retry_after_ms}
+_REDIS_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+else
+  retry_after = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity * 1000 / rate) + 1000)
+return {allowed, retry_after}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Buckets shared across workers through any Redis-compatible server."""
+
+    def __init__(self, url: str, prefix: str = "clientweb:ratelimit:"):
+        import redis.asyncio as redis  # optional dependency
+
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._take = self._client.register_script(_REDIS_TAKE_SCRIPT)
+
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> Tuple[bool, float]:
+        now_ms = int(time.time() * 1000)
+        allowed, retry_after_ms = await self._take(
+            keys=[self.prefix + key],
+            args=[capacity, refill_per_second, now_ms],
+        )
+        return bool(allowed), int(retry_after_ms) / 1000
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class RateLimiter:
+    """
+    Named per-minute limits checked against client-IP and identity buckets.
+    Each limit allows a burst of `per_minute` requests, refilled evenly over a minute.
+    """
+
+    def __init__(self, backend: RateLimitBackend, limits: Dict[str, int], enabled: bool = True):
+        self.backend = backend
+        self.limits = limits
+        self.enabled = enabled
+        self.allowed: Dict[str, int] = {name: 0 for name in limits}
+        self.rejected: Dict[str, int] = {name: 0 for name in limits}
+        self.errors = 0
+
+    async def hit(self, limit: str, identity: str) -> None:
+        """Consume one token for `identity` under `limit`; raise 429 when the bucket is empty."""
+        if not self.enabled:
+            return
+        per_minute = self.limits[limit]
+        if per_minute <= 0:
+            return
+        key = f"{limit}:{hashlib.sha256(identity.encode()).hexdigest()}"
+        try:
+            allowed, retry_after = await self.backend.take(key, per_minute, per_minute / 60)
+        except Exception as e:
+            # Fail open: a broken limiter store must not lock everyone out
+            self.errors += 1
+            logger.warning(f"[ClientWeb] Rate limiter unavailable: {e}")
+            return
+        if allowed:
+            self.allowed[limit] += 1
+            return
+        self.rejected[limit] += 1
+        logger.warning(f"[ClientWeb] Rate limit '{limit}' exceeded")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please try again later",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "allowed": dict(self.allowed),
+            "rejected": dict(self.rejected),
+            "errors": self.errors,
+        }
+
+
+def client_ip(request: Request) -> str:
+    """Caller address; the first X-Forwarded-For hop only when the proxy in front is trusted."""
+    if settings.rate_limit_trust_forwarded_for:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Build the rate limiter from settings (in-memory unless Redis is configured)."""
+    if settings.rate_limit_backend == "redis":
+        backend: RateLimitBackend = RedisRateLimitBackend(settings.rate_limit_redis_url)
+    else:
+        backend = InMemoryRateLimitBackend(settings.rate_limit_max_keys)
+    limits = {
+        "login_ip": settings.rate_limit_login_per_ip_per_minute,
+        "login_email": settings.rate_limit_login_per_email_per_minute,
+        "otp_ip": settings.rate_limit_otp_per_ip_per_minute,
+        "otp_challenge": settings.rate_limit_otp_per_challenge_per_minute,
+        "refresh_ip": settings.rate_limit_refresh_per_ip_per_minute,
+    }
+    logger.info(
+        f"[ClientWeb] Rate limiter: backend={type(backend).__name__}, "
+        f"enabled={settings.rate_limit_enabled}"
+    )
+    return RateLimiter(backend, limits, enabled=settings.rate_limit_enabled)
+
+
+def get_rate_limiter(request: Request) -> RateLimiter:
+    """FastAPI dependency returning the application's rate limiter."""
+    return request.app.state.rate_limiter
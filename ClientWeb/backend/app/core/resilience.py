@@ -0,0 +1,203 @@
+"""Circuit breakers and retry budget for upstream (main backend) calls."""
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict
+
+import httpx
+from fastapi import Request
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upstream statuses that count as failures and may be retried for idempotent calls
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while a route group's breaker is open."""
+
+    def __init__(self, group: str, retry_after: float):
+        super().__init__(f"Circuit open for upstream group '{group}'")
+        self.group = group
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with half-open probing.
+
+    closed    -> open       after failure_threshold consecutive failures
+    open      -> half_open  once recovery_seconds have passed
+    half_open -> closed     when a probe succeeds
+    half_open -> open       when a probe fails
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, recovery_seconds: float, half_open_max_calls: int):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.half_open_in_flight = 0
+        self.rejected = 0
+        self.transitions: deque = deque(maxlen=20)
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning(f"[ClientWeb] Circuit '{self.name}': {self.state} -> {state}")
+        self.transitions.append({"at": time.time(), "from": self.state, "to": state})
+        self.state = state
+        if state == self.OPEN:
+            self.opened_at = time.monotonic()
+        if state != self.HALF_OPEN:
+            self.half_open_in_flight = 0
+
+    def before_call(self) -> None:
+        """Admit a call or raise CircuitOpenError."""
+        if self.state == self.OPEN:
+            remaining = self.recovery_seconds - (time.monotonic() - self.opened_at)
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, remaining)
+            self._transition(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self.half_open_in_flight >= self.half_open_max_calls:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.recovery_seconds)
+            self.half_open_in_flight += 1
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._transition(self.CLOSED)
+
+    def release(self) -> None:
+        """Free a half-open probe slot for a call that ended without a verdict."""
+        if self.state == self.HALF_OPEN and self.half_open_in_flight:
+            self.half_open_in_flight -= 1
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._transition(self.OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected,
+            "transitions": list(self.transitions),
+        }
+
+
+class RetryBudget:
+    """
+    Global cap on retries: every call deposits `ratio` tokens (up to
+    `max_tokens`) and every retry spends one, so retries stay a bounded
+    fraction of traffic instead of multiplying load during an outage.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.retries = 0
+        self.denied = 0
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.retries += 1
+            return True
+        self.denied += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tokens": round(self.tokens, 2), "retries": self.retries, "denied": self.denied}
+
+
+class UpstreamGuard:
+    """Runs upstream calls through per-group circuit breakers and the retry budget."""
+
+    def __init__(self):
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retry_budget = RetryBudget(settings.retry_budget_ratio, settings.retry_budget_max_tokens)
+
+    def breaker(self, group: str) -> CircuitBreaker:
+        if group not in self.breakers:
+            self.breakers[group] = CircuitBreaker(
+                group,
+                failure_threshold=settings.breaker_failure_threshold,
+                recovery_seconds=settings.breaker_recovery_seconds,
+                half_open_max_calls=settings.breaker_half_open_max_calls,
+            )
+        return self.breakers[group]
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        cap = min(settings.retry_backoff_max_seconds, settings.retry_backoff_base_seconds * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    async def call(
+        self,
+        group: str,
+        fn: Callable[[], Awaitable[httpx.Response]],
+        idempotent: bool = False,
+    ) -> httpx.Response:
+        """
+        Call upstream through the group's breaker. Connection errors and
+        502/503/504 count as failures; idempotent calls are retried with
+        jittered backoff while the retry budget allows.
+        """
+        breaker = self.breaker(group)
+        self.retry_budget.deposit()
+        attempt = 0
+        while True:
+            breaker.before_call()
+            try:
+                response = await fn()
+            except httpx.RequestError:
+                breaker.record_failure()
+                if not (idempotent and attempt < settings.retry_max_attempts and self.retry_budget.try_spend()):
+                    raise
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                if not (idempotent and attempt < settings.retry_max_attempts and self.retry_budget.try_spend()):
+                    return response
+                await response.aclose()
+
+            delay = self._backoff(attempt)
+            attempt += 1
+            logger.info(f"[ClientWeb] Retrying '{group}' upstream call (attempt {attempt + 1}) in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "breakers": {name: breaker.stats() for name, breaker in self.breakers.items()},
+            "retry_budget": self.retry_budget.stats(),
+        }
+
+
+def get_upstream_guard(request: Request) -> UpstreamGuard:
+    """FastAPI dependency returning the application's upstream guard."""
+    return request.app.state.upstream_guard
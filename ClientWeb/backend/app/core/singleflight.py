@@ -0,0 +1,48 @@
+"""Request coalescing for identical concurrent upstream calls."""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one in-flight upstream request.
+
+    Callers with the same key that arrive while a call is running await that
+    call's result (or exception) instead of issuing their own. Only use it for
+    idempotent requests; downloads must never be coalesced.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.collapsed = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            self.leaders += 1
+            flight = asyncio.ensure_future(fn())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            self.collapsed += 1
+            logger.debug("[ClientWeb] Coalesced request onto an in-flight upstream call")
+        # Shield so a disconnecting caller does not cancel the call for the others
+        return await asyncio.shield(flight)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "leaders": self.leaders,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._flights),
+        }
+
+
+def get_singleflight(request: Request) -> SingleFlight:
+    """FastAPI dependency returning the application's request coalescer."""
+    return request.app.state.singleflight
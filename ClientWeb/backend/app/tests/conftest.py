@@ -0,0 +1,69 @@
+"""
+Shared fixtures for ClientWeb tests.
+
+`proxy(handler)` builds the auth and shares routers on a fresh FastAPI app
+whose upstream client sends every request to `handler` through
+httpx.MockTransport, so no main backend is needed. Callers are authenticated
+as a locally verified principal unless `user_id=None` is passed.
+"""
+from dataclasses import dataclass, field
+from typing import Callable
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import auth, shares
+from app.core.auth import Principal, get_principal
+from app.core.cache import InMemoryCacheBackend, ResponseCache
+from app.core.rate_limit import InMemoryRateLimitBackend, RateLimiter
+from app.core.resilience import UpstreamGuard
+from app.core.singleflight import SingleFlight
+
+AUTHORIZATION = "Bearer test-token"
+
+
+@dataclass
+class ProxyEnv:
+    app: FastAPI
+    client: TestClient
+    upstream_requests: list[httpx.Request] = field(default_factory=list)
+
+    @property
+    def state(self):
+        return self.app.state
+
+
+@pytest.fixture()
+def proxy():
+    clients: list[TestClient] = []
+
+    def build(
+        handler: Callable[[httpx.Request], httpx.Response],
+        user_id: str | None = "user-1",
+        limits: dict[str, int] | None = None,
+    ) -> ProxyEnv:
+        app = FastAPI()
+        app.include_router(auth.router, prefix="/api/auth")
+        app.include_router(shares.router, prefix="/api/shares")
+        env = ProxyEnv(app=app, client=TestClient(app))
+
+        def record(request: httpx.Request) -> httpx.Response:
+            env.upstream_requests.append(request)
+            return handler(request)
+
+        app.state.http_client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+        app.state.response_cache = ResponseCache(InMemoryCacheBackend(100), ttl_seconds=60)
+        app.state.singleflight = SingleFlight()
+        app.state.upstream_guard = UpstreamGuard()
+        app.state.rate_limiter = RateLimiter(InMemoryRateLimitBackend(100), limits or {
+            "login_ip": 0, "login_email": 0, "otp_ip": 0, "otp_challenge": 0, "refresh_ip": 0,
+        })
+        app.dependency_overrides[get_principal] = lambda: Principal(authorization=AUTHORIZATION, user_id=user_id)
+        clients.append(env.client)
+        return env
+
+    yield build
+    for client in clients:
+        client.close()
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import jwt
+import pytest
+
+from app.core import auth
+from app.core.auth import VERIFIED_USER_HEADER, check_local_validation_settings, verify_token
+
+SECRET = "test-secret"
+ISSUER = "aegismint-gov"
+
+
+@pytest.fixture(autouse=True)
+def local_validation(monkeypatch):
+    monkeypatch.setattr(auth.settings, "jwt_secret_key", SECRET)
+    monkeypatch.setattr(auth.settings, "jwt_issuer", ISSUER)
+    monkeypatch.setattr(auth.settings, "jwt_local_validation", True)
+    auth._verification_key.cache_clear()
+    yield
+    auth._verification_key.cache_clear()
+
+
+def make_token(secret=SECRET, expires_in=timedelta(minutes=5), **overrides) -> str:
+    now = datetime.now(timezone.utc)
+    claims = {
+        "sub": "user-1",
+        "role": "TokenShareUser",
+        "type": "access",
+        "iss": ISSUER,
+        "iat": now,
+        "exp": now + expires_in,
+    }
+    claims.update(overrides)
+    return jwt.encode({k: v for k, v in claims.items() if v is not None}, secret, algorithm="HS256")
+
+
+def test_valid_token_is_accepted():
+    assert verify_token(make_token())["sub"] == "user-1"
+
+
+@pytest.mark.parametrize("token", [
+    pytest.param(make_token(secret="other-secret"), id="bad-signature"),
+    pytest.param(make_token(expires_in=timedelta(minutes=-5)), id="expired"),
+    pytest.param(make_token(type="refresh"), id="wrong-type"),
+    pytest.param(make_token(role="GovernanceAuthority"), id="wrong-role"),
+    pytest.param(make_token(iss="someone-else"), id="wrong-issuer"),
+    pytest.param(make_token(iss=None), id="missing-issuer"),
+    pytest.param("not-a-jwt", id="garbage"),
+])
+def test_bad_tokens_are_rejected(token):
+    with pytest.raises(jwt.InvalidTokenError):
+        verify_token(token)
+
+
+def test_local_validation_requires_an_issuer(monkeypatch):
+    check_local_validation_settings()
+    monkeypatch.setattr(auth.settings, "jwt_issuer", "")
+    with pytest.raises(RuntimeError):
+        check_local_validation_settings()
+    monkeypatch.setattr(auth.settings, "jwt_local_validation", False)
+    check_local_validation_settings()
+
+
+@pytest.mark.parametrize("authorization", [
+    None,
+    "Basic dXNlcjpwYXNz",
+    "Bearer ",
+    "Bearer " + make_token(secret="other-secret"),
+    "Bearer " + make_token(expires_in=timedelta(minutes=-5)),
+])
+def test_rejected_callers_get_401_without_an_upstream_call(proxy, authorization):
+    env = proxy(lambda request: httpx.Response(200, json=[]))
+    env.app.dependency_overrides.clear()
+    headers = {"Authorization": authorization} if authorization is not None else {}
+
+    r = env.client.get("/api/shares/history", headers=headers)
+
+    assert r.status_code == 401
+    assert env.upstream_requests == []
+
+
+def test_verified_user_is_forwarded_upstream(proxy):
+    env = proxy(lambda request: httpx.Response(200, json=[]))
+    env.app.dependency_overrides.clear()
+    authorization = "Bearer " + make_token()
+
+    assert env.client.get("/api/shares/history", headers={"Authorization": authorization}).status_code == 200
+
+    upstream = env.upstream_requests[0]
+    assert upstream.headers["authorization"] == authorization
+    assert upstream.headers[VERIFIED_USER_HEADER] == "user-1"
+
+
+def test_without_local_validation_tokens_are_left_to_the_main_backend(proxy, monkeypatch):
+    monkeypatch.setattr(auth.settings, "jwt_local_validation", False)
+    env = proxy(lambda request: httpx.Response(200, json=[]))
+    env.app.dependency_overrides.clear()
+
+    assert env.client.get("/api/shares/history", headers={"Authorization": "Bearer opaque"}).status_code == 200
+    assert VERIFIED_USER_HEADER.lower() not in env.upstream_requests[0].headers
@@ -0,0 +1,159 @@
+import asyncio
+
+import httpx
+
+from app.core.auth import Principal
+from app.core.cache import InMemoryCacheBackend, ResponseCache
+
+SHARE = {
+    "assignment_id": "a1",
+    "share_file_id": "f1",
+    "share_number": 1,
+    "token_name": "Token",
+    "token_symbol": "TKN",
+    "token_address": None,
+    "download_allowed": True,
+    "download_count": 0,
+    "first_downloaded_at_utc": None,
+    "last_downloaded_at_utc": None,
+}
+
+
+def test_key_is_per_verified_user_and_view():
+    alice = Principal(authorization="Bearer one", user_id="alice")
+    assert ResponseCache.key(alice, "my-shares") == "user:alice:my-shares"
+    # A new token for the same user reuses the entry
+    assert ResponseCache.key(Principal(authorization="Bearer two", user_id="alice"), "my-shares") == "user:alice:my-shares"
+
+
+def test_unverified_principals_are_never_cached():
+    cache = ResponseCache(InMemoryCacheBackend(10), ttl_seconds=60)
+    anonymous = Principal(authorization="Bearer unverified")
+
+    async def scenario():
+        await cache.set(anonymous, "my-shares", [SHARE])
+        return await cache.get(anonymous, "my-shares")
+
+    assert asyncio.run(scenario()) is None
+    assert cache.backend._entries == {}
+    assert cache.stats()["misses"] == 0
+
+
+def test_invalidate_drops_every_view_of_the_user_only():
+    cache = ResponseCache(InMemoryCacheBackend(10), ttl_seconds=60)
+    alice = Principal(authorization="Bearer a", user_id="alice")
+    bob = Principal(authorization="Bearer b", user_id="bob")
+
+    async def scenario():
+        for principal in (alice, bob):
+            await cache.set(principal, "my-shares", [SHARE])
+            await cache.set(principal, "history", [])
+        await cache.invalidate(alice)
+        return [await cache.get(p, v) for p in (alice, bob) for v in ("my-shares", "history")]
+
+    assert asyncio.run(scenario()) == [None, None, [SHARE], []]
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    from app.core import cache as cache_module
+
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(InMemoryCacheBackend(10), ttl_seconds=30)
+    alice = Principal(authorization="Bearer a", user_id="alice")
+
+    asyncio.run(cache.set(alice, "history", []))
+    now[0] += 29
+    assert asyncio.run(cache.get(alice, "history")) == []
+    now[0] += 2
+    assert asyncio.run(cache.get(alice, "history")) is None
+
+
+def test_my_shares_is_served_from_cache_until_a_download(proxy):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/my-shares":
+            return httpx.Response(200, json=[SHARE])
+        return httpx.Response(200, stream=httpx.ByteStream(b"share-bytes"))
+
+    env = proxy(handler)
+    assert env.client.get("/api/shares/my-shares").json() == [SHARE]
+    assert env.client.get("/api/shares/my-shares").json() == [SHARE]
+    assert len(env.upstream_requests) == 1
+
+    assert env.client.get("/api/shares/download/a1").status_code == 200
+    env.client.get("/api/shares/my-shares")
+    assert [r.url.path for r in env.upstream_requests] == [
+        "/api/my-shares", "/api/my-shares/download/a1", "/api/my-shares",
+    ]
+
+
+def test_unverified_callers_always_reach_upstream(proxy):
+    env = proxy(lambda request: httpx.Response(200, json=[SHARE]), user_id=None)
+    env.client.get("/api/shares/my-shares")
+    env.client.get("/api/shares/my-shares")
+    assert len(env.upstream_requests) == 2
+
+
+def test_cache_is_off_with_a_warning_without_local_validation(monkeypatch, caplog):
+    from app.core import cache as cache_module
+
+    monkeypatch.setattr(cache_module.settings, "cache_enabled", True)
+    monkeypatch.setattr(cache_module.settings, "cache_backend", "memory")
+    monkeypatch.setattr(cache_module.settings, "jwt_local_validation", False)
+    with caplog.at_level("WARNING", logger=cache_module.logger.name):
+        assert not cache_module.create_response_cache().enabled
+    assert "JWT_LOCAL_VALIDATION" in caplog.text
+
+    monkeypatch.setattr(cache_module.settings, "jwt_local_validation", True)
+    assert cache_module.create_response_cache().enabled
+
+
+def test_write_from_before_an_invalidation_is_dropped():
+    cache = ResponseCache(InMemoryCacheBackend(10), ttl_seconds=60)
+    alice = Principal(authorization="Bearer a", user_id="alice")
+
+    async def scenario():
+        generation = cache.generation(alice)
+        await cache.invalidate(alice)
+        await cache.set(alice, "my-shares", [SHARE], generation)
+        stale = await cache.get(alice, "my-shares")
+        await cache.set(alice, "my-shares", [SHARE], cache.generation(alice))
+        return stale, await cache.get(alice, "my-shares")
+
+    assert asyncio.run(scenario()) == (None, [SHARE])
+    assert cache.stats()["stale_writes"] == 1
+
+
+def test_fetch_in_flight_during_a_download_does_not_repopulate_the_cache(proxy):
+    downloaded = {**SHARE, "download_count": 1}
+    views = iter([[SHARE], [downloaded]])
+    release = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/my-shares":
+            body = next(views)
+            if body == [SHARE]:
+                await release["event"].wait()
+            return httpx.Response(200, json=body)
+        return httpx.Response(200, stream=httpx.ByteStream(b"share-bytes"))
+
+    env = proxy(handler)
+
+    async def scenario():
+        release["event"] = asyncio.Event()
+        transport = httpx.ASGITransport(app=env.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://clientweb") as client:
+            slow = asyncio.create_task(client.get("/api/shares/my-shares"))
+            while not env.upstream_requests:
+                await asyncio.sleep(0)
+            assert (await client.get("/api/shares/download/a1")).status_code == 200
+            release["event"].set()
+            before = (await slow).json()
+            after = (await client.get("/api/shares/my-shares")).json()
+            return before, after
+
+    before, after = asyncio.run(scenario())
+    assert before == [SHARE]
+    assert after == [downloaded]
+    assert env.state.response_cache.stale_writes == 1
@@ -0,0 +1,72 @@
+import httpx
+import pytest
+
+from app.core.resilience import CircuitOpenError
+
+SHARE = {
+    "assignment_id": "a1",
+    "share_file_id": "f1",
+    "share_number": 1,
+    "token_name": "Token",
+    "token_symbol": "TKN",
+    "token_address": None,
+    "download_allowed": True,
+    "download_count": 0,
+    "first_downloaded_at_utc": None,
+    "last_downloaded_at_utc": None,
+}
+HISTORY = [{"assignment_id": "a1", "downloaded_at_utc": "2026-01-01T00:00:00Z"}]
+
+
+def upstream(shares_status: int = 200, history_status: int = 200):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/my-shares":
+            return httpx.Response(shares_status, json=[SHARE] if shares_status == 200 else {"detail": "x"})
+        return httpx.Response(history_status, json=HISTORY if history_status == 200 else {"detail": "x"})
+    return handler
+
+
+def test_both_sections_are_returned(proxy):
+    env = proxy(upstream())
+    r = env.client.get("/api/shares/dashboard")
+    assert r.status_code == 200
+    assert r.json() == {"shares": [SHARE], "history": HISTORY, "errors": {}}
+
+
+@pytest.mark.parametrize("failing, working, shares_status, history_status", [
+    ("shares", "history", 500, 200),
+    ("history", "shares", 200, 500),
+])
+def test_one_failed_section_degrades_to_null(proxy, failing, working, shares_status, history_status):
+    env = proxy(upstream(shares_status, history_status))
+
+    r = env.client.get("/api/shares/dashboard")
+
+    assert r.status_code == 200
+    body = r.json()
+    assert body[failing] is None
+    assert body[working] == {"shares": [SHARE], "history": HISTORY}[working]
+    assert body["errors"] == {failing: "Service unavailable"}
+
+
+def test_both_sections_failing_fails_the_request(proxy):
+    env = proxy(upstream(500, 500))
+    assert env.client.get("/api/shares/dashboard").status_code == 502
+
+
+@pytest.mark.parametrize("shares_status, history_status", [(401, 200), (200, 401)])
+def test_rejected_token_in_one_section_is_propagated(proxy, shares_status, history_status):
+    env = proxy(upstream(shares_status, history_status))
+    assert env.client.get("/api/shares/dashboard").status_code == 401
+
+
+def test_open_circuit_fails_fast_without_upstream_calls(proxy):
+    env = proxy(upstream())
+    breaker = env.state.upstream_guard.breaker("shares")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    # Both sections use the "shares" group; main.py turns CircuitOpenError into a 503
+    with pytest.raises(CircuitOpenError):
+        env.client.get("/api/shares/dashboard")
+    assert env.upstream_requests == []
@@ -0,0 +1,96 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.api.shares import download_share
+from app.core.auth import Principal
+from app.core.cache import InMemoryCacheBackend, ResponseCache
+from app.core.resilience import UpstreamGuard
+
+CHUNKS = [b"first-", b"second-", b"third"]
+
+
+class TrackedStream(httpx.AsyncByteStream):
+    """Upstream body that records how far it was read and whether it was closed."""
+
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+        self.sent = 0
+        self.closed = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+    async def aclose(self) -> None:
+        self.closed += 1
+
+
+def _file_response(stream: TrackedStream) -> httpx.Response:
+    return httpx.Response(
+        200,
+        stream=stream,
+        headers={
+            "content-type": "application/octet-stream",
+            "content-disposition": 'attachment; filename="share-1.json"',
+            "x-share-number": "1",
+            "x-internal": "not relayed",
+        },
+    )
+
+
+def test_download_is_streamed_with_forwarded_headers(proxy):
+    stream = TrackedStream(CHUNKS)
+    env = proxy(lambda request: _file_response(stream))
+
+    r = env.client.get("/api/shares/download/a1")
+
+    assert r.status_code == 200
+    assert r.content == b"".join(CHUNKS)
+    assert r.headers["content-disposition"] == 'attachment; filename="share-1.json"'
+    assert r.headers["x-share-number"] == "1"
+    assert "x-internal" not in r.headers
+    assert stream.sent == len(CHUNKS)
+    assert stream.closed >= 1
+    upstream = env.upstream_requests[0]
+    assert upstream.url.path == "/api/my-shares/download/a1"
+    assert upstream.headers["authorization"] == "Bearer test-token"
+
+
+@pytest.mark.parametrize("upstream_status, expected", [(401, 401), (403, 403), (404, 404), (500, 502)])
+def test_upstream_errors_are_mapped_and_not_streamed(proxy, upstream_status, expected):
+    stream = TrackedStream([b'{"detail": "nope"}'])
+    env = proxy(lambda request: httpx.Response(upstream_status, stream=stream))
+
+    r = env.client.get("/api/shares/download/a1")
+
+    assert r.status_code == expected
+    assert stream.closed >= 1
+
+
+def test_download_is_never_retried(proxy):
+    env = proxy(lambda request: httpx.Response(503))
+    assert env.client.get("/api/shares/download/a1").status_code == 502
+    assert len(env.upstream_requests) == 1
+
+
+def test_upstream_is_closed_when_the_body_is_never_sent():
+    stream = TrackedStream(CHUNKS)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: _file_response(stream)))
+
+    async def scenario():
+        response = await download_share(
+            "a1",
+            principal=Principal(authorization="Bearer t", user_id="user-1"),
+            client=client,
+            cache=ResponseCache(InMemoryCacheBackend(10), ttl_seconds=60),
+            upstream=UpstreamGuard(),
+        )
+        # The client went away before Starlette started the body; only the background task runs
+        await response.background()
+
+    asyncio.run(scenario())
+    assert stream.sent == 0
+    assert stream.closed == 1
@@ -0,0 +1,30 @@
+import asyncio
+
+import httpx
+
+from app.core import http_client
+from app.core.http_client import create_http_client
+
+
+def test_pooled_client_uses_configured_limits(monkeypatch):
+    monkeypatch.setattr(http_client.settings, "upstream_max_connections", 7)
+    monkeypatch.setattr(http_client.settings, "upstream_max_keepalive_connections", 3)
+    monkeypatch.setattr(http_client.settings, "upstream_http2", False)
+    client = create_http_client()
+    try:
+        pool = client._transport._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+    finally:
+        asyncio.run(client.aclose())
+
+
+def test_every_proxied_request_goes_through_the_shared_client(proxy):
+    # Unverified caller, so nothing is answered from the response cache
+    env = proxy(lambda request: httpx.Response(200, json=[]), user_id=None)
+    shared = env.state.http_client
+    for _ in range(3):
+        assert env.client.get("/api/shares/history").status_code == 200
+    assert env.state.http_client is shared
+    assert len(env.upstream_requests) == 3
+
@@ -0,0 +1,55 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.core.http_client import create_http_client
+from app.core.inprocess import load_web_app
+
+WEB_BACKEND = Path(__file__).resolve().parents[4] / "Web" / "backend"
+
+pytestmark = pytest.mark.skipif(not (WEB_BACKEND / "app" / "main.py").is_file(), reason="Web backend not checked out")
+
+
+@pytest.fixture(scope="module")
+def web_app():
+    own = {name: module for name, module in sys.modules.items() if name == "app" or name.startswith("app.")}
+    patch = pytest.MonkeyPatch()
+    patch.setenv("TOKENCONTROL_DATABASE_URL", "sqlite:///:memory:")
+    try:
+        yield load_web_app(str(WEB_BACKEND)), own
+    finally:
+        patch.undo()
+
+
+def test_clientweb_modules_are_restored(web_app):
+    _, own = web_app
+    for name, module in own.items():
+        assert sys.modules[name] is module, name
+
+    from app.core.config import settings
+
+    assert hasattr(settings, "backend_api_url")  # ClientWeb's settings, not Web's
+
+
+def test_web_only_modules_stay_importable(web_app):
+    # Web code imports these lazily inside functions, so they must keep resolving
+    app, _ = web_app
+    assert sys.modules["app.main"].app is app
+    assert "app.models" in sys.modules
+    assert "app.services" in sys.modules
+
+
+def test_requests_reach_web_routes_through_asgi_transport(web_app):
+    app, _ = web_app
+
+    async def scenario():
+        async with create_http_client(app) as client:
+            return await client.get("http://web/api/my-shares/history")
+
+    response = asyncio.run(scenario())
+
+    # Answered by the Web backend's token user dependency, without any socket
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Missing bearer token"}
@@ -0,0 +1,86 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.core import rate_limit
+from app.core.rate_limit import InMemoryRateLimitBackend, RateLimitBackend, RateLimiter
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [500.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bucket_allows_a_burst_then_refills_evenly(clock):
+    backend = InMemoryRateLimitBackend(max_keys=10)
+
+    async def take():
+        return await backend.take("k", capacity=3, refill_per_second=0.5)
+
+    assert [asyncio.run(take())[0] for _ in range(3)] == [True, True, True]
+    allowed, retry_after = asyncio.run(take())
+    assert not allowed
+    assert retry_after == pytest.approx(2)
+
+    clock[0] += 2
+    assert asyncio.run(take()) == (True, 0.0)
+    assert not asyncio.run(take())[0]
+
+    clock[0] += 60
+    assert [asyncio.run(take())[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_least_recently_used_keys_are_evicted(clock):
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    for key in ("a", "b", "c"):
+        asyncio.run(backend.take(key, capacity=1, refill_per_second=1))
+    assert list(backend._buckets) == ["b", "c"]
+
+
+def test_incomplete_backend_cannot_be_instantiated():
+    class NoTake(RateLimitBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        NoTake()
+
+
+def test_limiter_raises_429_with_retry_after(clock):
+    limiter = RateLimiter(InMemoryRateLimitBackend(10), {"login_email": 2})
+    asyncio.run(limiter.hit("login_email", "a@example.com"))
+    asyncio.run(limiter.hit("login_email", "a@example.com"))
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(limiter.hit("login_email", "a@example.com"))
+
+    assert exc.value.status_code == 429
+    assert exc.value.headers == {"Retry-After": "30"}
+    asyncio.run(limiter.hit("login_email", "b@example.com"))
+    assert limiter.stats()["allowed"] == {"login_email": 3}
+    assert limiter.stats()["rejected"] == {"login_email": 1}
+
+
+def test_limiter_fails_open_when_the_backend_errors():
+    class Broken(RateLimitBackend):
+        async def take(self, key, capacity, refill_per_second):
+            raise ConnectionError("redis down")
+
+    limiter = RateLimiter(Broken(), {"login_ip": 1})
+    for _ in range(3):
+        asyncio.run(limiter.hit("login_ip", "10.0.0.1"))
+    assert limiter.errors == 3
+
+
+def test_login_route_returns_429_before_calling_upstream(proxy):
+    env = proxy(lambda request: httpx.Response(200, json={"challenge_id": "c1"}), limits={"login_ip": 0, "login_email": 1})
+    body = {"email": "user@example.com", "password": "password123"}
+
+    assert env.client.post("/api/auth/login", json=body).status_code == 200
+    r = env.client.post("/api/auth/login", json={**body, "email": "USER@example.com"})
+
+    assert r.status_code == 429
+    assert int(r.headers["Retry-After"]) >= 1
+    assert len(env.upstream_requests) == 1
@@ -0,0 +1,132 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core import resilience
+from app.core.resilience import CircuitBreaker, CircuitOpenError, UpstreamGuard
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    return clock
+
+
+def _breaker(threshold=3, recovery=30.0, probes=1) -> CircuitBreaker:
+    return CircuitBreaker("shares", failure_threshold=threshold, recovery_seconds=recovery, half_open_max_calls=probes)
+
+
+def test_opens_after_consecutive_failures_and_rejects_calls(clock):
+    breaker = _breaker()
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 10
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.before_call()
+    assert exc.value.retry_after == pytest.approx(20)
+    assert breaker.rejected == 1
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = _breaker()
+    for _ in range(2):
+        breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.consecutive_failures == 1
+
+
+def test_half_open_admits_one_probe_and_closes_on_success(clock):
+    breaker = _breaker(threshold=1)
+    breaker.record_failure()
+    clock.now += 30
+
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+    assert [t["to"] for t in breaker.transitions] == ["open", "half_open", "closed"]
+
+
+def test_failed_probe_reopens_for_a_full_recovery_period(clock):
+    breaker = _breaker(threshold=1)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 29
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.now += 1
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_released_probe_frees_the_slot(clock):
+    breaker = _breaker(threshold=1)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+    assert breaker.half_open_in_flight == 1
+
+
+def test_guard_fails_fast_while_the_group_breaker_is_open(clock, monkeypatch):
+    monkeypatch.setattr(resilience.settings, "breaker_failure_threshold", 2)
+    guard = UpstreamGuard()
+    calls = 0
+
+    async def down():
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503)
+
+    async def scenario():
+        for _ in range(2):
+            assert (await guard.call("download", down)).status_code == 503
+        with pytest.raises(CircuitOpenError):
+            await guard.call("download", down)
+
+    asyncio.run(scenario())
+    assert calls == 2
+    assert guard.breaker("download").state == CircuitBreaker.OPEN
+    assert guard.breaker("shares").state == CircuitBreaker.CLOSED
+
+
+def test_guard_retries_idempotent_calls_within_the_budget(clock, monkeypatch):
+    monkeypatch.setattr(resilience.settings, "retry_backoff_base_seconds", 0)
+    guard = UpstreamGuard()
+    statuses = iter([502, 200])
+
+    async def flaky():
+        return httpx.Response(next(statuses))
+
+    response = asyncio.run(guard.call("shares", flaky, idempotent=True))
+    assert response.status_code == 200
+    assert guard.retry_budget.retries == 1
+    assert guard.breaker("shares").consecutive_failures == 0
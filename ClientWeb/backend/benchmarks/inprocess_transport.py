@@ -0,0 +1,180 @@
+"""
+Benchmark: loopback HTTP vs. in-process ASGI transport to the Web backend.
+
+Loads the real Web backend (WEB_BACKEND_PATH) against a throwaway SQLite
+database, then drives the login, my-shares and download flows through
+ClientWeb twice: once with the Web app served by uvicorn on a loopback port
+(UPSTREAM_MODE=http) and once called in-process through httpx.ASGITransport
+(UPSTREAM_MODE=asgi). Rate limiting and the response cache are switched off
+so every request reaches the Web backend.
+
+Usage (from ClientWeb/backend, with the Web backend requirements installed):
+    python -m benchmarks.inprocess_transport --requests 300 --logins 20
+"""
+import argparse
+import asyncio
+import importlib
+import logging
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from typing import Awaitable, Callable
+
+import httpx
+import pyotp
+import uvicorn
+
+from app.core.config import settings
+from app.core.inprocess import load_web_app
+from benchmarks.stats import percentile
+
+PASSWORD = "bench-password"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed(downloads: int) -> tuple[str, str, list[str]]:
+    """Create one token user with three shares plus `downloads` one-time assignments; return (email, mfa secret, assignment ids)."""
+    # Web modules stay registered under their own names once the app is loaded
+    Base = importlib.import_module("app.db.base").Base
+    engine = importlib.import_module("app.db.session").engine
+    SessionLocal = importlib.import_module("app.db.session").SessionLocal
+    models = importlib.import_module("app.models")
+    from passlib.hash import pbkdf2_sha256
+
+    # system_settings is declared twice in the Web models; the flows under test never touch it
+    Base.metadata.create_all(engine, tables=[t for t in Base.metadata.sorted_tables if t.name != "system_settings"])
+
+    mfa_secret = pyotp.random_base32()
+    db = SessionLocal()
+    try:
+        admin = models.User(
+            email="admin@bench.example.com",
+            password_hash=pbkdf2_sha256.hash(PASSWORD),
+            role=models.UserRole.SUPER_ADMIN,
+            mfa_secret=pyotp.random_base32(),
+        )
+        token = models.TokenDeployment(
+            token_name="Bench Token", token_symbol="BNC", token_decimals=18, token_supply="1000000",
+            network="localhost", contract_address="0x0", treasury_address="0x0",
+            gov_shares=3, gov_threshold=2, total_shares=3, client_share_count=3,
+            safekeeping_share_count=0, shares_path="/tmp",
+        )
+        user = models.TokenUser(
+            email="user@bench.example.com", name="Bench User",
+            password_hash=pbkdf2_sha256.hash(PASSWORD), mfa_secret=mfa_secret, mfa_enabled=True,
+        )
+        db.add_all([admin, token, user])
+        db.flush()
+        db.add(models.TokenUserAssignment(user_id=user.id, token_deployment_id=token.id))
+
+        download_ids = []
+        for number in range(1, downloads + 4):
+            share = models.ShareFile(
+                token_deployment_id=token.id, share_number=number,
+                file_name=f"share-{number:03d}.aegisshare", encrypted_content="x" * 2048,
+            )
+            db.add(share)
+            db.flush()
+            assignment = models.ShareAssignment(share_file_id=share.id, user_id=user.id, assigned_by=admin.id)
+            db.add(assignment)
+            db.flush()
+            download_ids.append(assignment.id)
+        db.commit()
+    finally:
+        db.close()
+    # The first three assignments stay downloadable-but-unused so my-shares has a stable size
+    return user.email, mfa_secret, download_ids[3:]
+
+
+async def timed(n: int, fn: Callable[[int], Awaitable[None]]) -> list[float]:
+    latencies = []
+    for i in range(n):
+        start = time.perf_counter()
+        await fn(i)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p95 = percentile(ordered, 0.95)
+    print(f"  {label:<10} mean={statistics.mean(ordered):8.2f}ms  p50={statistics.median(ordered):8.2f}ms  p95={p95:8.2f}ms")
+
+
+async def run_mode(mode: str, args, email: str, mfa_secret: str, download_ids: list[str]) -> None:
+    from main import app, lifespan  # noqa: E402 - imported after settings are patched
+
+    settings.upstream_mode = mode
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://clientweb") as client:
+            tokens = {}
+
+            async def login(_: int) -> None:
+                r = await client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+                r.raise_for_status()
+                r = await client.post(
+                    "/api/auth/verify-otp",
+                    json={"challenge_id": r.json()["challenge_id"], "otp": pyotp.TOTP(mfa_secret).now()},
+                )
+                r.raise_for_status()
+                tokens["access"] = r.json()["access_token"]
+
+            async def shares(_: int) -> None:
+                r = await client.get("/api/shares/my-shares", headers={"Authorization": f"Bearer {tokens['access']}"})
+                r.raise_for_status()
+
+            async def download(i: int) -> None:
+                r = await client.get(
+                    f"/api/shares/download/{download_ids[i]}",
+                    headers={"Authorization": f"Bearer {tokens['access']}"},
+                )
+                r.raise_for_status()
+
+            await login(0)  # warm-up
+            print(f"{mode}:")
+            report("login", await timed(args.logins, login))
+            report("my-shares", await timed(args.requests, shares))
+            report("download", await timed(args.requests, download))
+            del download_ids[:args.requests]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300, help="my-shares and download requests per mode")
+    parser.add_argument("--logins", type=int, default=20, help="login + verify-otp round trips per mode")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="clientweb-bench-")
+    os.environ["TOKENCONTROL_DATABASE_URL"] = f"sqlite:///{workdir}/web.db"
+    os.environ.setdefault("TOKENCONTROL_JWT_SECRET", "bench-secret")
+    settings.rate_limit_enabled = False
+    settings.cache_enabled = False
+
+    web_app = load_web_app(settings.web_backend_path)
+    web_app.router.on_startup.clear()  # schema and data are prepared by seed()
+    email, mfa_secret, download_ids = seed(2 * args.requests)
+    logging.disable(logging.INFO)
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(web_app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    settings.backend_api_url = f"http://127.0.0.1:{port}"
+
+    await run_mode("http", args, email, mfa_secret, download_ids)
+    await run_mode("asgi", args, email, mfa_secret, download_ids)
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
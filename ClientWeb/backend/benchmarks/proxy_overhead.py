@@ -0,0 +1,128 @@
+"""
+Benchmark: ClientWeb proxy overhead per request.
+
+Compares the old pattern (a new httpx.AsyncClient, and therefore a new TCP
+connection, per proxied request) with the shared pooled client created in
+the application lifespan. A stub upstream is served on loopback by uvicorn
+so only proxy + connection costs are measured.
+
+Usage (from ClientWeb/backend):
+    python -m benchmarks.proxy_overhead --requests 500 --concurrency 10
+"""
+import argparse
+import asyncio
+import logging
+import socket
+import statistics
+import threading
+import time
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.core.http_client import get_http_client
+from benchmarks.stats import percentile
+
+SHARES = [
+    {
+        "assignment_id": f"a-{i}",
+        "share_file_id": f"s-{i}",
+        "share_number": i,
+        "token_name": "Bench Token",
+        "token_symbol": "BNC",
+        "token_address": "0x0",
+        "download_allowed": True,
+        "download_count": 0,
+        "first_downloaded_at_utc": None,
+        "last_downloaded_at_utc": None,
+    }
+    for i in range(1, 4)
+]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub_upstream() -> tuple[uvicorn.Server, str]:
+    """Run a minimal stand-in for the main backend on a loopback port."""
+    upstream = FastAPI()
+
+    @upstream.get("/api/my-shares")
+    async def my_shares():
+        return SHARES
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(upstream, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def per_request_client():
+    """Dependency reproducing the previous behaviour: one client per request."""
+    async with httpx.AsyncClient(timeout=settings.upstream_timeout_seconds) as client:
+        yield client
+
+
+async def run(app: FastAPI, requests: int, concurrency: int) -> list[float]:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://clientweb") as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get("/api/shares/my-shares", headers={"Authorization": "Bearer bench"})
+                latencies.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+
+        await one()  # warm-up
+        latencies.clear()
+        await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def report(label: str, latencies: list[float], elapsed: float) -> None:
+    ordered = sorted(latencies)
+    p95 = percentile(ordered, 0.95)
+    print(
+        f"{label:<22} mean={statistics.mean(ordered):7.2f}ms  p50={statistics.median(ordered):7.2f}ms  "
+        f"p95={p95:7.2f}ms  throughput={len(ordered) / elapsed:8.1f} req/s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    server, upstream_url = start_stub_upstream()
+    settings.backend_api_url = upstream_url
+
+    from main import app, lifespan  # noqa: E402 - imported after settings are patched
+    logging.disable(logging.INFO)
+
+    async with lifespan(app):
+        app.dependency_overrides[get_http_client] = per_request_client
+        start = time.perf_counter()
+        before = await run(app, args.requests, args.concurrency)
+        report("client per request", before, time.perf_counter() - start)
+
+        app.dependency_overrides.clear()
+        start = time.perf_counter()
+        after = await run(app, args.requests, args.concurrency)
+        report("shared pooled client", after, time.perf_counter() - start)
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
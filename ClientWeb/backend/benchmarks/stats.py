@@ -0,0 +1,15 @@
+"""Latency statistics shared by the benchmarks in this directory."""
+import math
+from typing import Sequence
+
+
+def percentile(ordered: Sequence[float], p: float) -> float:
+    """
+    Nearest-rank percentile of already sorted samples, `p` in (0, 1].
+
+    The smallest sample with at least `p` of all samples at or below it, so
+    p95 is never below the median and p=1 is the maximum.
+    """
+    if not ordered:
+        raise ValueError("percentile of no samples")
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(p * len(ordered)) - 1))]
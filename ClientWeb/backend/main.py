@@ -7,17 +7,27 @@ and the main Aegis Mint backend. It provides:
 - Session management
 - Request proxying to main backend
 - Additional security layer
-- Rate limiting (future)
+- Rate limiting of login, OTP verification and token refresh
 """
+import hmac
 import logging
 import logging.config
 import logging.handlers
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api import auth, shares
+from app.core.auth import check_local_validation_settings
+from app.core.cache import create_response_cache
 from app.core.config import settings
+from app.core.http_client import create_http_client
+from app.core.inprocess import load_web_app
+from app.core.rate_limit import create_rate_limiter
+from app.core.resilience import CircuitOpenError, UpstreamGuard
+from app.core.singleflight import SingleFlight
 
 def _configure_logging() -> None:
     """Configure console + file logging in ~/logs/shares/access.log."""
@@ -73,12 +83,37 @@ _configure_logging()
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up the pooled upstream client and per-process proxy state; close them on shutdown."""
+    check_local_validation_settings()
+    async with AsyncExitStack() as stack:
+        web_app = None
+        if settings.upstream_mode == "asgi":
+            web_app = load_web_app(settings.web_backend_path)
+            # ASGITransport sends no lifespan events; run the Web app's startup/shutdown here
+            await stack.enter_async_context(web_app.router.lifespan_context(web_app))
+        app.state.http_client = create_http_client(web_app)
+        app.state.response_cache = create_response_cache()
+        app.state.singleflight = SingleFlight()
+        app.state.upstream_guard = UpstreamGuard()
+        app.state.rate_limiter = create_rate_limiter()
+        try:
+            yield
+        finally:
+            await app.state.http_client.aclose()
+            await app.state.response_cache.backend.close()
+            await app.state.rate_limiter.backend.close()
+
+
 app = FastAPI(
     title="Aegis Mint - Share Portal",
     description="Token share user portal for accessing assigned shares",
     version="1.0.0",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -90,6 +125,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    """Fail fast while the main backend is known to be unhealthy."""
+    logger.warning(f"[ClientWeb] Fast-failing {request.method} {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service unavailable"},
+        headers={"Retry-After": str(max(1, int(exc.retry_after + 0.999)))},
+    )
+
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(shares.router, prefix="/api/shares", tags=["shares"])
@@ -111,6 +157,25 @@ def health():
     return {"status": "healthy"}
 
 
+def require_stats_token(authorization: str | None = Header(None)) -> None:
+    """Only operators holding STATS_TOKEN may read the counters (they include rejected logins)."""
+    expected = f"Bearer {settings.stats_token}"
+    if not authorization or not hmac.compare_digest(authorization, expected):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid stats token")
+
+
+if settings.stats_token:
+    @app.get("/stats", include_in_schema=False, dependencies=[Depends(require_stats_token)])
+    def stats():
+        """Proxy runtime counters (per worker process)."""
+        return {
+            "cache": app.state.response_cache.stats(),
+            "coalescing": app.state.singleflight.stats(),
+            "upstream": app.state.upstream_guard.stats(),
+            "rate_limit": app.state.rate_limiter.stats(),
+        }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
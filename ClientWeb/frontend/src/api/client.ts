@@ -103,6 +103,12 @@ export interface DownloadHistoryItem {
   failure_reason: string | null;
 }
 
+export interface DashboardData {
+  shares: ShareItem[] | null;
+  history: DownloadHistoryItem[] | null;
+  errors: { shares?: string; history?: string };
+}
+
 // Auth API
 export const login = (data: LoginRequest) =>
   api.post<LoginResponse>("/auth/login", data);
@@ -125,4 +131,7 @@ export const downloadShare = (assignmentId: string) =>
 export const getDownloadHistory = () =>
   api.get<DownloadHistoryItem[]>("/shares/history");
 
+export const getDashboard = () =>
+  api.get<DashboardData>("/shares/dashboard");
+
 export default api;
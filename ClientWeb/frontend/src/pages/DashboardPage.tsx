@@ -1,6 +1,6 @@
 import { useEffect, useState } from "react";
 import { useAuth } from "../auth/AuthContext";
-import { getMyShares, downloadShare, getDownloadHistory, ShareItem, DownloadHistoryItem } from "../api/client";
+import { getDashboard, downloadShare, ShareItem, DownloadHistoryItem } from "../api/client";
 
 export default function DashboardPage() {
   const { user, logout } = useAuth();
@@ -13,18 +13,32 @@ export default function DashboardPage() {
   const [historyError, setHistoryError] = useState("");
 
   useEffect(() => {
-    loadShares();
-    loadHistory();
+    loadDashboard();
   }, []);
 
-  const loadShares = async () => {
+  // Shares and history arrive in one request; either section may fail on its own
+  const loadDashboard = async () => {
     try {
-      const response = await getMyShares();
-      setShares(response.data);
+      setHistoryLoading(true);
+      setHistoryError("");
+      const { data } = await getDashboard();
+      if (data.shares) {
+        setShares(data.shares);
+        setError("");
+      } else {
+        setError("Failed to load shares");
+      }
+      if (data.history) {
+        setHistory(data.history);
+      } else {
+        setHistoryError("Failed to load download history");
+      }
     } catch (err: any) {
       setError("Failed to load shares");
+      setHistoryError("Failed to load download history");
     } finally {
       setLoading(false);
+      setHistoryLoading(false);
     }
   };
 
@@ -50,9 +64,8 @@ export default function DashboardPage() {
       link.click();
       link.parentNode?.removeChild(link);
       
-      // Reload shares to update status
-      await loadShares();
-      await loadHistory();
+      // Reload shares and history to update status
+      await loadDashboard();
     } catch (err: any) {
       alert(err.response?.data?.detail || "Download failed");
     } finally {
@@ -60,19 +73,6 @@ export default function DashboardPage() {
     }
   };
 
-  const loadHistory = async () => {
-    try {
-      setHistoryLoading(true);
-      setHistoryError("");
-      const response = await getDownloadHistory();
-      setHistory(response.data);
-    } catch (err: any) {
-      setHistoryError("Failed to load download history");
-    } finally {
-      setHistoryLoading(false);
-    }
-  };
-
   const formatDateTime = (dateString: string) => {
     const date = new Date(dateString);
     if (Number.isNaN(date.getTime())) return dateString;
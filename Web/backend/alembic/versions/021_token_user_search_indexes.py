@@ -0,0 +1,38 @@
+"""add search indexes for token share user listing
+
+Revision ID: 021_token_user_search_indexes
+Revises: 020_add_share_file_soft_delete
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "021_token_user_search_indexes"
+down_revision = "020_add_share_file_soft_delete"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Case-insensitive prefix search (lower(col) LIKE 'q%'). On PostgreSQL that needs
+    # expression indexes with varchar_pattern_ops to be usable regardless of collation;
+    # MySQL compares with the column's _ci collation and uses the plain index.
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE INDEX ix_token_users_name ON token_users (lower(name) varchar_pattern_ops)")
+        op.execute("CREATE INDEX ix_token_users_email_prefix ON token_users (lower(email) varchar_pattern_ops)")
+    else:
+        op.create_index("ix_token_users_name", "token_users", ["name"])
+    # Covers the token -> user join used by the paginated listing
+    op.create_index(
+        "ix_token_user_assignments_token_user",
+        "token_user_assignments",
+        ["token_deployment_id", "user_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_token_user_assignments_token_user", table_name="token_user_assignments")
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_token_users_email_prefix", table_name="token_users")
+    op.drop_index("ix_token_users_name", table_name="token_users")
@@ -0,0 +1,26 @@
+"""add updated_at_utc to desktops
+
+Revision ID: 022_add_desktop_updated_at
+Revises: 021_token_user_search_indexes
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "022_add_desktop_updated_at"
+down_revision = "021_token_user_search_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("desktops", sa.Column("updated_at_utc", sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE desktops SET updated_at_utc = COALESCE(last_seen_at_utc, created_at_utc)")
+    op.create_index("ix_desktops_updated_at_utc", "desktops", ["updated_at_utc"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_desktops_updated_at_utc", table_name="desktops")
+    op.drop_column("desktops", "updated_at_utc")
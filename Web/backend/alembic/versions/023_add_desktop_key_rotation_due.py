@@ -0,0 +1,27 @@
+"""add key_rotation_due to desktops
+
+Revision ID: 023_add_desktop_key_rotation_due
+Revises: 022_add_desktop_updated_at
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "023_add_desktop_key_rotation_due"
+down_revision = "022_add_desktop_updated_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows start as not due; the rotation planner marks the overdue ones on its first run
+    op.add_column(
+        "desktops",
+        sa.Column("key_rotation_due", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("desktops", "key_rotation_due")
@@ -0,0 +1,44 @@
+"""store ETag version-stamp timestamps with microseconds on MySQL
+
+Revision ID: 024_microsecond_etag_timestamps
+Revises: 023_add_desktop_key_rotation_due
+Create Date: 2026-10-19
+"""
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = "024_microsecond_etag_timestamps"
+down_revision = "023_add_desktop_key_rotation_due"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # max(desktops.updated_at_utc) and max(download_links.created_at) back the admin list
+    # ETags; MySQL's DATETIME keeps whole seconds, so changes within one second would not
+    # change the ETag. Other dialects already store microseconds.
+    if op.get_bind().dialect.name != "mysql":
+        return
+    op.alter_column(
+        "desktops", "updated_at_utc",
+        existing_type=mysql.DATETIME(), type_=mysql.DATETIME(fsp=6), existing_nullable=True,
+    )
+    op.alter_column(
+        "download_links", "created_at",
+        existing_type=mysql.DATETIME(), type_=mysql.DATETIME(fsp=6), existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "mysql":
+        return
+    op.alter_column(
+        "download_links", "created_at",
+        existing_type=mysql.DATETIME(fsp=6), type_=mysql.DATETIME(), existing_nullable=False,
+    )
+    op.alter_column(
+        "desktops", "updated_at_utc",
+        existing_type=mysql.DATETIME(fsp=6), type_=mysql.DATETIME(), existing_nullable=True,
+    )
@@ -3,7 +3,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
 from app.core.security import decode_token
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, get_read_session_factory
 from app.models import User, UserRole
 from app.models.token_user import TokenUser
 
@@ -18,6 +18,15 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Session for read-only routes; served by the read replica when it is healthy."""
+    db = get_read_session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme), db: Session = Depends(get_db)
 ) -> User:
@@ -11,8 +11,17 @@ from app.models.auth_log import AuthEventType
 from app.services.auth_log_service import log_auth_attempt
 
 
-async def get_authenticated_desktop(
+async def get_request_body(request: Request) -> str:
+    """Signed request body (POST only); read on the event loop so the DB work can run in the threadpool."""
+    if request.method != "POST":
+        return ""
+    body_bytes = await request.body()
+    return body_bytes.decode('utf-8')
+
+
+def get_authenticated_desktop(
     request: Request,
+    body: str = Depends(get_request_body),
     desktop_id: str = Header(None, alias="X-Desktop-Id"),
     app_type: str = Header(None, alias="X-App-Type"),
     timestamp: str = Header(None, alias="X-Desktop-Timestamp"),
@@ -92,12 +101,6 @@ async def get_authenticated_desktop(
             detail="Desktop secret key not configured"
         )
     
-    # Read body for POST requests
-    body = ""
-    if request.method == "POST":
-        body_bytes = await request.body()
-        body = body_bytes.decode('utf-8')
-    
     # Validate signature
     try:
         validate_desktop_auth_headers(
@@ -1,10 +1,13 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response, status
 from pydantic import BaseModel
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, require_role
+from app.api.deps import get_db, get_read_db, require_role
+from app.core.conditional import make_etag, not_modified
+from app.core.responses import OrjsonResponse, projection
 from app.models import AuditLog, Desktop, GovernanceAssignment, User, UserRole
 from app.schemas.admin import UserCreate, UserOut, UserUpdate
 from app.schemas.desktop import AdminDesktopApprove, AdminDesktopCreate, DesktopAdminOut, DesktopUpdateRequest
@@ -38,7 +41,16 @@ def update_user(
 
 
 @router.get("/desktops", response_model=List[DesktopAdminOut])
-def list_desktops(db: Session = Depends(get_db), _: User = Depends(require_role(UserRole.SUPER_ADMIN))):
+def list_desktops(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_role(UserRole.SUPER_ADMIN)),
+):
+    count, updated = db.query(func.count(Desktop.id), func.max(Desktop.updated_at_utc)).one()
+    cached = not_modified(request, response, "admin_desktops", make_etag(count, updated))
+    if cached:
+        return cached
     return admin_service.list_desktops(db)
 
 
@@ -90,10 +102,10 @@ def audit(
     page: int = 1,
     page_size: int = 20,
     q: str | None = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_role(UserRole.SUPER_ADMIN)),
 ):
-    qs = db.query(AuditLog)
+    qs = db.query(*projection(AuditLogEntry, AuditLog))
     if q:
         like = f"%{q}%"
         qs = qs.filter(
@@ -111,7 +123,9 @@ def audit(
         .limit(page_size)
         .all()
     )
-    return {"items": items, "total": total, "page": page, "pageSize": page_size}
+    return OrjsonResponse(
+        {"items": [row._asdict() for row in items], "total": total, "page": page, "pageSize": page_size}
+    )
 
 
 @router.get("/users/{user_id}/assignments", response_model=List[str])
@@ -156,10 +170,17 @@ def reject_desktop(
 
 @router.get("/settings", response_model=SystemSettings)
 def get_settings_route(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     _: User = Depends(require_role(UserRole.SUPER_ADMIN)),
 ):
-    return admin_service.get_system_settings(db)
+    settings = admin_service.get_system_settings(db)
+    # Two small values: they are their own version stamp
+    cached = not_modified(request, response, "admin_settings", make_etag(*settings.model_dump().values()))
+    if cached:
+        return cached
+    return settings
 
 
 @router.put("/settings", response_model=SystemSettings)
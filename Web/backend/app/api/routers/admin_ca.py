@@ -1,13 +1,15 @@
 """
 Admin API router for Certificate Authority management
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 from pydantic import BaseModel
 from datetime import datetime
 
 from app.api.deps import get_db
+from app.core.conditional import make_etag, not_modified
+from app.core.time import utcnow
 from app.services.ca_persistence_service import CAPersistenceService
 from app.services.desktop_service import DesktopService
 
@@ -43,12 +45,18 @@ class PendingCertificatesResponse(BaseModel):
 
 
 @router.get("/status", response_model=CAInfoResponse)
-def get_ca_status(db: Session = Depends(get_db)):
+def get_ca_status(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Get CA status and information
     
     Returns CA details if exists, otherwise returns exists=False
     """
+    # Expiry flags and day counts move with the date, so the date is part of the version
+    created_at = CAPersistenceService.get_ca_created_at(db)
+    cached = not_modified(request, response, "ca_status", make_etag(created_at, utcnow().date()))
+    if cached:
+        return cached
+    
     ca_info = CAPersistenceService.get_ca_info(db)
     
     if not ca_info:
@@ -92,12 +100,18 @@ def generate_ca(db: Session = Depends(get_db)):
 
 
 @router.get("/certificate")
-def download_ca_certificate(db: Session = Depends(get_db)):
+def download_ca_certificate(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Download CA certificate (PEM format)
     
     Returns raw PEM certificate for download
     """
+    created_at = CAPersistenceService.get_ca_created_at(db)
+    if created_at:
+        cached = not_modified(request, response, "ca_certificate", make_etag(created_at), last_modified=created_at)
+        if cached:
+            return cached
+    
     ca_info = CAPersistenceService.get_ca_info(db)
     
     if not ca_info:
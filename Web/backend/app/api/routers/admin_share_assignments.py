@@ -1,14 +1,16 @@
 """API endpoints for admin share assignment management."""
 import logging
+import uuid
 from datetime import datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
-from sqlalchemy import func
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session, joinedload
 
 from app.api.deps import get_current_user, get_db
+from app.core.responses import OrjsonResponse
 from app.core.time import utcnow
 from app.models.share_assignment import ShareAssignment
 from app.models.share_file import ShareFile
@@ -29,6 +31,30 @@ class ShareAssignmentCreate(BaseModel):
     assignment_notes: Optional[str] = Field(None, description="Optional notes about the assignment")
 
 
+class ShareAssignmentBulkCreate(BaseModel):
+    """Request model for assigning many share files in one call."""
+    items: List[ShareAssignmentCreate] = Field(..., min_length=1, max_length=500, description="Share/user pairs to assign")
+
+
+class ShareAssignmentBulkItemResult(BaseModel):
+    """Outcome of a single pair within a bulk assignment request."""
+    index: int
+    share_file_id: str
+    user_id: str
+    success: bool
+    assignment_id: Optional[str] = None
+    share_number: Optional[int] = None
+    user_email: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ShareAssignmentBulkResponse(BaseModel):
+    """Response model for bulk share assignment."""
+    created: int
+    failed: int
+    results: List[ShareAssignmentBulkItemResult]
+
+
 class ShareAssignmentUpdate(BaseModel):
     """Request model for updating a share assignment."""
     download_allowed: Optional[bool] = Field(None, description="Enable/disable download")
@@ -188,6 +214,112 @@ def create_share_assignment(
         raise HTTPException(status_code=500, detail=f"Failed to create assignment: {str(e)}")
 
 
+@router.post("/bulk", response_model=ShareAssignmentBulkResponse)
+def create_share_assignments_bulk(
+    request: ShareAssignmentBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Assign many share files to users in one call (Admin only).
+    
+    All pairs are validated with set-based lookups (share files, users and
+    existing assignments), valid pairs are inserted with a single statement
+    and the transaction is committed once. Invalid pairs are reported per
+    item and do not prevent the valid ones from being assigned.
+    """
+    _require_super_admin(current_user)
+    
+    share_file_ids = {item.share_file_id for item in request.items}
+    user_ids = {item.user_id for item in request.items}
+    
+    try:
+        share_files = {
+            share_file.id: share_file
+            for share_file in db.query(ShareFile).filter(
+                ShareFile.id.in_(share_file_ids),
+                ShareFile.is_active.is_(True)
+            ).all()
+        }
+        
+        users = {
+            user.id: user
+            for user in db.query(TokenUser).filter(TokenUser.id.in_(user_ids)).all()
+        }
+        
+        existing_pairs = set(
+            db.query(ShareAssignment.share_file_id, ShareAssignment.user_id).filter(
+                ShareAssignment.share_file_id.in_(share_file_ids),
+                ShareAssignment.user_id.in_(user_ids)
+            ).all()
+        )
+        
+        now = utcnow()
+        seen_pairs = set()
+        rows = []
+        results = []
+        
+        for index, item in enumerate(request.items):
+            pair = (item.share_file_id, item.user_id)
+            share_file = share_files.get(item.share_file_id)
+            target_user = users.get(item.user_id)
+            result = ShareAssignmentBulkItemResult(
+                index=index,
+                share_file_id=item.share_file_id,
+                user_id=item.user_id,
+                success=False,
+                share_number=share_file.share_number if share_file else None,
+                user_email=target_user.email if target_user else None
+            )
+            
+            if not share_file:
+                result.error = "Share file not found"
+            elif not target_user:
+                result.error = "User not found"
+            elif pair in existing_pairs:
+                result.error = f"Share #{share_file.share_number} already assigned to {target_user.email}"
+            elif pair in seen_pairs:
+                result.error = "Duplicate pair in request"
+            else:
+                seen_pairs.add(pair)
+                assignment_id = str(uuid.uuid4())
+                rows.append({
+                    "id": assignment_id,
+                    "share_file_id": item.share_file_id,
+                    "user_id": item.user_id,
+                    "assigned_by": current_user.id,
+                    "assigned_at_utc": now,
+                    "is_active": True,
+                    "download_allowed": True,
+                    "download_count": 0,
+                    "assignment_notes": item.assignment_notes
+                })
+                result.success = True
+                result.assignment_id = assignment_id
+            
+            results.append(result)
+        
+        if rows:
+            db.execute(insert(ShareAssignment), rows)
+            db.commit()
+        
+        logger.info(
+            f"[OK] Admin {current_user.email} bulk-assigned {len(rows)} shares "
+            f"({len(request.items) - len(rows)} rejected)"
+        )
+        
+        return ShareAssignmentBulkResponse(
+            created=len(rows),
+            failed=len(request.items) - len(rows),
+            results=results
+        )
+    
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to create bulk share assignments: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to create assignments: {str(e)}")
+
+
 @router.get("/", response_model=List[ShareAssignmentListItem])
 def list_share_assignments(
     token_id: Optional[str] = None,
@@ -211,13 +343,25 @@ def list_share_assignments(
     _require_super_admin(current_user)
     
     try:
-        query = db.query(ShareAssignment).options(
-            joinedload(ShareAssignment.user),
-            joinedload(ShareAssignment.share_file).joinedload(ShareFile.token_deployment)
+        query = (
+            db.query(
+                ShareAssignment.id,
+                TokenUser.email.label("user_email"),
+                ShareFile.share_number,
+                TokenDeployment.token_name,
+                TokenDeployment.network,
+                ShareAssignment.assigned_at_utc,
+                ShareAssignment.download_allowed,
+                ShareAssignment.download_count,
+                ShareAssignment.is_active,
+            )
+            .join(TokenUser, ShareAssignment.user_id == TokenUser.id)
+            .join(ShareFile, ShareAssignment.share_file_id == ShareFile.id)
+            .join(TokenDeployment, ShareFile.token_deployment_id == TokenDeployment.id)
         )
         
         if token_id:
-            query = query.join(ShareFile).filter(ShareFile.token_deployment_id == token_id)
+            query = query.filter(ShareFile.token_deployment_id == token_id)
         
         if user_id:
             query = query.filter(ShareAssignment.user_id == user_id)
@@ -230,23 +374,8 @@ def list_share_assignments(
         
         assignments = query.order_by(ShareAssignment.assigned_at_utc.desc()).limit(limit).all()
         
-        # Build simplified response
-        result = []
-        for assignment in assignments:
-            item = ShareAssignmentListItem(
-                id=assignment.id,
-                user_email=assignment.user.email,
-                share_number=assignment.share_file.share_number,
-                token_name=assignment.share_file.token_deployment.token_name,
-                network=assignment.share_file.token_deployment.network,
-                assigned_at_utc=assignment.assigned_at_utc,
-                download_allowed=assignment.download_allowed,
-                download_count=assignment.download_count,
-                is_active=assignment.is_active
-            )
-            result.append(item)
-        
-        return result
+        # Columns match ShareAssignmentListItem field for field; no per-row validation
+        return OrjsonResponse([assignment._asdict() for assignment in assignments])
     
     except Exception as e:
         logger.error(f"Failed to list share assignments: {e}", exc_info=True)
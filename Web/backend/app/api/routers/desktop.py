@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, Path, HTTPException
+from fastapi import APIRouter, Depends, Path, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app.api.deps import get_db
 from app.api.desktop_deps import get_authenticated_desktop
+from app.core.conditional import make_etag, not_modified
 from app.models import Desktop
 from app.schemas.desktop import (
     DesktopHeartbeatRequest,
@@ -43,8 +44,11 @@ def heartbeat(
     """
     Send a heartbeat to keep the desktop registration alive.
     Requires HMAC authentication.
+
+    Heartbeats are buffered and written back in batches, so last seen and
+    machine info can lag by up to TOKENCONTROL_HEARTBEAT_FLUSH_SECONDS.
     """
-    desktop = desktop_service.heartbeat(db, desktop_app_id, body or DesktopHeartbeatRequest())
+    desktop = desktop_service.heartbeat(db, desktop, body or DesktopHeartbeatRequest())
     return DesktopRegisterResponse(
         desktopStatus=desktop.status,
         requiredApprovalsN=desktop.required_approvals_n,
@@ -54,6 +58,8 @@ def heartbeat(
 
 @router.get("/{desktop_app_id}/unlock-status", response_model=UnlockStatusResponse)
 def unlock_status(
+    request: Request,
+    response: Response,
     desktop_app_id: str,
     desktop: Desktop = Depends(get_authenticated_desktop),
     db: Session = Depends(get_db)
@@ -61,7 +67,16 @@ def unlock_status(
     """
     Check the unlock status of a desktop application.
     Requires HMAC authentication.
+    
+    Sends an ETag of the unlock state; a poll with a matching If-None-Match
+    gets a 304 after one lightweight query. A key rotation is always sent in
+    a full response.
     """
+    if desktop.desktop_app_id == desktop_app_id and not desktop.key_rotation_due:
+        etag = make_etag(*desktop_service.unlock_state_version(db, desktop))
+        cached = not_modified(request, response, "unlock_status", etag)
+        if cached:
+            return cached
     return desktop_service.unlock_status(db, desktop_app_id, desktop.app_type)
 
 
@@ -103,6 +118,8 @@ def submit_csr(
 
 @router.get("/{desktop_app_id}/certificate")
 def get_certificate(
+    request: Request,
+    response: Response,
     desktop_app_id: str,
     desktop: Desktop = Depends(get_authenticated_desktop),
     db: Session = Depends(get_db)
@@ -111,6 +128,13 @@ def get_certificate(
     Retrieve signed certificate if available.
     Requires HMAC authentication.
     """
+    issued = db.query(Desktop.certificate_issued_at).filter(Desktop.desktop_app_id == desktop_app_id).first()
+    if issued and issued.certificate_issued_at:
+        issued_at = issued.certificate_issued_at
+        cached = not_modified(request, response, "desktop_certificate", make_etag(issued_at), last_modified=issued_at)
+        if cached:
+            return cached
+    
     desktop = db.query(Desktop).filter(Desktop.desktop_app_id == desktop_app_id).first()
     if not desktop:
         raise HTTPException(status_code=404, detail="Desktop not found")
@@ -2,11 +2,13 @@ import re
 from datetime import datetime
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel, HttpUrl
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, require_role
+from app.core.conditional import make_etag, not_modified
 from app.models import DownloadLink, User, UserRole
 
 router = APIRouter(prefix="/api/admin/downloads", tags=["downloads"])
@@ -39,10 +41,18 @@ def validate_github_url(url: str) -> bool:
 
 @router.get("", response_model=List[FileInfo])
 def list_files(
+    request: Request,
+    response: Response,
     _: User = Depends(require_role(UserRole.SUPER_ADMIN)),
     db: Session = Depends(get_db),
 ):
     """List all download links"""
+    # Links are only ever added or deleted, never edited: an add raises max(id) and
+    # max(created_at), a delete lowers the count
+    stamp = db.query(func.count(DownloadLink.id), func.max(DownloadLink.id), func.max(DownloadLink.created_at)).one()
+    cached = not_modified(request, response, "downloads", make_etag(*stamp))
+    if cached:
+        return cached
     links = db.query(DownloadLink).order_by(DownloadLink.created_at.desc()).all()
     return [
         FileInfo(
@@ -24,14 +24,30 @@ def _remaining_seconds(until: Optional[datetime]) -> int:
     return int(diff) if diff > 0 else 0
 
 
+def _approval_items(db: Session, session) -> list[dict]:
+    """Approvals with approver emails, looked up in one query."""
+    approver_ids = {a.approver_user_id for a in session.approvals if a.approver_user_id}
+    emails = dict(db.query(User.id, User.email).filter(User.id.in_(approver_ids)).all()) if approver_ids else {}
+    return [
+        {
+            "approverUserId": a.approver_user_id,
+            "approvedAtUtc": a.approved_at_utc,
+            "approverEmail": emails.get(a.approver_user_id),
+        }
+        for a in session.approvals
+    ]
+
+
 @router.get("/desktops", response_model=List[AssignedDesktop])
 def list_assigned(
+    # Primary: approvers reload this right after approving and must see their own approval
     db: Session = Depends(get_db), user: User = Depends(require_role(UserRole.GOVERNANCE_AUTHORITY))
 ):
     desktops = desktop_service.list_assigned_desktops(db, user)
+    sessions = approval_service.get_latest_sessions(db, desktops)
     payload: list[AssignedDesktop] = []
     for d in desktops:
-        session = approval_service.get_latest_session(db, d.desktop_app_id, d.app_type)
+        session = sessions.get((d.desktop_app_id, d.app_type))
         status = session.status if session else SessionStatus.NONE
         unlocked = session.unlocked_until_utc if session else None
         approvals_count = len(session.approvals) if session else 0
@@ -80,16 +96,7 @@ def approve_desktop(
         requiredApprovalsSnapshot=session.required_approvals_snapshot,
         unlockedUntilUtc=session.unlocked_until_utc,
         remainingSeconds=remaining,
-        approvals=[
-            {
-                "approverUserId": a.approver_user_id,
-                "approvedAtUtc": a.approved_at_utc,
-                "approverEmail": db.query(User).filter(User.id == a.approver_user_id).first().email
-                if a.approver_user_id
-                else None,
-            }
-            for a in session.approvals
-        ],
+        approvals=_approval_items(db, session),
     )
 
 
@@ -97,7 +104,7 @@ def approve_desktop(
 def desktop_history(
     desktop_app_id: str,
     app_type: str = "TokenControl",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db),  # shows the caller's own fresh approvals
     user: User = Depends(require_role(UserRole.GOVERNANCE_AUTHORITY)),
 ):
     desktop = db.query(Desktop).filter(
@@ -117,14 +124,5 @@ def desktop_history(
         requiredApprovalsSnapshot=session.required_approvals_snapshot,
         unlockedUntilUtc=session.unlocked_until_utc,
         remainingSeconds=remaining,
-        approvals=[
-            {
-                "approverUserId": a.approver_user_id,
-                "approvedAtUtc": a.approved_at_utc,
-                "approverEmail": db.query(User).filter(User.id == a.approver_user_id).first().email
-                if a.approver_user_id
-                else None,
-            }
-            for a in session.approvals
-        ],
+        approvals=_approval_items(db, session),
     )
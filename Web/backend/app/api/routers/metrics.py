@@ -0,0 +1,20 @@
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+
+from app.core.config import get_settings
+from app.core.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+def require_metrics_token(authorization: str | None = Header(None)) -> None:
+    expected = f"Bearer {get_settings().metrics_token}"
+    if not authorization or not hmac.compare_digest(authorization, expected):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
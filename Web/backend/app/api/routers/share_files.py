@@ -8,7 +8,7 @@ from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session, joinedload
 
 from app.api.deps import get_db
-from app.api.desktop_deps import get_authenticated_desktop
+from app.api.desktop_deps import get_authenticated_desktop, get_request_body
 from app.core.time import utcnow
 from app.models.share_assignment import ShareAssignment
 from app.models.share_file import ShareFile
@@ -99,9 +99,10 @@ class ShareFilesValidationResponse(BaseModel):
 
 
 @router.post("/bulk", response_model=ShareFilesBulkResponse)
-async def create_share_files_bulk(
+def create_share_files_bulk(
     payload: ShareFilesBulkCreate,
     request: Request,
+    body: str = Depends(get_request_body),
     db: Session = Depends(get_db)
 ):
     """
@@ -127,8 +128,9 @@ async def create_share_files_bulk(
             )
 
         if payload.replace_existing:
-            await get_authenticated_desktop(
+            get_authenticated_desktop(
                 request=request,
+                body=body,
                 desktop_id=request.headers.get("X-Desktop-Id"),
                 app_type=request.headers.get("X-App-Type"),
                 timestamp=request.headers.get("X-Desktop-Timestamp"),
@@ -263,9 +265,10 @@ async def create_share_files_bulk(
 
 
 @router.post("/validate", response_model=ShareFilesValidationResponse)
-async def validate_share_files(
+def validate_share_files(
     payload: ShareFilesValidationRequest,
     request: Request,
+    body: str = Depends(get_request_body),
     db: Session = Depends(get_db)
 ):
     """
@@ -273,8 +276,9 @@ async def validate_share_files(
 
     Requires desktop authentication.
     """
-    await get_authenticated_desktop(
+    get_authenticated_desktop(
         request=request,
+        body=body,
         desktop_id=request.headers.get("X-Desktop-Id"),
         app_type=request.headers.get("X-App-Type"),
         timestamp=request.headers.get("X-Desktop-Timestamp"),
@@ -6,8 +6,9 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.deps import get_db, get_read_db
 from app.api.desktop_deps import get_authenticated_desktop
+from app.core.responses import OrjsonResponse
 from app.models import Desktop, ShareOperationLog, ShareOperationType
 
 
@@ -45,7 +46,7 @@ class ShareOperationLogResponse(BaseModel):
 
 
 @router.post("/log", response_model=ShareOperationLogResponse)
-async def log_share_operation(
+def log_share_operation(
     request: Request,
     log_request: ShareOperationLogRequest,
     desktop: Desktop = Depends(get_authenticated_desktop),
@@ -113,12 +114,12 @@ async def log_share_operation(
 
 
 @router.get("/logs")
-async def get_share_operation_logs(
+def get_share_operation_logs(
     desktop_app_id: Optional[str] = None,
     operation_type: Optional[ShareOperationType] = None,
     limit: int = 100,
     desktop: Desktop = Depends(get_authenticated_desktop),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Retrieve share operation logs.
@@ -131,7 +132,25 @@ async def get_share_operation_logs(
     if limit > 500:
         limit = 500
         
-    query = db.query(ShareOperationLog)
+    query = db.query(
+        ShareOperationLog.id,
+        ShareOperationLog.at_utc,
+        ShareOperationLog.desktop_app_id,
+        ShareOperationLog.app_type,
+        ShareOperationLog.machine_name,
+        ShareOperationLog.operation_type,
+        ShareOperationLog.success,
+        ShareOperationLog.operation_stage,
+        ShareOperationLog.total_shares,
+        ShareOperationLog.threshold,
+        ShareOperationLog.shares_used,
+        ShareOperationLog.token_name,
+        ShareOperationLog.token_address,
+        ShareOperationLog.network,
+        ShareOperationLog.shares_path,
+        ShareOperationLog.error_message,
+        ShareOperationLog.notes,
+    )
     
     if desktop_app_id:
         query = query.filter(ShareOperationLog.desktop_app_id == desktop_app_id)
@@ -141,28 +160,8 @@ async def get_share_operation_logs(
     
     logs = query.order_by(ShareOperationLog.at_utc.desc()).limit(limit).all()
     
-    return {
-        "total": len(logs),
-        "logs": [
-            {
-                "id": log.id,
-                "at_utc": log.at_utc.isoformat() if log.at_utc else None,
-                "desktop_app_id": log.desktop_app_id,
-                "app_type": log.app_type,
-                "machine_name": log.machine_name,
-                "operation_type": log.operation_type.value,
-                "success": log.success,
-                "operation_stage": log.operation_stage,
-                "total_shares": log.total_shares,
-                "threshold": log.threshold,
-                "shares_used": log.shares_used,
-                "token_name": log.token_name,
-                "token_address": log.token_address,
-                "network": log.network,
-                "shares_path": log.shares_path,
-                "error_message": log.error_message,
-                "notes": log.notes,
-            }
-            for log in logs
-        ]
-    }
+    items = [log._asdict() for log in logs]
+    for item in items:
+        # This endpoint has always sent isoformat() ("+00:00", not "Z")
+        item["at_utc"] = item["at_utc"].isoformat() if item["at_utc"] else None
+    return OrjsonResponse({"total": len(items), "logs": items})
@@ -20,7 +20,7 @@ class RecoveryResponse(BaseModel):
 
 
 @router.post("/recover", response_model=RecoveryResponse)
-async def recover_from_shares(
+def recover_from_shares(
     request: Request,
     files: List[UploadFile] = File(..., description="2-3 share files"),
     user: User = Depends(require_role(UserRole.SUPER_ADMIN)),
@@ -61,7 +61,7 @@ async def recover_from_shares(
                     detail=f"File {idx + 1}: Must be a JSON file"
                 )
             
-            content = await file.read()
+            content = file.file.read()
             try:
                 share_data = json.loads(content)
             except json.JSONDecodeError:
@@ -106,7 +106,7 @@ async def recover_from_shares(
 
 
 @router.get("/recovery-logs")
-async def get_recovery_logs(
+def get_recovery_logs(
     limit: int = 50,
     user: User = Depends(require_role(UserRole.SUPER_ADMIN)),
     db: Session = Depends(get_db),
@@ -7,7 +7,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.deps import get_db, get_read_db
+from app.core.responses import OrjsonResponse, projection
 from app.models.token_deployment import TokenDeployment
 
 logger = logging.getLogger(__name__)
@@ -133,7 +134,7 @@ def list_token_deployments(
     token_name: Optional[str] = None,
     shares_uploaded: Optional[bool] = None,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     List token deployments with optional filtering.
@@ -142,7 +143,7 @@ def list_token_deployments(
     during emergency recovery scenarios.
     """
     try:
-        query = db.query(TokenDeployment)
+        query = db.query(*projection(TokenDeploymentResponse, TokenDeployment))
         
         if network:
             query = query.filter(TokenDeployment.network == network)
@@ -158,7 +159,8 @@ def list_token_deployments(
         
         deployments = query.order_by(TokenDeployment.created_at_utc.desc()).limit(limit).all()
         
-        return deployments
+        # Columns straight from the table: no per-row response_model validation
+        return OrjsonResponse([row._asdict() for row in deployments])
     
     except Exception as e:
         logger.error(f"Failed to list token deployments: {e}", exc_info=True)
@@ -4,36 +4,22 @@ import uuid
 from datetime import datetime
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+from pydantic import BaseModel, field_validator
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, require_role
 from app.core import security
 from app.models import TokenUser, TokenUserAssignment, TokenDeployment, UserRole
+from app.schemas.token_share_user import TokenShareUserCreate, TokenShareUserUpdate, normalize_email
+from app.services import token_user_import_service
+from app.services.token_user_auth_service import token_user_email_column
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/token-share-users", tags=["token-share-users"])
 
 
-class TokenShareUserCreate(BaseModel):
-    """Request model for creating a token share user (or assigning existing user to token)."""
-    token_deployment_id: str = Field(..., min_length=1)
-    name: str = Field(..., min_length=1, max_length=255)
-    email: EmailStr
-    phone: str | None = Field(None, max_length=20)
-    password: str = Field(..., min_length=8)
-
-
-class TokenShareUserUpdate(BaseModel):
-    """Request model for updating a token share user."""
-    name: str | None = Field(None, min_length=1, max_length=255)
-    email: EmailStr | None = None
-    phone: str | None = Field(None, max_length=20)
-    password: str | None = Field(None, min_length=8)
-
-
 class TokenShareUserResponse(BaseModel):
     """Response model for token share user (includes assignment info)."""
     id: str  # User ID
@@ -56,6 +42,29 @@ class TokenShareUserResponse(BaseModel):
         from_attributes = True
 
 
+class TokenShareUserImportRowResult(BaseModel):
+    """Outcome of a single row of a bulk import."""
+    row: int
+    email: str | None
+    status: str  # created | updated | updated_assigned | assigned | already_assigned | invalid | failed
+    user_id: str | None
+    error: str | None
+
+
+class TokenShareUserImportResponse(BaseModel):
+    """Response model for a bulk import."""
+    token_deployment_id: str
+    total_rows: int
+    created: int
+    updated: int
+    updated_assigned: int
+    assigned: int
+    already_assigned: int
+    invalid: int
+    failed: int
+    rows: List[TokenShareUserImportRowResult]
+
+
 @router.get("/check-email/{email}")
 def check_email_exists(
     email: str,
@@ -70,18 +79,24 @@ def check_email_exists(
     logger.info(f"Checking if email '{email}' exists (token_deployment_id={token_deployment_id})")
     
     # Check if user exists
-    user = db.query(TokenUser).filter(TokenUser.email == email).first()
+    user = db.query(TokenUser).filter(token_user_email_column(db) == normalize_email(email)).first()
     
     if not user:
         return {"exists": False, "tokens": []}
     
-    # Check if already assigned to this specific token
-    existing_assignment = db.query(TokenUserAssignment).filter(
-        TokenUserAssignment.user_id == user.id,
-        TokenUserAssignment.token_deployment_id == token_deployment_id
-    ).first()
+    # All tokens the user is assigned to, in one joined query
+    assigned_tokens = db.query(
+        TokenDeployment.id,
+        TokenDeployment.token_name,
+        TokenDeployment.contract_address
+    ).join(
+        TokenUserAssignment, TokenUserAssignment.token_deployment_id == TokenDeployment.id
+    ).filter(
+        TokenUserAssignment.user_id == user.id
+    ).all()
     
-    if existing_assignment:
+    # Check if already assigned to this specific token
+    if any(token.id == token_deployment_id for token in assigned_tokens):
         return {
             "exists": True,
             "already_assigned": True,
@@ -89,20 +104,14 @@ def check_email_exists(
             "message": f"User {email} is already assigned to this token"
         }
     
-    # Get all token assignments for this user
-    assignments = db.query(TokenUserAssignment).filter(
-        TokenUserAssignment.user_id == user.id
-    ).all()
-    
-    tokens = []
-    for assignment in assignments:
-        token = db.query(TokenDeployment).filter(TokenDeployment.id == assignment.token_deployment_id).first()
-        if token:
-            tokens.append({
-                "token_id": token.id,
-                "token_name": token.token_name,
-                "contract_address": token.contract_address
-            })
+    tokens = [
+        {
+            "token_id": token.id,
+            "token_name": token.token_name,
+            "contract_address": token.contract_address
+        }
+        for token in assigned_tokens
+    ]
     
     logger.info(f"User '{email}' exists with {len(tokens)} token assignments")
     return {
@@ -133,7 +142,7 @@ def create_token_share_user(
             raise HTTPException(status_code=404, detail="Token deployment not found")
         
         # Check if user already exists
-        user = db.query(TokenUser).filter(TokenUser.email == body.email).first()
+        user = db.query(TokenUser).filter(token_user_email_column(db) == body.email).first()
         
         if user:
             # User exists - check if already assigned to this token
@@ -215,38 +224,108 @@ def create_token_share_user(
         raise HTTPException(status_code=500, detail=f"Failed to create/assign user: {str(e)}")
 
 
+@router.post("/token/{token_deployment_id}/import", response_model=TokenShareUserImportResponse)
+def import_token_share_users(
+    token_deployment_id: str,
+    file: UploadFile = File(..., description="CSV (name,email,phone,password) or NDJSON file"),
+    format: str | None = Query(None, pattern="^(csv|ndjson)$", description="Defaults to detection from the filename"),
+    update_existing: bool = Query(False, description="Overwrite name, phone and password of existing users"),
+    db: Session = Depends(get_db),
+    _=Depends(require_role(UserRole.SUPER_ADMIN))
+):
+    """
+    Bulk import users for a token deployment.
+    
+    The file is read row by row; invalid rows are reported and skipped.
+    Passwords are hashed in a process pool and users/assignments are
+    upserted in batches. Existing users (by email, case-insensitively) are
+    assigned to the token. Rows of a batch that could not be saved are
+    reported as failed; all other rows were committed.
+    """
+    token_deployment = db.query(TokenDeployment.id).filter(
+        TokenDeployment.id == token_deployment_id
+    ).first()
+    
+    if not token_deployment:
+        raise HTTPException(status_code=404, detail="Token deployment not found")
+    
+    fmt = format or token_user_import_service.detect_format(file.filename, file.content_type)
+    
+    try:
+        result = token_user_import_service.import_token_users(
+            db, token_deployment_id, file.file, fmt, update_existing=update_existing
+        )
+    except UnicodeDecodeError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Import file must be UTF-8 encoded")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to import token share users: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to import users: {str(e)}")
+    
+    return TokenShareUserImportResponse(**result)
+
+
+def _prefix_match(db: Session, column, q: str):
+    """Case-insensitive prefix filter that can still use the column's index."""
+    if db.get_bind().dialect.name == "mysql":
+        # The _ci collations already compare case-insensitively; lower() would bypass the index
+        return column.startswith(q, autoescape=True)
+    # PostgreSQL has lower(...) varchar_pattern_ops indexes for this (migration 021)
+    return column.istartswith(q, autoescape=True)
+
+
 @router.get("/token/{token_deployment_id}", response_model=List[TokenShareUserResponse])
 def list_token_share_users(
     token_deployment_id: str,
+    response: Response,
+    q: str | None = Query(None, max_length=255, description="Case-insensitive name or email prefix"),
+    page: int | None = Query(None, ge=1),
+    page_size: int | None = Query(None, ge=1, le=500),
     db: Session = Depends(get_db),
     _=Depends(require_role(UserRole.SUPER_ADMIN))
 ):
-    """Get all users assigned to a specific token deployment."""
+    """
+    Get users assigned to a specific token deployment, sorted by name.
+    
+    Users and assignments are loaded with a single joined query. Without
+    `page`/`page_size` every match is returned; with either, one page
+    (default size 500) is returned and a count query runs as well. The
+    total number of matches is always sent in the X-Total-Count header.
+    """
     try:
-        # Get all assignments for this token
-        assignments = db.query(TokenUserAssignment).filter(
+        query = db.query(TokenUser, TokenUserAssignment.id).join(
+            TokenUserAssignment, TokenUserAssignment.user_id == TokenUser.id
+        ).filter(
             TokenUserAssignment.token_deployment_id == token_deployment_id
-        ).all()
+        )
         
-        result = []
-        for assignment in assignments:
-            user = db.query(TokenUser).filter(TokenUser.id == assignment.user_id).first()
-            if user:
-                result.append(TokenShareUserResponse(
-                    id=user.id,
-                    assignment_id=assignment.id,
-                    token_deployment_id=token_deployment_id,
-                    name=user.name,
-                    email=user.email,
-                    phone=user.phone,
-                    created_at_utc=user.created_at.isoformat(),
-                    mfa_enabled=user.mfa_enabled
-                ))
+        if q:
+            query = query.filter(_prefix_match(db, TokenUser.name, q) | _prefix_match(db, TokenUser.email, q))
         
-        # Sort by name
-        result.sort(key=lambda x: x.name)
+        query = query.order_by(TokenUser.name, TokenUser.id)
+        if page is None and page_size is None:
+            rows = query.all()
+            total = len(rows)
+        else:
+            page, page_size = page or 1, page_size or 500
+            total = query.order_by(None).count()
+            rows = query.offset((page - 1) * page_size).limit(page_size).all()
+        response.headers["X-Total-Count"] = str(total)
         
-        return result
+        return [
+            TokenShareUserResponse(
+                id=user.id,
+                assignment_id=assignment_id,
+                token_deployment_id=token_deployment_id,
+                name=user.name,
+                email=user.email,
+                phone=user.phone,
+                created_at_utc=user.created_at.isoformat(),
+                mfa_enabled=user.mfa_enabled
+            )
+            for user, assignment_id in rows
+        ]
     
     except Exception as e:
         logger.error(f"Failed to list token share users: {e}", exc_info=True)
@@ -269,9 +348,9 @@ def update_token_share_user(
             raise HTTPException(status_code=404, detail="User not found")
         
         # Check for duplicate email if email is being changed
-        if body.email and body.email != user.email:
+        if body.email and body.email != user.email.lower():
             existing = db.query(TokenUser).filter(
-                TokenUser.email == body.email,
+                token_user_email_column(db) == body.email,
                 TokenUser.id != user_id
             ).first()
             
@@ -6,7 +6,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import Response
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, contains_eager, joinedload
 
 from app.api.deps import get_current_token_user, get_db
 from app.core.time import utcnow
@@ -281,6 +281,7 @@ def download_share(
 
 @router.get("/history", response_model=List[DownloadHistoryItem])
 def get_download_history(
+    # Primary: ClientWeb refetches (and caches) this right after a download
     db: Session = Depends(get_db),
     current_user: TokenUser = Depends(get_current_token_user)
 ):
@@ -297,6 +298,11 @@ def get_download_history(
         .join(ShareAssignment, ShareDownloadLog.share_assignment_id == ShareAssignment.id)
         .join(ShareFile, ShareAssignment.share_file_id == ShareFile.id)
         .join(TokenDeployment, ShareFile.token_deployment_id == TokenDeployment.id)
+        .options(
+            contains_eager(ShareDownloadLog.assignment)
+            .contains_eager(ShareAssignment.share_file)
+            .contains_eager(ShareFile.token_deployment)
+        )
         .filter(ShareDownloadLog.token_user_id == current_user.id)
         .order_by(ShareDownloadLog.downloaded_at_utc.desc())
         .all()
@@ -0,0 +1,74 @@
+"""
+Conditional GET (ETag / Last-Modified) for mostly-static resources.
+
+A handler first reads a cheap version stamp for its resource (a max(updated
+timestamp) and row count, a settings value, an issue date) and passes it to
+`not_modified`. When the client's If-None-Match (or, without one,
+If-Modified-Since) still matches, the handler returns the 304 it gets back
+and never runs the full query or serialization; otherwise the validators are
+set on the response and the handler carries on as before.
+
+Last-Modified is only sent for single objects that are replaced as a whole;
+lists also change by deletion, which a timestamp cannot express, so they rely
+on the ETag alone.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from app.core.metrics import record_cache_lookup
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the given version stamp parts."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison: W/ prefixes are ignored
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    cache: str,
+    etag: str,
+    last_modified: datetime | None = None,
+) -> Response | None:
+    """Return a 304 for a current client copy; otherwise set the validators on `response` and return None."""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        fresh = bool(if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified))
+
+    record_cache_lookup(cache, fresh)
+    if fresh:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
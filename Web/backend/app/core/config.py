@@ -21,6 +21,22 @@ class Settings(BaseSettings):
     # values must come from environment/.env to avoid hardcoding secrets
     database_url: str = ""
     db_echo: bool = False
+    # Optional read replica for list/reporting routes; empty = everything uses database_url
+    read_database_url: str = ""
+    read_replica_max_lag_seconds: float = 5.0  # fall back to the primary beyond this lag
+    read_replica_check_seconds: float = 10.0
+    # "dev": create_all + seed data on boot; "production": only verify the Alembic revision
+    startup_profile: str = "dev"
+
+    # Per-request query count / DB time (Server-Timing header + slow request log)
+    sql_timing_enabled: bool = True
+    sql_timing_sample_rate: float = 1.0  # share of requests instrumented, 0..1
+    sql_timing_server_timing_header: bool = True
+    slow_request_ms: float = 1000.0
+
+    # Prometheus /metrics; off by default and always behind a bearer token
+    metrics_enabled: bool = False
+    metrics_token: str = ""
 
     jwt_secret: str = ""
     jwt_issuer: str = ""
@@ -32,6 +48,16 @@ class Settings(BaseSettings):
 
     unlock_minutes_default: int = 15
     required_approvals_default: int = 2
+    # How often each worker marks desktops due for key rotation; 0 disables the planner
+    key_rotation_plan_seconds: float = 3600.0
+    # Desktop heartbeats are buffered per worker and written back this often; 0 writes each one through
+    heartbeat_flush_seconds: float = 10.0
+
+    # Token share user bulk import
+    import_batch_size: int = 500
+    import_max_rows: int = 50000
+    # Password hashing processes per server worker for imports (0 hashes in the request thread)
+    import_hash_workers: int = 2
 
     cors_origins_raw: str = "http://localhost:5173"
     enable_docs: bool = True
@@ -0,0 +1,49 @@
+"""
+In-process periodic jobs.
+
+Each job runs on its own daemon thread in every worker: once at start, then
+every `interval` seconds until stopped. Jobs must therefore be idempotent and
+safe to run concurrently from several workers (a bulk UPDATE with a guard in
+its WHERE clause, for example). An exception is logged and the job runs again
+on the next tick.
+"""
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    def __init__(self, name: str, interval: float, func: Callable[[], None]):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name=f"periodic-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop the job; `func` runs one last time first, so pending work is not lost."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        self._run_once()
+        while not self._stop.wait(self.interval):
+            self._run_once()
+        self._run_once()
+
+    def _run_once(self) -> None:
+        try:
+            self.func()
+        except Exception:
+            logger.exception(f"Periodic job {self.name} failed")
@@ -0,0 +1,140 @@
+"""
+Per-request SQL instrumentation.
+
+SQLAlchemy cursor hooks add each statement's duration to the stats of the
+request being served, which `SQLTimingMiddleware` starts for a sampled share
+of requests. Sampled responses get a `Server-Timing` header and requests
+slower than the threshold are logged as one JSON line on the
+`app.core.sql_timing` logger. The hooks are only attached once the middleware
+is installed; unsampled requests and work outside a request (startup, scripts)
+then pay for a context variable lookup per statement.
+"""
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+MAX_STATEMENT_CHARS = 500
+
+
+@dataclass
+class RequestSQLStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str = ""
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+
+# Sync handlers run in the threadpool with a copy of the request's context, so
+# they see (and mutate) the same stats object the middleware created.
+_current_stats: ContextVar[RequestSQLStats | None] = ContextVar("request_sql_stats", default=None)
+
+
+def current_sql_stats() -> RequestSQLStats | None:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("sql_timing_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    starts = conn.info.get("sql_timing_start")
+    if stats is not None and starts:
+        stats.record(statement, time.perf_counter() - starts.pop())
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    starts = conn.info.get("sql_timing_start") if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+def install_sql_hooks() -> None:
+    """Attach the cursor hooks to every engine (idempotent)."""
+    for name, fn in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(Engine, name, fn):
+            event.listen(Engine, name, fn)
+
+
+class SQLTimingMiddleware:
+    """ASGI middleware that collects SQL stats for a sampled share of HTTP requests."""
+
+    def __init__(self, app, sample_rate: float = 1.0, slow_request_ms: float = 500.0, server_timing: bool = True):
+        install_sql_hooks()
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSQLStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", self._server_timing(stats).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if elapsed_ms >= self.slow_request_ms:
+                self._log_slow_request(scope, status_code, elapsed_ms, stats)
+
+    @staticmethod
+    def _server_timing(stats: RequestSQLStats) -> str:
+        return (
+            f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+            f"db-slowest;dur={stats.slowest_seconds * 1000:.1f}"
+        )
+
+    @staticmethod
+    def _log_slow_request(scope, status_code: int, elapsed_ms: float, stats: RequestSQLStats) -> None:
+        route = scope.get("route")
+        logger.warning(json.dumps({
+            "event": "slow_request",
+            "method": scope["method"],
+            "route": getattr(route, "path", scope["path"]),
+            "status": status_code,
+            "duration_ms": round(elapsed_ms, 1),
+            "queries": stats.queries,
+            "db_ms": round(stats.db_seconds * 1000, 1),
+            "slowest_query_ms": round(stats.slowest_seconds * 1000, 1),
+            "slowest_query": " ".join(stats.slowest_statement.split())[:MAX_STATEMENT_CHARS],
+        }))
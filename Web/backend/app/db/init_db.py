@@ -1,8 +1,59 @@
+import ast
+from functools import lru_cache
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 from app.core import security
 from app.models import Desktop, DesktopStatus, GovernanceAssignment, User, UserRole
 
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+
+
+@lru_cache(maxsize=1)
+def alembic_heads() -> frozenset[str]:
+    """Head revision(s) of the migration scripts.
+
+    Reads the literal `revision`/`down_revision` assignments instead of importing
+    alembic, which would add its dialect machinery to every worker's startup.
+    """
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in MIGRATIONS_DIR.glob("*.py"):
+        assigned = {
+            node.targets[0].id: node.value
+            for node in ast.parse(path.read_text(encoding="utf-8")).body
+            if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name)
+        }
+        if "revision" not in assigned:
+            continue
+        revisions.add(ast.literal_eval(assigned["revision"]))
+        down = ast.literal_eval(assigned["down_revision"]) if "down_revision" in assigned else None
+        if isinstance(down, str):
+            parents.add(down)
+        elif down:
+            parents.update(down)
+    return frozenset(revisions - parents)
+
+
+def check_schema_revision(engine: Engine) -> str:
+    """Fail fast unless the database is at the Alembic head revision; returns that revision."""
+    heads = alembic_heads()
+    try:
+        with engine.connect() as conn:
+            current = {row[0] for row in conn.execute(text("SELECT version_num FROM alembic_version"))}
+    except Exception as e:
+        raise RuntimeError(f"Could not read the Alembic schema revision ({e}); run `alembic upgrade head`") from e
+
+    if current != heads:
+        raise RuntimeError(
+            f"Database schema revision {sorted(current) or 'none'} does not match "
+            f"migration head {sorted(heads)}; run `alembic upgrade head` before starting"
+        )
+    return ", ".join(sorted(heads))
+
 
 def seed_data(db: Session):
     """Create sample users/desktops/assignment for quick testing."""
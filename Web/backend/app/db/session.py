@@ -1,8 +1,16 @@
-from sqlalchemy import create_engine
+import logging
+import math
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
 engine = create_engine(
@@ -13,3 +21,96 @@ engine = create_engine(
 )
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, future=True)
+
+# Optional read replica for read-only list/reporting routes (see get_read_session_factory)
+read_engine = (
+    create_engine(
+        settings.read_database_url,
+        echo=settings.db_echo,
+        future=True,
+        pool_pre_ping=True,
+    )
+    if settings.read_database_url
+    else None
+)
+
+ReadSessionLocal = (
+    sessionmaker(bind=read_engine, autoflush=False, autocommit=False, expire_on_commit=False, future=True)
+    if read_engine is not None
+    else None
+)
+
+
+def replication_lag_seconds(conn: Connection) -> float | None:
+    """Replica lag in seconds (inf when replication is stopped), or None if the dialect cannot report it."""
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        lag = conn.execute(text(
+            "SELECT CASE WHEN NOT pg_is_in_recovery() "
+            "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+        )).scalar()
+        return float(lag) if lag is not None else math.inf
+    if dialect == "mysql":
+        row = conn.execute(text("SHOW REPLICA STATUS")).mappings().first()
+        if row is None:
+            return 0.0  # not a replica
+        lag = row.get("Seconds_Behind_Source")
+        return float(lag) if lag is not None else math.inf
+    conn.execute(text("SELECT 1"))
+    return None
+
+
+class ReplicaHealth:
+    """Reachability and lag of the read replica, re-checked at most every `check_interval` seconds."""
+
+    def __init__(self, engine: Engine, max_lag_seconds: float, check_interval: float):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checked_at = -math.inf
+        self._healthy = False
+
+    def is_healthy(self) -> bool:
+        """
+        Last known state while it is fresh. Once stale, one caller re-checks;
+        everyone else uses the primary until that check is done instead of
+        waiting on it (an unreachable replica can take a full connect timeout).
+        """
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self._healthy
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._healthy = self._check()
+            self._checked_at = time.monotonic()
+        finally:
+            self._lock.release()
+        return self._healthy
+
+    def _check(self) -> bool:
+        try:
+            with self.engine.connect() as conn:
+                lag = replication_lag_seconds(conn)
+        except Exception as e:
+            logger.warning(f"Read replica unavailable, using primary: {e}")
+            return False
+        if lag is not None and lag > self.max_lag_seconds:
+            logger.warning(f"Read replica lagging {lag:.1f}s (max {self.max_lag_seconds}s), using primary")
+            return False
+        return True
+
+
+replica_health = (
+    ReplicaHealth(read_engine, settings.read_replica_max_lag_seconds, settings.read_replica_check_seconds)
+    if read_engine is not None
+    else None
+)
+
+
+def get_read_session_factory() -> sessionmaker:
+    """Replica sessions when a healthy replica is configured, otherwise primary sessions."""
+    if ReadSessionLocal is not None and replica_health.is_healthy():
+        return ReadSessionLocal
+    return SessionLocal
@@ -22,11 +22,18 @@ from app.api.routers import (
     token_user_auth
 )
 from app.core.config import get_settings
+from app.core.metrics import MetricsMiddleware, instrument_engine
+from app.core.periodic import PeriodicJob
+from app.core.responses import OrjsonResponse
+from app.core.sql_timing import SQLTimingMiddleware
 from app.db.base import Base
-from app.db.session import engine
+from app.db.session import SessionLocal, engine, read_engine
 from app.services.auth_service import ensure_super_admin_exists
-from app.db.init_db import seed_data
-from app.api.routers import debug
+from app.services.heartbeat_service import heartbeat_aggregator
+from app.services.key_rotation_service import plan_key_rotations
+from app.services.token_user_import_service import shutdown_hash_pool
+from app.db.init_db import check_schema_revision, seed_data
+from app.api.routers import debug, metrics
 
 import pyotp
 
@@ -55,7 +62,8 @@ app = FastAPI(
     docs_url=docs_url, 
     redoc_url=redoc_url, 
     openapi_url=openapi_url,
-    root_path=settings.root_path  # For reverse proxy with path prefix
+    root_path=settings.root_path,  # For reverse proxy with path prefix
+    default_response_class=OrjsonResponse,
 )
 
 app.add_middleware(
@@ -64,8 +72,23 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
     allow_credentials=True,
+    expose_headers=["X-Total-Count"],
 )
 
+if settings.sql_timing_enabled:
+    app.add_middleware(
+        SQLTimingMiddleware,
+        sample_rate=settings.sql_timing_sample_rate,
+        slow_request_ms=settings.slow_request_ms,
+        server_timing=settings.sql_timing_server_timing_header,
+    )
+
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine, "primary")
+    if read_engine is not None:
+        instrument_engine(read_engine, "replica")
+
 app.include_router(auth.router)
 app.include_router(desktop.router)
 app.include_router(governance.router)
@@ -83,15 +106,26 @@ app.include_router(token_share_users.router)
 app.include_router(token_user_auth.router)
 if settings.enable_docs:
     app.include_router(debug.router)
+if settings.metrics_enabled:
+    if settings.metrics_token:
+        app.include_router(metrics.router)
+    else:
+        logger.warning("TOKENCONTROL_METRICS_ENABLED is set without TOKENCONTROL_METRICS_TOKEN; /metrics is not served")
 
 
 @app.on_event("startup")
 def on_startup():
-    logger.info("Application startup initiated")
+    logger.info(f"Application startup initiated (profile: {settings.startup_profile})")
+    if settings.startup_profile == "production":
+        # Schema is owned by Alembic; no seeding, and the admin is only created (never rehashed)
+        revision = check_schema_revision(engine)
+        logger.info(f"Database schema at revision {revision}")
+        with SessionLocal() as db:
+            ensure_super_admin_exists(db, refresh_password=False)
+        return
+
     Base.metadata.create_all(bind=engine)
     # Seed test data for local/dev
-    from app.db.session import SessionLocal
-
     db = SessionLocal()
     try:
         ensure_super_admin_exists(db)
@@ -102,3 +136,39 @@ def on_startup():
         raise
     finally:
         db.close()
+
+
+def _plan_key_rotations():
+    db = SessionLocal()
+    try:
+        plan_key_rotations(db)
+    finally:
+        db.close()
+
+
+def _flush_heartbeats():
+    db = SessionLocal()
+    try:
+        heartbeat_aggregator.flush(db)
+    finally:
+        db.close()
+
+
+key_rotation_planner = PeriodicJob("key-rotation-planner", settings.key_rotation_plan_seconds, _plan_key_rotations)
+heartbeat_flusher = PeriodicJob("heartbeat-flush", settings.heartbeat_flush_seconds, _flush_heartbeats)
+
+
+@app.on_event("startup")
+def start_periodic_jobs():
+    if settings.key_rotation_plan_seconds > 0:
+        key_rotation_planner.start()
+    if settings.heartbeat_flush_seconds > 0:
+        heartbeat_flusher.start()
+
+
+@app.on_event("shutdown")
+def stop_periodic_jobs():
+    key_rotation_planner.stop()
+    # Writes the heartbeats still buffered in this worker
+    heartbeat_flusher.stop()
+    shutdown_hash_pool()
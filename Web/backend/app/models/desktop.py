@@ -1,7 +1,8 @@
 import enum
 import uuid
 
-from sqlalchemy import Column, DateTime, Enum, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Enum, Integer, String
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship
 
 from app.core.config import get_settings
@@ -32,6 +33,7 @@ class Desktop(Base):
     # HMAC authentication
     secret_key = Column(String(64), nullable=True)  # Base64-encoded HMAC secret key
     secret_key_rotated_at = Column(DateTime(timezone=True), nullable=True)  # Last key rotation timestamp
+    key_rotation_due = Column(Boolean, default=False, nullable=False)  # Set by the rotation planner, cleared on rotation
     
     # Certificate authentication
     certificate_pem = Column(String, nullable=True)  # Signed desktop certificate (PEM format)
@@ -42,6 +44,15 @@ class Desktop(Base):
     
     created_at_utc = Column(DateTime(timezone=True), default=utcnow, nullable=False)
     last_seen_at_utc = Column(DateTime(timezone=True), nullable=True)
+    # Bumped by every UPDATE; max() is the version stamp behind the admin list ETag, so
+    # MySQL needs microseconds (plain DATETIME would let same-second changes collide)
+    updated_at_utc = Column(
+        DateTime(timezone=True).with_variant(mysql.DATETIME(timezone=True, fsp=6), "mysql"),
+        default=utcnow,
+        onupdate=utcnow,
+        nullable=True,
+        index=True,
+    )
     machine_name = Column(String(255), nullable=True)
     token_control_version = Column(String(64), nullable=True)
     os_user = Column(String(128), nullable=True)
@@ -1,6 +1,7 @@
 from datetime import datetime
 
 from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.dialects import mysql
 
 from app.db.base import Base
 
@@ -11,5 +12,6 @@ class DownloadLink(Base):
     id = Column(Integer, primary_key=True, index=True)
     url = Column(String, nullable=False, unique=True)
     filename = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Part of the downloads ETag stamp; microseconds on MySQL so same-second changes differ
+    created_at = Column(DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"), default=datetime.utcnow, nullable=False)
     created_by = Column(String, nullable=False)
@@ -1,6 +1,6 @@
 """Token share user model - represents users who can access token shares."""
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 import uuid
@@ -29,6 +29,25 @@ class TokenUser(Base):
     login_challenges = relationship("TokenUserLoginChallenge", back_populates="token_user", cascade="all, delete-orphan")
     download_logs = relationship("ShareDownloadLog", back_populates="token_user", cascade="all, delete-orphan")
 
+    # Case-insensitive prefix search, as created by migration 021: PostgreSQL needs
+    # lower() expression indexes with varchar_pattern_ops, other databases use a plain
+    # name index (MySQL's _ci collation matches case-insensitively)
+    __table_args__ = (
+        Index(
+            "ix_token_users_name",
+            func.lower(name).label("name_lower"),
+            postgresql_ops={"name_lower": "varchar_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_token_users_email_prefix",
+            func.lower(email).label("email_lower"),
+            postgresql_ops={"email_lower": "varchar_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index("ix_token_users_name", "name").ddl_if(
+            callable_=lambda ddl, target, bind, dialect=None, **kw: dialect.name != "postgresql"
+        ),
+    )
+
 
 class TokenUserAssignment(Base):
     """
@@ -48,6 +67,7 @@ class TokenUserAssignment(Base):
     token = relationship("TokenDeployment")
     
     __table_args__ = (
+        Index("ix_token_user_assignments_token_user", "token_deployment_id", "user_id"),
         # Ensure a user can only be assigned to a token once
         {'mysql_charset': 'utf8mb4', 'mysql_collate': 'utf8mb4_unicode_ci'},
     )
@@ -0,0 +1,34 @@
+"""Pydantic schemas for managing token share users."""
+from pydantic import BaseModel, EmailStr, Field, field_validator
+
+
+def normalize_email(email: str) -> str:
+    """Token share user emails are stored and compared in lower case."""
+    return email.strip().lower()
+
+
+class TokenShareUserCreate(BaseModel):
+    """Request model for creating a token share user (or assigning existing user to token)."""
+    token_deployment_id: str = Field(..., min_length=1)
+    name: str = Field(..., min_length=1, max_length=255)
+    email: EmailStr
+    phone: str | None = Field(None, max_length=20)
+    password: str = Field(..., min_length=8)
+
+    @field_validator("email")
+    @classmethod
+    def lower_case_email(cls, v: str) -> str:
+        return normalize_email(v)
+
+
+class TokenShareUserUpdate(BaseModel):
+    """Request model for updating a token share user."""
+    name: str | None = Field(None, min_length=1, max_length=255)
+    email: EmailStr | None = None
+    phone: str | None = Field(None, max_length=20)
+    password: str | None = Field(None, min_length=8)
+
+    @field_validator("email")
+    @classmethod
+    def lower_case_email(cls, v: str | None) -> str | None:
+        return normalize_email(v) if v is not None else None
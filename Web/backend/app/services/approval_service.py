@@ -1,27 +1,33 @@
 from datetime import timedelta
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, tuple_
+from sqlalchemy.orm import Session, selectinload
 
+from app.core.metrics import APPROVALS, UNLOCKS
 from app.core.time import utcnow
 from app.models import Approval, ApprovalSession, Desktop, SessionStatus, User
 from app.models.desktop import DesktopStatus
 from .audit_service import log_audit
 
 
+def _unlock_has_lapsed(session: ApprovalSession, now) -> bool:
+    if not (session.unlocked_until_utc and session.status == SessionStatus.UNLOCKED):
+        return False
+    # ensure both datetimes are tz-aware
+    unlocked_until = session.unlocked_until_utc
+    if unlocked_until.tzinfo is None:
+        unlocked_until = unlocked_until.replace(tzinfo=now.tzinfo)
+    return now >= unlocked_until
+
+
 def _expire_if_needed(session: ApprovalSession, db: Session | None = None) -> None:
-    now = utcnow()
-    if session.unlocked_until_utc and session.status == SessionStatus.UNLOCKED:
-        # ensure both datetimes are tz-aware
-        unlocked_until = session.unlocked_until_utc
-        if unlocked_until.tzinfo is None:
-            unlocked_until = unlocked_until.replace(tzinfo=now.tzinfo)
-        if now >= unlocked_until:
-            session.status = SessionStatus.EXPIRED
-            if db:
-                db.add(session)
-                db.commit()
-                db.refresh(session)
+    if _unlock_has_lapsed(session, utcnow()):
+        session.status = SessionStatus.EXPIRED
+        if db:
+            db.add(session)
+            db.commit()
+            db.refresh(session)
 
 
 def _get_latest_session(db: Session, desktop_app_id: str, app_type: str) -> ApprovalSession | None:
@@ -43,6 +49,47 @@ def get_latest_session(db: Session, desktop_app_id: str, app_type: str) -> Appro
     return session
 
 
+def get_latest_sessions(db: Session, desktops: list[Desktop]) -> dict[tuple[str, str], ApprovalSession]:
+    """Latest session (approvals loaded) per (desktop_app_id, app_type), in two queries for all desktops."""
+    keys = {(d.desktop_app_id, d.app_type) for d in desktops}
+    if not keys:
+        return {}
+    latest = (
+        db.query(
+            ApprovalSession.desktop_app_id,
+            ApprovalSession.app_type,
+            func.max(ApprovalSession.created_at_utc).label("created_at_utc"),
+        )
+        .filter(tuple_(ApprovalSession.desktop_app_id, ApprovalSession.app_type).in_(keys))
+        .group_by(ApprovalSession.desktop_app_id, ApprovalSession.app_type)
+        .subquery()
+    )
+    sessions = (
+        db.query(ApprovalSession)
+        .join(
+            latest,
+            and_(
+                ApprovalSession.desktop_app_id == latest.c.desktop_app_id,
+                ApprovalSession.app_type == latest.c.app_type,
+                ApprovalSession.created_at_utc == latest.c.created_at_utc,
+            ),
+        )
+        .options(selectinload(ApprovalSession.approvals))
+        .all()
+    )
+    now = utcnow()
+    lapsed = [session.id for session in sessions if _unlock_has_lapsed(session, now)]
+    if lapsed:
+        # One UPDATE and one commit for every lapsed unlock, instead of one per session
+        (
+            db.query(ApprovalSession)
+            .filter(ApprovalSession.id.in_(lapsed), ApprovalSession.status == SessionStatus.UNLOCKED)
+            .update({ApprovalSession.status: SessionStatus.EXPIRED}, synchronize_session="evaluate")
+        )
+        db.commit()
+    return {(session.desktop_app_id, session.app_type): session for session in sessions}
+
+
 def get_or_create_active_session(db: Session, desktop: Desktop) -> ApprovalSession:
     latest = _get_latest_session(db, desktop.desktop_app_id, desktop.app_type)
     if latest:
@@ -93,6 +140,7 @@ def add_approval(db: Session, desktop: Desktop, approver: User) -> ApprovalSessi
     db.add(approval)
     db.commit()
     db.refresh(approval)
+    APPROVALS.inc()
 
     approvals_count = db.query(Approval).filter(Approval.session_id == session.id).count()
     required = session.required_approvals_snapshot
@@ -104,6 +152,7 @@ def add_approval(db: Session, desktop: Desktop, approver: User) -> ApprovalSessi
         session.status = SessionStatus.UNLOCKED
         db.add(session)
         db.commit()
+        UNLOCKS.inc()
         log_audit(
             db,
             action="UNLOCKED",
@@ -7,6 +7,7 @@ from typing import Optional, List
 from sqlalchemy.orm import Session
 
 from app.models.auth_log import AuthenticationLog, AuthEventType
+from app.core.metrics import DESKTOP_AUTH_EVENTS
 from app.core.time import utcnow
 
 
@@ -60,6 +61,7 @@ def log_auth_attempt(
     db.add(log_entry)
     db.commit()
     db.refresh(log_entry)
+    DESKTOP_AUTH_EVENTS.labels(AuthEventType(event_type).value, str(success).lower()).inc()
     
     return log_entry
 
@@ -4,7 +4,6 @@ import uuid
 from datetime import timedelta
 
 import pyotp
-import qrcode
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
@@ -99,10 +98,19 @@ def verify_otp_and_issue_tokens(db: Session, challenge_id: str, otp: str):
     }
 
 
-def ensure_super_admin_exists(db: Session):
-    """Seed a single SuperAdmin for dev environments if none exist."""
-    existing_admin = db.query(User).filter(User.role == UserRole.SUPER_ADMIN).first()
+def ensure_super_admin_exists(db: Session, refresh_password: bool = True):
+    """
+    Seed a single SuperAdmin if none exist.
+
+    With `refresh_password` (dev) an existing admin's password is reset to the
+    default under the current hashing scheme; without it (production) an
+    existing admin costs one query and is left untouched.
+    """
+    existing_admin = db.query(User.id).filter(User.role == UserRole.SUPER_ADMIN).first()
+    if existing_admin and not refresh_password:
+        return existing_admin
     if existing_admin:
+        existing_admin = db.get(User, existing_admin.id)
         # Refresh default password hash to current scheme
         existing_admin.password_hash = security.hash_password("ChangeMe123!")
         db.add(existing_admin)
@@ -167,6 +175,8 @@ def refresh_access_token(db: Session, refresh_token: str):
 def build_otpauth_and_qr(email: str, secret: str):
     settings = get_settings()
     otpauth = f"otpauth://totp/{settings.totp_issuer}:{email}?secret={secret}&issuer={settings.totp_issuer}"
+    import qrcode  # imports PIL; only needed for MFA enrolment
+
     img = qrcode.make(otpauth)
     buf = io.BytesIO()
     img.save(buf, format="PNG")
@@ -146,6 +146,18 @@ class CAPersistenceService:
             "issuer": cert_info['issuer']
         }
     
+    @staticmethod
+    def get_ca_created_at(db: Session) -> Optional[datetime]:
+        """
+        Creation time of the current CA (one row, no certificate parsing)
+        
+        Every CA generation rewrites it, so it doubles as the CA version stamp.
+        """
+        created_setting = db.query(SystemSetting.value).filter(
+            SystemSetting.key == CAPersistenceService.CA_CREATED_KEY
+        ).first()
+        return datetime.fromisoformat(created_setting.value) if created_setting else None
+    
     @staticmethod
     def ca_exists(db: Session) -> bool:
         """Check if CA exists in database"""
@@ -1,11 +1,6 @@
 """
 Certificate Authority (CA) management service
 """
-from cryptography import x509
-from cryptography.x509.oid import NameOID, ExtensionOID
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
-from cryptography.hazmat.backends import default_backend
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
 from sqlalchemy.orm import Session
@@ -33,6 +28,13 @@ class CAService:
         Returns:
             Tuple of (ca_cert_pem, ca_key_pem, created_at, expires_at)
         """
+        # x509 support is imported on first use to keep it out of app startup
+        from cryptography import x509
+        from cryptography.x509.oid import NameOID
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from cryptography.hazmat.backends import default_backend
+
         # Generate RSA private key for CA (4096-bit for strong security)
         private_key = rsa.generate_private_key(
             public_exponent=65537,
@@ -113,6 +115,11 @@ class CAService:
         Returns:
             Signed certificate in PEM format
         """
+        from cryptography import x509
+        from cryptography.x509.oid import ExtensionOID
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.backends import default_backend
+
         # Load CA certificate and key
         ca_cert = x509.load_pem_x509_certificate(ca_cert_pem, default_backend())
         ca_key = serialization.load_pem_private_key(ca_key_pem, password=None, backend=default_backend())
@@ -189,6 +196,9 @@ class CAService:
     @staticmethod
     def get_ca_info(ca_cert_pem: bytes) -> dict:
         """Extract information from CA certificate"""
+        from cryptography import x509
+        from cryptography.hazmat.backends import default_backend
+
         cert = x509.load_pem_x509_certificate(ca_cert_pem, default_backend())
         
         # Handle both old and new cryptography versions
@@ -1,4 +1,5 @@
 from fastapi import HTTPException, status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from typing import Optional, Tuple
@@ -6,11 +7,12 @@ from typing import Optional, Tuple
 from app.core.time import utcnow
 from app.core.hmac_auth import generate_secret_key
 from app.core.config import get_settings
-from app.models import Desktop, DesktopStatus, GovernanceAssignment, SessionStatus, User
+from app.models import Approval, ApprovalSession, Desktop, DesktopStatus, GovernanceAssignment, SessionStatus, User
 from app.schemas.desktop import DesktopHeartbeatRequest, DesktopRegisterRequest, DesktopUpdateRequest
 from .approval_service import get_latest_session
 from .audit_service import log_audit
-from .key_rotation_service import check_and_rotate_if_needed
+from .heartbeat_service import record_heartbeat, write_changed_info
+from .key_rotation_service import rotate_if_due
 from .ca_service import CAService
 from .ca_persistence_service import CAPersistenceService
 
@@ -47,27 +49,32 @@ def register_desktop(db: Session, body: DesktopRegisterRequest) -> Desktop:
         )
         created = True
 
-    desktop.machine_name = body.machineName or desktop.machine_name
-    desktop.token_control_version = body.tokenControlVersion or desktop.token_control_version
-    desktop.os_user = body.osUser or desktop.os_user
-    desktop.name_label = body.nameLabel or desktop.name_label
-    desktop.last_seen_at_utc = utcnow()
-
-    db.add(desktop)
-    db.commit()
-    db.refresh(desktop)
+    info = {
+        "machine_name": body.machineName,
+        "token_control_version": body.tokenControlVersion,
+        "os_user": body.osUser,
+        "name_label": body.nameLabel,
+    }
 
     if created:
+        for field, value in info.items():
+            setattr(desktop, field, value)
+        desktop.last_seen_at_utc = utcnow()
+        db.add(desktop)
+        db.commit()
+        db.refresh(desktop)
         log_audit(db, action="REGISTERED", desktop_app_id=desktop.desktop_app_id, details={"nameLabel": desktop.name_label, "appType": desktop.app_type})
-    else:
+    elif record_heartbeat(db, desktop, utcnow(), **info) and write_changed_info(db, desktop, **info):
+        # Re-registration is a heartbeat; only audit the ones that change the machine info,
+        # once, from the worker whose write actually changed the row
         log_audit(
             db,
             action="HEARTBEAT",
             desktop_app_id=desktop.desktop_app_id,
             details={
-                "machineName": desktop.machine_name,
-                "tokenControlVersion": desktop.token_control_version,
-                "osUser": desktop.os_user,
+                "machineName": body.machineName or desktop.machine_name,
+                "tokenControlVersion": body.tokenControlVersion or desktop.token_control_version,
+                "osUser": body.osUser or desktop.os_user,
             },
         )
 
@@ -78,20 +85,16 @@ def register_desktop(db: Session, body: DesktopRegisterRequest) -> Desktop:
     return desktop
 
 
-def heartbeat(db: Session, desktop_app_id: str, body: DesktopHeartbeatRequest) -> Desktop:
-    # Note: desktop is already filtered by app_type in get_authenticated_desktop dependency
-    desktop = db.query(Desktop).filter(Desktop.desktop_app_id == desktop_app_id).first()
-    if not desktop:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Desktop not found")
-
-    desktop.machine_name = body.machineName or desktop.machine_name
-    desktop.token_control_version = body.tokenControlVersion or desktop.token_control_version
-    desktop.os_user = body.osUser or desktop.os_user
-    desktop.last_seen_at_utc = utcnow()
-
-    db.add(desktop)
-    db.commit()
-    db.refresh(desktop)
+def heartbeat(db: Session, desktop: Desktop, body: DesktopHeartbeatRequest) -> Desktop:
+    """Queue a heartbeat of the authenticated desktop; written back by the heartbeat flush."""
+    record_heartbeat(
+        db,
+        desktop,
+        utcnow(),
+        machine_name=body.machineName,
+        token_control_version=body.tokenControlVersion,
+        os_user=body.osUser,
+    )
     return desktop
 
 
@@ -103,8 +106,8 @@ def unlock_status(db: Session, desktop_app_id: str, app_type: str):
     if not desktop:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Desktop not found")
 
-    # Check if key rotation is needed and perform it
-    rotated, new_key = check_and_rotate_if_needed(db, desktop)
+    # Hand out the rotation the planner marked, if any
+    rotated, new_key = rotate_if_due(db, desktop)
 
     session = get_latest_session(db, desktop.desktop_app_id, desktop.app_type)
     now = utcnow()
@@ -131,6 +134,45 @@ def unlock_status(db: Session, desktop_app_id: str, app_type: str):
     return response
 
 
+def unlock_state_version(db: Session, desktop: Desktop) -> tuple:
+    """
+    Everything the unlock_status payload of `desktop` depends on, in one query.
+
+    Backs the unlock-status ETag. The remaining seconds are part of it, so an
+    unlocked desktop (whose countdown changes every second) always gets a full
+    response; a session past its unlock window counts as expired, as
+    unlock_status would record it.
+    """
+    approvals = select(func.count(Approval.id)).where(Approval.session_id == ApprovalSession.id).scalar_subquery()
+    session = (
+        db.query(ApprovalSession.id, ApprovalSession.status, ApprovalSession.unlocked_until_utc, approvals)
+        .filter(
+            ApprovalSession.desktop_app_id == desktop.desktop_app_id,
+            ApprovalSession.app_type == desktop.app_type,
+        )
+        .order_by(ApprovalSession.created_at_utc.desc())
+        .first()
+    )
+    if session is None:
+        return (desktop.status.value, desktop.required_approvals_n, None)
+
+    session_id, session_status, unlocked_until, approvals_so_far = session
+    now = utcnow()
+    unlocked_until = _make_aware(unlocked_until)
+    if session_status == SessionStatus.UNLOCKED and unlocked_until and now >= unlocked_until:
+        session_status = SessionStatus.EXPIRED
+    remaining = int((unlocked_until - now).total_seconds()) if unlocked_until and unlocked_until > now else 0
+    return (
+        desktop.status.value,
+        desktop.required_approvals_n,
+        session_id,
+        session_status.value,
+        unlocked_until,
+        remaining,
+        approvals_so_far,
+    )
+
+
 def update_desktop(db: Session, desktop_app_id: str, app_type: str, body: DesktopUpdateRequest) -> Desktop:
     # Filter by both desktop_app_id and app_type to target specific desktop
     desktop = db.query(Desktop).filter(
@@ -0,0 +1,135 @@
+"""
+Write-behind heartbeats.
+
+Desktops heartbeat (and re-register) far more often than anything about them
+changes. Instead of an UPDATE and COMMIT per call, `heartbeat_aggregator`
+keeps the latest heartbeat per desktop in memory and `flush` writes them back
+in batched UPDATEs, run periodically by a PeriodicJob (see app.main).
+
+A pending entry always carries last_seen_at_utc and only those machine info
+fields whose value differs from the desktop row, so unchanged info is never
+rewritten. The UPDATE only applies when the row's last_seen_at_utc is older
+than the entry's, so a flush from a worker holding a stale heartbeat does not
+overwrite a newer one written by another worker.
+
+Every worker compares against its own copy of the row, so several workers can
+see the same machine info change. Callers that act on a change (the HEARTBEAT
+audit on re-registration) confirm it with `write_changed_info`, whose UPDATE
+only matches while the row still differs; exactly one worker wins.
+"""
+import logging
+import threading
+from datetime import datetime
+
+from sqlalchemy import bindparam, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models import Desktop
+
+logger = logging.getLogger(__name__)
+
+
+class HeartbeatAggregator:
+    """Latest pending heartbeat per (desktop_app_id, app_type)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, str], dict] = {}
+
+    def record(self, desktop: Desktop, seen_at: datetime, **info) -> bool:
+        """
+        Queue a heartbeat of `desktop`.
+
+        Falsy values in `info` keep the current value, as they always have.
+        Returns True when the heartbeat changes any of the `info` fields.
+        """
+        key = (desktop.desktop_app_id, desktop.app_type)
+        changed = False
+        with self._lock:
+            entry = self._pending.setdefault(key, {})
+            for field, value in info.items():
+                if value and value != entry.get(field, getattr(desktop, field)):
+                    entry[field] = value
+                    changed = True
+            if entry.get("last_seen_at_utc") is None or entry["last_seen_at_utc"] < seen_at:
+                entry["last_seen_at_utc"] = seen_at
+        return changed
+
+    def flush(self, db: Session) -> int:
+        """Write all pending heartbeats; returns the number of desktops flushed."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        # One executemany per set of written columns; nearly always just last_seen_at_utc
+        groups: dict[tuple[str, ...], list[dict]] = {}
+        for (desktop_app_id, app_type), fields in pending.items():
+            row = {"b_desktop_app_id": desktop_app_id, "b_app_type": app_type}
+            row.update({f"v_{field}": value for field, value in fields.items()})
+            groups.setdefault(tuple(sorted(fields)), []).append(row)
+
+        table = Desktop.__table__
+        try:
+            for columns, rows in groups.items():
+                stmt = (
+                    update(table)
+                    .where(
+                        table.c.desktop_app_id == bindparam("b_desktop_app_id"),
+                        table.c.app_type == bindparam("b_app_type"),
+                        or_(
+                            table.c.last_seen_at_utc.is_(None),
+                            table.c.last_seen_at_utc < bindparam("v_last_seen_at_utc"),
+                        ),
+                    )
+                    .values({column: bindparam(f"v_{column}") for column in columns})
+                )
+                db.execute(stmt, rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Put the batch back unless a newer heartbeat has replaced it meanwhile
+            with self._lock:
+                for key, fields in pending.items():
+                    self._pending[key] = {**fields, **self._pending.get(key, {})}
+            raise
+        return len(pending)
+
+
+heartbeat_aggregator = HeartbeatAggregator()
+
+
+def write_changed_info(db: Session, desktop: Desktop, **info) -> bool:
+    """
+    Write the machine info of `desktop` now, if the row still differs.
+
+    Falsy values in `info` are ignored, as in `HeartbeatAggregator.record`.
+    Returns True only when this UPDATE changed the row, so of several workers
+    reporting the same change exactly one gets True.
+    """
+    values = {field: value for field, value in info.items() if value}
+    if not values:
+        return False
+    result = db.execute(
+        update(Desktop)
+        .where(
+            Desktop.id == desktop.id,
+            or_(*(getattr(Desktop, field).is_distinct_from(value) for field, value in values.items())),
+        )
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def record_heartbeat(db: Session, desktop: Desktop, seen_at: datetime, **info) -> bool:
+    """
+    Queue a heartbeat, or write it through when buffering is disabled
+    (TOKENCONTROL_HEARTBEAT_FLUSH_SECONDS=0). Returns True when machine info changed.
+    """
+    changed = heartbeat_aggregator.record(desktop, seen_at, **info)
+    if get_settings().heartbeat_flush_seconds <= 0:
+        heartbeat_aggregator.flush(db)
+    return changed
@@ -1,7 +1,15 @@
 """
 Key rotation service for desktop applications
+
+Rotation is planned in bulk: `plan_key_rotations` runs periodically and sets
+`desktops.key_rotation_due` on every desktop whose key has passed the policy
+age. The unlock-status poll then only reads that flag and, when it is set,
+rotates and hands out the new key in its response.
 """
-from datetime import datetime, timedelta, timezone
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, or_, update
 from sqlalchemy.orm import Session
 
 from app.core.hmac_auth import generate_secret_key
@@ -10,43 +18,57 @@ from app.models import Desktop
 from app.models.auth_log import AuthEventType
 from app.services.auth_log_service import log_auth_attempt
 
+logger = logging.getLogger(__name__)
 
 # Key rotation policy: rotate keys older than 90 days
 KEY_ROTATION_DAYS = 90
 
 
-def _make_aware(dt: datetime) -> datetime:
-    """Ensure datetime is timezone-aware (UTC)"""
-    if dt is None:
-        return None
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt
+def plan_key_rotations(db: Session, now: datetime | None = None) -> int:
+    """
+    Mark every desktop whose secret key is due for rotation.
 
+    A key is due once it is KEY_ROTATION_DAYS old, counted from its last
+    rotation or, if it was never rotated, from the desktop's registration.
+    Desktops without a key are due as well.
 
-def should_rotate_key(desktop: Desktop) -> bool:
-    """
-    Determine if a desktop's secret key should be rotated.
-    
     Args:
-        desktop: Desktop object
-        
+        db: Database session
+        now: Reference time (defaults to the current time)
+
     Returns:
-        True if key should be rotated, False otherwise
+        Number of desktops newly marked
     """
-    if not desktop.secret_key:
-        return True  # No key exists
-    
-    if not desktop.secret_key_rotated_at:
-        # Key exists but never rotated - check creation date
-        if desktop.created_at_utc:
-            age = utcnow() - _make_aware(desktop.created_at_utc)
-            return age.days >= KEY_ROTATION_DAYS
-        return True
-    
-    # Check if key is older than rotation policy
-    age = utcnow() - _make_aware(desktop.secret_key_rotated_at)
-    return age.days >= KEY_ROTATION_DAYS
+    cutoff = (now or utcnow()) - timedelta(days=KEY_ROTATION_DAYS)
+    result = db.execute(
+        update(Desktop)
+        .where(
+            Desktop.key_rotation_due.is_(False),
+            or_(
+                Desktop.secret_key.is_(None),
+                func.coalesce(Desktop.secret_key_rotated_at, Desktop.created_at_utc) <= cutoff,
+            ),
+        )
+        .values(key_rotation_due=True)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if result.rowcount:
+        logger.info(f"Marked {result.rowcount} desktop(s) for key rotation")
+    return result.rowcount
+
+
+def _log_rotation(db: Session, desktop: Desktop) -> None:
+    log_auth_attempt(
+        db=db,
+        desktop_app_id=desktop.desktop_app_id,
+        event_type=AuthEventType.KEY_ROTATION,
+        success=True,
+        error_message=f"Key rotated (age exceeded {KEY_ROTATION_DAYS} days)",
+        machine_name=desktop.machine_name,
+        os_user=desktop.os_user,
+        token_control_version=desktop.token_control_version
+    )
 
 
 def rotate_desktop_key(db: Session, desktop: Desktop) -> str:
@@ -60,46 +82,55 @@ def rotate_desktop_key(db: Session, desktop: Desktop) -> str:
     Returns:
         The new secret key (base64-encoded)
     """
-    old_key = desktop.secret_key
     new_key = generate_secret_key()
     
     desktop.secret_key = new_key
     desktop.secret_key_rotated_at = utcnow()
+    desktop.key_rotation_due = False
     
     db.add(desktop)
     db.commit()
     db.refresh(desktop)
     
     # Log key rotation event
-    log_auth_attempt(
-        db=db,
-        desktop_app_id=desktop.desktop_app_id,
-        event_type=AuthEventType.KEY_ROTATION,
-        success=True,
-        error_message=f"Key rotated (age exceeded {KEY_ROTATION_DAYS} days)",
-        machine_name=desktop.machine_name,
-        os_user=desktop.os_user,
-        token_control_version=desktop.token_control_version
-    )
+    _log_rotation(db, desktop)
     
     return new_key
 
 
-def check_and_rotate_if_needed(db: Session, desktop: Desktop) -> tuple[bool, str | None]:
+def rotate_if_due(db: Session, desktop: Desktop) -> tuple[bool, str | None]:
     """
-    Check if key rotation is needed and perform it if necessary.
-    
+    Rotate the key if the planner marked the desktop as due.
+
+    Only the precomputed flag is read, so a desktop that is not due pays
+    nothing for rotation on its poll. Concurrent polls of the same desktop
+    race for the flag with a conditional UPDATE; only the poll that clears
+    it rotates, so the key is replaced and handed out exactly once.
+
     Args:
         db: Database session
         desktop: Desktop object
-        
+
     Returns:
         Tuple of (rotated: bool, new_key: str | None)
         - rotated: True if key was rotated
         - new_key: The new secret key if rotated, None otherwise
     """
-    if should_rotate_key(desktop):
-        new_key = rotate_desktop_key(db, desktop)
-        return (True, new_key)
-    
-    return (False, None)
+    if not desktop.key_rotation_due:
+        return (False, None)
+
+    new_key = generate_secret_key()
+    claimed = db.execute(
+        update(Desktop)
+        .where(Desktop.id == desktop.id, Desktop.key_rotation_due.is_(True))
+        .values(key_rotation_due=False, secret_key=new_key, secret_key_rotated_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    db.refresh(desktop)
+    if claimed.rowcount != 1:
+        # Another poll claimed the rotation and handed out the new key
+        return (False, None)
+
+    _log_rotation(db, desktop)
+    return (True, new_key)
@@ -5,8 +5,6 @@ import json
 import re
 from typing import List, Dict, Any
 
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import unpad
 from fastapi import HTTPException, status
 
 
@@ -20,6 +18,10 @@ def derive_encryption_key(salt: str) -> bytes:
 
 def decrypt_mnemonic(encrypted_hex: str, iv_hex: str, key: bytes) -> str:
     """Decrypt AES-256-CBC encrypted mnemonic."""
+    # pycryptodome is slow to import; load it on first recovery, not at startup
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import unpad
+
     try:
         encrypted_bytes = bytes.fromhex(encrypted_hex)
         iv = bytes.fromhex(iv_hex)
@@ -5,8 +5,8 @@ import uuid
 from datetime import timedelta
 
 import pyotp
-import qrcode
 from fastapi import HTTPException, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.core import security
@@ -15,6 +15,19 @@ from app.core.mfa import verify_otp
 from app.core.time import utcnow
 from app.models.token_user_login_challenge import TokenUserLoginChallenge
 from app.models.token_user import TokenUser, TokenUserAssignment
+from app.schemas.token_share_user import normalize_email
+
+
+def token_user_email_column(db: Session):
+    """
+    TokenUser.email for comparing against a normalized (lower-case) email.
+
+    Emails are stored lower-cased, but rows created before that may not be.
+    MySQL's _ci collation already compares case-insensitively and keeps the
+    index usable; elsewhere lower() is applied (PostgreSQL has a lower(email)
+    index, see migration 021).
+    """
+    return TokenUser.email if db.get_bind().dialect.name == "mysql" else func.lower(TokenUser.email)
 
 
 def _cleanup_old_token_user_challenges(db: Session, token_user_id: str) -> None:
@@ -38,7 +51,7 @@ def create_token_user_login_challenge(
     # Find user by email
     user = (
         db.query(TokenUser)
-        .filter(TokenUser.email == email)
+        .filter(token_user_email_column(db) == normalize_email(email))
         .first()
     )
     
@@ -94,9 +107,14 @@ def create_token_user_login_challenge(
     tokens_list = None
     if len(assignments) > 1:
         from app.models.token_deployment import TokenDeployment
+        token_ids = [assignment.token_deployment_id for assignment in assignments]
+        tokens = {
+            token.id: token
+            for token in db.query(TokenDeployment).filter(TokenDeployment.id.in_(token_ids))
+        }
         tokens_list = []
-        for assignment in assignments:
-            token = db.query(TokenDeployment).filter(TokenDeployment.id == assignment.token_deployment_id).first()
+        for token_id in token_ids:
+            token = tokens.get(token_id)
             if token:
                 tokens_list.append({
                     "token_id": token.id,
@@ -116,7 +134,9 @@ def build_otpauth_and_qr(email: str, secret: str) -> tuple[str, str]:
     issuer = "Aegis Mint - Share Portal"
     otpauth_url = pyotp.TOTP(secret).provisioning_uri(name=email, issuer_name=issuer)
     
-    # Generate QR code
+    # Generate QR code (qrcode/PIL are imported on first enrolment, not at startup)
+    import qrcode
+
     qr = qrcode.QRCode(version=1, box_size=10, border=4)
     qr.add_data(otpauth_url)
     qr.make(fit=True)
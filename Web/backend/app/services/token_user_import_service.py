@@ -0,0 +1,306 @@
+"""Bulk import of token share users from CSV or NDJSON files."""
+import csv
+import io
+import json
+import logging
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import BinaryIO, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.core import security
+from app.core.config import get_settings
+from app.models.token_user import TokenUser, TokenUserAssignment
+from app.schemas.token_share_user import TokenShareUserCreate
+from app.services.token_user_auth_service import token_user_email_column
+
+logger = logging.getLogger(__name__)
+
+_hash_pool: ProcessPoolExecutor | None = None
+_hash_pool_lock = threading.Lock()
+
+
+STATUSES = ("created", "updated", "updated_assigned", "assigned", "already_assigned", "invalid", "failed")
+
+
+def _get_hash_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Lazily create this server worker's password hashing pool.
+
+    Every gunicorn worker gets its own pool, so it is kept small
+    (TOKENCONTROL_IMPORT_HASH_WORKERS, not one per core) and shut down with the app.
+    """
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # spawn avoids forking a process that already runs server threads
+            _hash_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            logger.info(f"Started password hashing pool with {workers} workers")
+        return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    """Stop the hashing pool's processes, if one was started (app shutdown)."""
+    global _hash_pool
+    with _hash_pool_lock:
+        pool, _hash_pool = _hash_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """Hash passwords in the process pool, preserving order."""
+    workers = get_settings().import_hash_workers
+    if len(passwords) <= 1 or workers <= 0:
+        return [security.hash_password(password) for password in passwords]
+    global _hash_pool
+    pool = _get_hash_pool(workers)
+    chunksize = max(1, len(passwords) // (workers * 4))
+    try:
+        return list(pool.map(security.hash_password, passwords, chunksize=chunksize))
+    except BrokenProcessPool:
+        # Drop the dead pool so the next import starts a fresh one
+        with _hash_pool_lock:
+            if _hash_pool is pool:
+                _hash_pool = None
+        raise
+
+
+def detect_format(filename: str | None, content_type: str | None) -> str:
+    """Guess the import format from the upload's filename or content type."""
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or (content_type or "").startswith(("application/x-ndjson", "application/jsonl")):
+        return "ndjson"
+    return "csv"
+
+
+def iter_raw_rows(stream: BinaryIO, fmt: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """
+    Stream (row_number, raw_row, parse_error) tuples from an uploaded file.
+    Lines are read incrementally so the file is never held in memory at once.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "ndjson":
+        for row_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(raw, dict):
+                yield row_number, None, "Row must be a JSON object"
+                continue
+            yield row_number, raw, None
+    else:
+        reader = csv.DictReader(text)
+        # Row numbers match the file's line numbers (header is line 1)
+        for raw in reader:
+            yield reader.line_num, {k.strip().lower(): v for k, v in raw.items() if k}, None
+
+
+def _field(raw: dict, key: str) -> str:
+    value = raw.get(key)
+    return "" if value is None else str(value).strip()
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+    )
+
+
+def _import_batch(
+    db: Session,
+    token_deployment_id: str,
+    batch: list[tuple[int, TokenShareUserCreate]],
+    update_existing: bool,
+) -> list[dict]:
+    """
+    Upsert one batch of validated rows and return their report entries.
+
+    Statuses: created (new user, assigned), updated (existing user
+    overwritten, already assigned), updated_assigned (existing user
+    overwritten and newly assigned), assigned (existing user left as is,
+    newly assigned), already_assigned (nothing to do).
+    """
+    emails = [row.email for _, row in batch]
+    existing_users = {
+        user.email.lower(): user
+        for user in db.query(TokenUser.id, TokenUser.email).filter(token_user_email_column(db).in_(emails)).all()
+    }
+    assigned_user_ids = {
+        user_id
+        for (user_id,) in db.query(TokenUserAssignment.user_id).filter(
+            TokenUserAssignment.token_deployment_id == token_deployment_id,
+            TokenUserAssignment.user_id.in_([user.id for user in existing_users.values()]),
+        ).all()
+    } if existing_users else set()
+
+    # Only hash passwords that will actually be stored
+    to_hash = [
+        row.password for _, row in batch
+        if row.email not in existing_users or update_existing
+    ]
+    hashes = iter(hash_passwords(to_hash))
+
+    now = datetime.utcnow()
+    new_users = []
+    updated_users = []
+    new_assignments = []
+    report = []
+
+    for row_number, row in batch:
+        existing = existing_users.get(row.email)
+        if existing is None:
+            user_id = str(uuid.uuid4())
+            new_users.append({
+                "id": user_id,
+                "email": row.email,
+                "name": row.name,
+                "phone": row.phone,
+                "password_hash": next(hashes),
+                "mfa_enabled": False,
+                "created_at": now,
+                "updated_at": now,
+            })
+            status = "created"
+        else:
+            user_id = existing.id
+            if update_existing:
+                updated_users.append({
+                    "id": user_id,
+                    "name": row.name,
+                    "phone": row.phone,
+                    "password_hash": next(hashes),
+                    "updated_at": now,
+                })
+                status = "updated"
+            else:
+                status = "assigned"
+
+        if user_id in assigned_user_ids:
+            if status == "assigned":
+                status = "already_assigned"
+        else:
+            if status == "updated":
+                status = "updated_assigned"
+            new_assignments.append({
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "token_deployment_id": token_deployment_id,
+                "created_at": now,
+                "updated_at": now,
+            })
+            assigned_user_ids.add(user_id)
+
+        report.append({"row": row_number, "email": row.email, "status": status, "user_id": user_id, "error": None})
+
+    if new_users:
+        db.execute(insert(TokenUser), new_users)
+    if updated_users:
+        db.execute(update(TokenUser), updated_users)
+    if new_assignments:
+        db.execute(insert(TokenUserAssignment), new_assignments)
+    db.commit()
+    return report
+
+
+def import_token_users(
+    db: Session,
+    token_deployment_id: str,
+    stream: BinaryIO,
+    fmt: str,
+    update_existing: bool = False,
+) -> dict:
+    """
+    Import token share users for a token deployment from a CSV/NDJSON stream.
+
+    Rows are validated as they are read, passwords are hashed in a process
+    pool and users/assignments are upserted and committed in batches.
+    Existing users (matched by email, case-insensitively) are assigned to the
+    token; their profile and password are only overwritten when
+    update_existing is set. A batch that cannot be saved is rolled back and
+    its rows are reported as failed; earlier and later batches are kept, so
+    the report tells which rows were committed. Returns a summary plus a
+    per-row report.
+    """
+    settings = get_settings()
+    batch_size = max(1, settings.import_batch_size)
+    report: list[dict] = []
+    batch: list[tuple[int, TokenShareUserCreate]] = []
+    seen_emails: set[str] = set()
+    total_rows = 0
+    last_row = 0
+
+    def invalid(row_number: int, email: str | None, error: str) -> None:
+        report.append({"row": row_number, "email": email, "status": "invalid", "user_id": None, "error": error})
+
+    def save(batch: list[tuple[int, TokenShareUserCreate]]) -> None:
+        try:
+            report.extend(_import_batch(db, token_deployment_id, batch, update_existing))
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Token user import batch (rows {batch[0][0]}-{batch[-1][0]}) failed: {e}", exc_info=True)
+            error = f"Batch not saved: {getattr(e, 'orig', None) or e}"
+            report.extend(
+                {"row": row_number, "email": row.email, "status": "failed", "user_id": None, "error": error}
+                for row_number, row in batch
+            )
+
+    rows = iter_raw_rows(stream, fmt)
+    while True:
+        try:
+            row_number, raw, parse_error = next(rows)
+        except StopIteration:
+            break
+        except UnicodeDecodeError:
+            invalid(last_row + 1, None, "File is not valid UTF-8; remaining rows skipped")
+            break
+        last_row = row_number
+        total_rows += 1
+        if total_rows > settings.import_max_rows:
+            invalid(row_number, None, f"Row limit of {settings.import_max_rows} exceeded; remaining rows skipped")
+            break
+        if parse_error:
+            invalid(row_number, None, parse_error)
+            continue
+        try:
+            row = TokenShareUserCreate(
+                token_deployment_id=token_deployment_id,
+                name=_field(raw, "name"),
+                email=_field(raw, "email"),
+                phone=_field(raw, "phone") or None,
+                password=_field(raw, "password"),
+            )
+        except ValidationError as e:
+            invalid(row_number, _field(raw, "email") or None, _validation_message(e))
+            continue
+        if row.email in seen_emails:
+            invalid(row_number, row.email, "Duplicate email in file")
+            continue
+        seen_emails.add(row.email)
+
+        batch.append((row_number, row))
+        if len(batch) >= batch_size:
+            save(batch)
+            batch = []
+
+    if batch:
+        save(batch)
+
+    report.sort(key=lambda entry: entry["row"])
+    counts = {status: 0 for status in STATUSES}
+    for entry in report:
+        counts[entry["status"]] += 1
+
+    logger.info(f"Imported token users for {token_deployment_id}: {counts}")
+    return {"token_deployment_id": token_deployment_id, "total_rows": len(report), **counts, "rows": report}
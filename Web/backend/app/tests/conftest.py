@@ -0,0 +1,256 @@
+"""
+Shared fixtures for API-level tests.
+
+`api_env(n)` builds a throwaway SQLite database seeded with fan-out `n` (n
+users, desktops, approvals, tokens, share files, assignments, logs, ...), a
+FastAPI app with every router from app.main wired to it, and a counter for
+the SQL statements each request issues.
+"""
+import base64
+import hashlib
+import hmac
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.api.routers import (
+    admin,
+    admin_ca,
+    admin_share_assignments,
+    auth,
+    desktop,
+    downloads,
+    governance,
+    mint_approval,
+    share_files,
+    share_operations,
+    share_recovery,
+    token_deployment,
+    token_share_users,
+    token_user_auth,
+    user_shares,
+)
+from app.core import security
+from app.core.config import get_settings
+from app.core.responses import OrjsonResponse
+from app.db.base import Base
+from app.models import (
+    Approval,
+    ApprovalSession,
+    AuditLog,
+    Desktop,
+    DesktopStatus,
+    DownloadLink,
+    GovernanceAssignment,
+    SessionStatus,
+    ShareAssignment,
+    ShareDownloadLog,
+    ShareFile,
+    ShareOperationLog,
+    ShareOperationType,
+    ShareRecoveryLog,
+    TokenDeployment,
+    TokenUser,
+    TokenUserAssignment,
+    User,
+    UserRole,
+)
+
+ROUTERS = [
+    auth,
+    desktop,
+    governance,
+    admin,
+    admin_ca,
+    share_recovery,
+    share_operations,
+    token_deployment,
+    downloads,
+    mint_approval,
+    share_files,
+    admin_share_assignments,
+    user_shares,
+    token_share_users,
+    token_user_auth,
+]
+
+PASSWORD = "Secret123!"
+MFA_SECRET = "JBSWY3DPEHPK3PXP"
+DESKTOP_ID = "desktop-main"
+DESKTOP_SECRET = base64.b64encode(b"k" * 32).decode()
+
+
+@dataclass
+class ApiEnv:
+    client: TestClient
+    engine: Engine
+    ids: dict = field(default_factory=dict)
+
+    @contextmanager
+    def count_queries(self):
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *_):
+            statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(self.engine, "before_cursor_execute", record)
+
+    def bearer(self, user_key: str) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.ids[user_key + '_token']}"}
+
+    def desktop_headers(self, body: str = "") -> dict[str, str]:
+        timestamp = str(int(time.time()))
+        message = f"{DESKTOP_ID}:{timestamp}:{body}".encode()
+        digest = hmac.new(base64.b64decode(DESKTOP_SECRET), message, hashlib.sha256).digest()
+        return {
+            "X-Desktop-Id": DESKTOP_ID,
+            "X-App-Type": "TokenControl",
+            "X-Desktop-Timestamp": timestamp,
+            "X-Desktop-Signature": base64.b64encode(digest).decode(),
+        }
+
+
+def seed(db, n: int) -> dict:
+    """Seed every relation with `n` related rows; returns the ids the tests address."""
+    password_hash = security.hash_password(PASSWORD)  # hashed once; pbkdf2 is slow by design
+
+    admin_user = User(email="admin@example.com", password_hash=password_hash, role=UserRole.SUPER_ADMIN, mfa_secret=MFA_SECRET)
+    gov = User(email="gov@example.com", password_hash=password_hash, role=UserRole.GOVERNANCE_AUTHORITY, mfa_secret=MFA_SECRET)
+    approvers = [
+        User(email=f"gov{i}@example.com", password_hash=password_hash, role=UserRole.GOVERNANCE_AUTHORITY, mfa_secret=MFA_SECRET)
+        for i in range(n)
+    ]
+    db.add_all([admin_user, gov, *approvers])
+    db.flush()
+
+    main_desktop = Desktop(
+        desktop_app_id=DESKTOP_ID,
+        status=DesktopStatus.ACTIVE,
+        required_approvals_n=n + 1,
+        unlock_minutes=15,
+        secret_key=DESKTOP_SECRET,
+    )
+    desktops = [
+        Desktop(desktop_app_id=f"desktop-{i}", status=DesktopStatus.ACTIVE, required_approvals_n=2, unlock_minutes=15, csr_submitted=1, csr_pem="csr")
+        for i in range(n)
+    ]
+    mint_desktops = [Desktop(desktop_app_id=f"mint-{i}", app_type="Mint", status=DesktopStatus.PENDING, required_approvals_n=1, unlock_minutes=15) for i in range(n)]
+    db.add_all([main_desktop, *desktops, *mint_desktops])
+    db.flush()
+
+    # gov is assigned every desktop; each has a session it approved
+    for d in [main_desktop, *desktops]:
+        db.add(GovernanceAssignment(user_id=gov.id, desktop_id=d.id, desktop_app_id=d.desktop_app_id))
+    for d in desktops:
+        session = ApprovalSession(desktop_id=d.id, desktop_app_id=d.desktop_app_id, required_approvals_snapshot=2, status=SessionStatus.PENDING)
+        db.add(session)
+        db.flush()
+        db.add(Approval(session_id=session.id, approver_user_id=gov.id))
+    # The main desktop's session has n approvals, one per approver
+    main_session = ApprovalSession(
+        desktop_id=main_desktop.id, desktop_app_id=DESKTOP_ID, required_approvals_snapshot=n + 1, status=SessionStatus.PENDING
+    )
+    db.add(main_session)
+    db.flush()
+    db.add_all(Approval(session_id=main_session.id, approver_user_id=a.id) for a in approvers)
+
+    db.add_all(AuditLog(action="HEARTBEAT", desktop_app_id=DESKTOP_ID, actor_user_id=gov.id) for _ in range(n))
+    db.add_all(
+        ShareOperationLog(desktop_app_id=DESKTOP_ID, app_type="TokenControl", operation_type=ShareOperationType.CREATION, success=True)
+        for _ in range(n)
+    )
+    db.add_all(ShareRecoveryLog(user_id=admin_user.id, success=True, num_shares="2") for _ in range(n))
+    db.add_all(DownloadLink(url=f"https://github.com/o/r/releases/download/v{i}/app.exe", filename="app.exe", created_by=admin_user.email) for i in range(n))
+
+    tokens = [
+        TokenDeployment(
+            token_name=f"Token {i}", token_symbol=f"T{i}", token_decimals=18, token_supply="1000", network="sepolia",
+            contract_address=f"0x{i:040x}", treasury_address="0xtreasury", gov_shares=3, gov_threshold=2, total_shares=n,
+            client_share_count=n, safekeeping_share_count=0, shares_path="/shares",
+        )
+        for i in range(n)
+    ]
+    db.add_all(tokens)
+    db.flush()
+    token = tokens[0]
+
+    # token_user is assigned every token (login token list) and every share of the first token
+    token_users = [TokenUser(email=f"holder{i}@example.com", name=f"Holder {i:03d}", password_hash=password_hash, mfa_secret=MFA_SECRET, mfa_enabled=True) for i in range(n)]
+    db.add_all(token_users)
+    db.flush()
+    token_user = token_users[0]
+    db.add_all(TokenUserAssignment(user_id=u.id, token_deployment_id=token.id) for u in token_users)
+    db.add_all(TokenUserAssignment(user_id=token_user.id, token_deployment_id=t.id) for t in tokens[1:])
+
+    share_files_ = [ShareFile(token_deployment_id=token.id, share_number=i + 1, file_name=f"share-{i + 1}.json", encrypted_content="x") for i in range(n)]
+    db.add_all(share_files_)
+    db.flush()
+    assignments = [ShareAssignment(share_file_id=f.id, user_id=token_user.id, assigned_by=admin_user.id) for f in share_files_]
+    db.add_all(assignments)
+    db.flush()
+    db.add_all(ShareDownloadLog(share_assignment_id=a.id, token_user_id=token_user.id, success=True) for a in assignments)
+    db.commit()
+
+    return {
+        "admin": admin_user.id,
+        "gov": gov.id,
+        "token": token.id,
+        "contract": token.contract_address,
+        "token_user": token_user.id,
+        "token_user_email": token_user.email,
+        "admin_token": security.create_access_token(admin_user.id, UserRole.SUPER_ADMIN.value),
+        "gov_token": security.create_access_token(gov.id, UserRole.GOVERNANCE_AUTHORITY.value),
+        "token_user_token": security.create_access_token(token_user.id, "TokenShareUser", token_deployment_id=token.id),
+    }
+
+
+@pytest.fixture(scope="session")
+def api_env(tmp_path_factory):
+    """Factory returning a seeded ApiEnv per fan-out, built once per test session."""
+    patch = pytest.MonkeyPatch()
+    if not get_settings().jwt_secret:
+        patch.setattr(get_settings(), "jwt_secret", "test-secret")
+    envs: dict[int, ApiEnv] = {}
+
+    def build(n: int) -> ApiEnv:
+        if n in envs:
+            return envs[n]
+        engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('api') / 'api.db'}", future=True)
+        # system_settings is declared by two models; these tests do not cover the routes using it
+        Base.metadata.create_all(engine, tables=[t for t in Base.metadata.sorted_tables if t.name != "system_settings"])
+        Session = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, future=True)
+
+        with Session() as db:
+            ids = seed(db, n)
+
+        def get_test_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = FastAPI(default_response_class=OrjsonResponse)
+        for module in ROUTERS:
+            app.include_router(module.router)
+        app.dependency_overrides[deps.get_db] = get_test_db
+        app.dependency_overrides[deps.get_read_db] = get_test_db
+        envs[n] = ApiEnv(client=TestClient(app), engine=engine, ids=ids)
+        return envs[n]
+
+    yield build
+    for env in envs.values():
+        env.engine.dispose()
+    patch.undo()
@@ -0,0 +1,21 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import User, UserRole
+from app.services.auth_service import ensure_super_admin_exists
+
+
+def test_production_bootstrap_creates_the_admin_once_without_rehashing():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    User.__table__.create(engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False, future=True)
+
+    with Session() as db:
+        ensure_super_admin_exists(db, refresh_password=False)
+        admin = db.query(User).filter(User.role == UserRole.SUPER_ADMIN).one()
+        admin.password_hash = "operator-chosen"
+        db.commit()
+
+    with Session() as db:
+        ensure_super_admin_exists(db, refresh_password=False)
+        assert [u.password_hash for u in db.query(User).all()] == ["operator-chosen"]
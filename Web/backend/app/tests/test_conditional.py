@@ -0,0 +1,132 @@
+from datetime import datetime
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.dialects import mysql
+
+from app.core.conditional import make_etag, not_modified
+from app.models import Desktop, DownloadLink
+
+LAST_MODIFIED = datetime(2025, 3, 1, 12, 0, 0, 500000)
+
+
+def test_admin_desktops_revalidate_until_a_desktop_changes(api_env):
+    env = api_env(1)
+    headers = env.bearer("admin")
+    first = env.client.get("/api/admin/desktops", headers=headers)
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    with env.count_queries() as statements:
+        cached = env.client.get("/api/admin/desktops", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert len(statements) == 2  # current user + version stamp; the list itself is not loaded
+
+    env.client.put("/api/admin/desktops/desktop-main", json={"nameLabel": "renamed"}, headers=headers)
+    changed = env.client.get("/api/admin/desktops", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert "renamed" in changed.text
+
+
+def test_downloads_etag_changes_on_add_and_delete(api_env):
+    env = api_env(1)
+    headers = env.bearer("admin")
+    etag = env.client.get("/api/admin/downloads", headers=headers).headers["etag"]
+
+    url = "https://github.com/o/r/releases/download/v9/etag-test.exe"
+    assert env.client.post("/api/admin/downloads/add", json={"url": url}, headers=headers).status_code == 200
+    added = env.client.get("/api/admin/downloads", headers={**headers, "If-None-Match": etag})
+    assert added.status_code == 200
+
+    env.client.delete("/api/admin/downloads/etag-test.exe", headers=headers)
+    assert env.client.get("/api/admin/downloads", headers={**headers, "If-None-Match": added.headers["etag"]}).status_code == 200
+    # Back to the original set of links, so the original copy is current again
+    assert env.client.get("/api/admin/downloads", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+
+def test_version_stamp_timestamps_keep_microseconds_on_mysql():
+    # Whole-second DATETIME would let two changes within one second share an ETag
+    for column in (Desktop.updated_at_utc, DownloadLink.created_at):
+        assert column.type.compile(dialect=mysql.dialect()) == "DATETIME(6)"
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/resource")
+    def resource(request: Request, response: Response):
+        cached = not_modified(request, response, "test", make_etag("v1"), last_modified=LAST_MODIFIED)
+        if cached:
+            return cached
+        return {"version": "v1"}
+
+    return TestClient(app)
+
+
+def test_if_none_match_weak_comparison_and_lists():
+    client = _client()
+    etag = client.get("/resource").headers["etag"]
+    opaque = etag.removeprefix("W/")
+    assert client.get("/resource", headers={"If-None-Match": opaque}).status_code == 304
+    assert client.get("/resource", headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+    assert client.get("/resource", headers={"If-None-Match": "*"}).status_code == 304
+    assert client.get("/resource", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_if_modified_since_only_without_if_none_match():
+    client = _client()
+    response = client.get("/resource")
+    assert response.headers["last-modified"] == "Sat, 01 Mar 2025 12:00:00 GMT"
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    since = {"If-Modified-Since": response.headers["last-modified"]}
+    assert client.get("/resource", headers=since).status_code == 304
+    assert client.get("/resource", headers={"If-Modified-Since": "Sat, 01 Mar 2025 11:59:59 GMT"}).status_code == 200
+    assert client.get("/resource", headers={"If-Modified-Since": "garbage"}).status_code == 200
+    # If-None-Match wins when both are sent
+    assert client.get("/resource", headers={**since, "If-None-Match": '"other"'}).status_code == 200
+
+
+def test_unlock_status_polls_get_304_until_the_state_changes(api_env):
+    env = api_env(1)
+    url = "/api/desktop/desktop-main/unlock-status"
+    with env.count_queries() as full:
+        etag = env.client.get(url, headers=env.desktop_headers()).headers["etag"]
+    with env.count_queries() as statements:
+        cached = env.client.get(url, headers={**env.desktop_headers(), "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert len(statements) < len(full)  # auth + version stamp only
+
+    admin = env.bearer("admin")
+    env.client.put("/api/admin/desktops/desktop-main", json={"requiredApprovalsN": 9}, headers=admin)
+    changed = env.client.get(url, headers={**env.desktop_headers(), "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["requiredApprovalsN"] == 9
+
+    env.client.put("/api/admin/desktops/desktop-main", json={"requiredApprovalsN": 2}, headers=admin)
+    assert env.client.get(url, headers={**env.desktop_headers(), "If-None-Match": etag}).status_code == 304
+
+
+def test_unlock_status_never_hides_a_rotated_key(api_env):
+    env = api_env(1)
+    url = "/api/desktop/desktop-main/unlock-status"
+    etag = env.client.get(url, headers=env.desktop_headers()).headers["etag"]
+    main = Desktop.desktop_app_id == "desktop-main"
+    with env.engine.begin() as conn:
+        secret_key = conn.scalar(select(Desktop.secret_key).where(main))
+        conn.execute(update(Desktop).where(main).values(key_rotation_due=True))
+
+    try:
+        response = env.client.get(url, headers={**env.desktop_headers(), "If-None-Match": etag})
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        with env.engine.connect() as conn:
+            rotated = conn.execute(select(Desktop.secret_key, Desktop.key_rotation_due).where(main)).one()
+        assert tuple(rotated) == (response.json()["newSecretKey"], False)
+    finally:
+        with env.engine.begin() as conn:
+            conn.execute(update(Desktop).where(main).values(secret_key=secret_key, secret_key_rotated_at=None, key_rotation_due=False))
@@ -0,0 +1,69 @@
+import json
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.time import utcnow
+from app.models import AuditLog, Desktop
+from app.services.heartbeat_service import HeartbeatAggregator, heartbeat_aggregator, write_changed_info
+
+MAIN = Desktop.desktop_app_id == "desktop-main"
+
+
+def _heartbeat(env, **body):
+    content = json.dumps(body)
+    return env.client.post("/api/desktop/desktop-main/heartbeat", content=content, headers=env.desktop_headers(content))
+
+
+def test_heartbeats_are_buffered_and_flushed_in_one_update(api_env):
+    env = api_env(1)
+    with Session(env.engine) as db:
+        heartbeat_aggregator.flush(db)  # whatever earlier tests left behind
+        before = db.execute(select(Desktop.last_seen_at_utc, Desktop.machine_name).where(MAIN)).one()
+
+        for machine_name in ("WS-1", "WS-2", None):
+            assert _heartbeat(env, machineName=machine_name).status_code == 200
+        assert db.execute(select(Desktop.last_seen_at_utc, Desktop.machine_name).where(MAIN)).one() == before
+
+        with env.count_queries() as statements:
+            assert heartbeat_aggregator.flush(db) == 1
+        assert sum(s.startswith("UPDATE") for s in statements) == 1
+        last_seen, machine_name = db.execute(select(Desktop.last_seen_at_utc, Desktop.machine_name).where(MAIN)).one()
+        assert machine_name == "WS-2"
+        assert before.last_seen_at_utc is None or last_seen > before.last_seen_at_utc
+
+
+def test_reregistration_audits_only_changed_machine_info(api_env):
+    env = api_env(1)
+    heartbeats = select(func.count()).select_from(AuditLog).where(AuditLog.action == "HEARTBEAT", AuditLog.desktop_app_id == "desktop-main")
+    with Session(env.engine) as db:
+        heartbeat_aggregator.flush(db)
+        machine_name = db.scalar(select(Desktop.machine_name).where(MAIN))
+        audited = db.scalar(heartbeats)
+
+        def register(**body):
+            response = env.client.post("/api/desktop/register", json={"desktopAppId": "desktop-main", **body})
+            assert response.status_code == 200
+            assert response.json()["secretKey"] is None
+            return db.scalar(heartbeats)
+
+        assert register(machineName=machine_name) == audited
+        assert register(osUser="operator-7") == audited + 1
+        assert register(osUser="operator-7") == audited + 1
+        heartbeat_aggregator.flush(db)
+        assert db.scalar(select(Desktop.os_user).where(MAIN)) == "operator-7"
+
+
+def test_a_change_seen_by_several_workers_is_confirmed_once(api_env):
+    env = api_env(1)
+    with Session(env.engine) as first, Session(env.engine) as second:
+        # Two workers read the row before either writes the new machine info
+        desktops = [db.scalars(select(Desktop).where(MAIN)).one() for db in (first, second)]
+        workers = [HeartbeatAggregator(), HeartbeatAggregator()]
+        seen_at = utcnow()
+        assert all(w.record(d, seen_at, machine_name="WS-race") for w, d in zip(workers, desktops))
+
+        assert write_changed_info(first, desktops[0], machine_name="WS-race")
+        assert not write_changed_info(second, desktops[1], machine_name="WS-race")
+        assert not write_changed_info(second, desktops[1], machine_name=None)
+        assert second.scalar(select(Desktop.machine_name).where(MAIN)) == "WS-race"
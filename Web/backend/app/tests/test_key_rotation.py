@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.time import utcnow
+from app.models import Desktop
+from app.services.key_rotation_service import KEY_ROTATION_DAYS, plan_key_rotations, rotate_if_due
+
+
+def test_planner_marks_only_desktops_past_the_rotation_age(api_env):
+    env = api_env(1)
+    later = utcnow() + timedelta(days=KEY_ROTATION_DAYS)
+    with Session(env.engine) as db:
+        # Rotated a day before `later`; every other desktop was registered at seed time
+        recent = Desktop.desktop_app_id == "desktop-0"
+        db.execute(update(Desktop).where(recent).values(secret_key="recent", secret_key_rotated_at=later - timedelta(days=1)))
+        db.commit()
+        try:
+            total = db.scalar(select(func.count()).select_from(Desktop))
+            keyless = db.scalar(select(func.count()).where(Desktop.secret_key.is_(None)))
+            assert keyless
+            assert plan_key_rotations(db) == keyless
+            assert plan_key_rotations(db, now=later) == total - 1 - keyless
+            assert plan_key_rotations(db, now=later) == 0
+            assert db.scalars(select(Desktop.desktop_app_id).where(Desktop.key_rotation_due.is_(False))).all() == ["desktop-0"]
+        finally:
+            db.execute(update(Desktop).where(recent).values(secret_key=None))
+            db.execute(update(Desktop).values(key_rotation_due=False, secret_key_rotated_at=None))
+            db.commit()
+
+
+def test_concurrent_polls_rotate_a_due_key_once(api_env):
+    env = api_env(1)
+    target = Desktop.desktop_app_id == "desktop-0"
+    with Session(env.engine) as setup:
+        setup.execute(update(Desktop).where(target).values(key_rotation_due=True))
+        setup.commit()
+    try:
+        # Both polls read the flag before either claims it
+        with Session(env.engine) as first, Session(env.engine) as second:
+            desktops = [db.scalars(select(Desktop).where(target)).one() for db in (first, second)]
+            assert all(d.key_rotation_due for d in desktops)
+
+            rotated, new_key = rotate_if_due(first, desktops[0])
+            assert rotated and new_key
+            assert rotate_if_due(second, desktops[1]) == (False, None)
+            assert desktops[1].secret_key == new_key
+            assert not desktops[1].key_rotation_due
+    finally:
+        with Session(env.engine) as cleanup:
+            cleanup.execute(update(Desktop).where(target).values(secret_key=None, secret_key_rotated_at=None, key_rotation_due=False))
+            cleanup.commit()
@@ -0,0 +1,48 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routers import metrics
+from app.core.config import get_settings
+from app.core.metrics import REQUEST_LATENCY, MetricsMiddleware
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    monkeypatch.setattr(get_settings(), "metrics_token", "scrape-secret")
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        return {"id": item_id}
+
+    app.include_router(metrics.router)
+    app.add_middleware(MetricsMiddleware)
+    return TestClient(app)
+
+
+def _count(route: str) -> float:
+    for family in REQUEST_LATENCY.collect():
+        for sample in family.samples:
+            if sample.name.endswith("_count") and sample.labels["route"] == route:
+                return sample.value
+    return 0.0
+
+
+def test_metrics_requires_token(client):
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+
+def test_latency_is_labelled_by_route_template(client):
+    before = _count("/items/{item_id}")
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/no-such-route")
+    assert _count("/items/{item_id}") == before + 2
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert 'route="/items/{item_id}"' in response.text
+    assert 'route="unmatched"' in response.text
+    assert "/items/1" not in response.text
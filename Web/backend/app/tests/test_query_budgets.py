@@ -0,0 +1,129 @@
+"""
+SQL statement budgets per endpoint.
+
+Every case runs against databases seeded with fan-out 1, 10 and 100 (see
+conftest.seed). A case fails when any run issues more statements than its
+budget, or when the count at fan-out 100 differs from fan-out 10: the usual
+sign of a per-row query (N+1) that an absolute budget alone would only catch
+once the data set is large enough.
+
+When an endpoint legitimately needs more queries, raise its budget in the
+same change and say why in the review.
+"""
+import pkgutil
+from collections import Counter
+from dataclasses import dataclass
+
+import pytest
+
+from app.api import routers
+
+FAN_OUT = (1, 10, 100)
+# No database access worth budgeting (debug is dev-only, metrics reads prometheus files)
+UNBUDGETED_ROUTERS = {"debug", "metrics"}
+
+
+@dataclass(frozen=True)
+class Case:
+    method: str
+    path: str  # formatted with the seeded ids
+    auth: str | None  # "admin" / "gov" / "token_user" bearer, "desktop" HMAC, or None
+    budget: int
+    json: dict | None = None
+
+
+BUDGETS = {
+    "admin": [
+        Case("GET", "/api/admin/users", "admin", 2),
+        Case("GET", "/api/admin/desktops", "admin", 3),  # + ETag version stamp
+        Case("GET", "/api/admin/audit", "admin", 3),
+        Case("GET", "/api/admin/users/{gov}/assignments", "admin", 2),
+    ],
+    "admin_ca": [
+        Case("GET", "/admin/ca/pending-certificates", None, 1),
+    ],
+    "admin_share_assignments": [
+        Case("GET", "/api/admin/share-assignments/", "admin", 2),
+        Case("GET", "/api/admin/share-assignments/?token_id={token}", "admin", 2),
+    ],
+    "auth": [
+        Case("POST", "/auth/login", None, 3, json={"email": "gov@example.com", "password": "Secret123!"}),
+    ],
+    "desktop": [
+        Case("GET", "/api/desktop/desktop-main/unlock-status", "desktop", 7),  # + ETag version stamp
+        Case("POST", "/api/desktop/desktop-main/heartbeat", "desktop", 3),  # auth only; the write is batched
+    ],
+    "downloads": [
+        Case("GET", "/api/admin/downloads", "admin", 3),  # + ETag version stamp
+    ],
+    "governance": [
+        Case("GET", "/api/governance/desktops", "gov", 4),
+        Case("GET", "/api/governance/desktops/desktop-main/history", "gov", 5),
+        Case("POST", "/api/governance/desktops/desktop-main/approve", "gov", 13),
+    ],
+    "mint_approval": [
+        Case("GET", "/api/admin/mint/desktops", "admin", 2),
+    ],
+    "share_files": [
+        Case("GET", "/api/share-files/token/{token}", "admin", 2),
+    ],
+    "share_operations": [
+        Case("GET", "/api/share-operations/logs", "desktop", 4),
+    ],
+    "share_recovery": [
+        Case("GET", "/admin/shares/recovery-logs", "admin", 2),
+    ],
+    "token_deployment": [
+        Case("GET", "/api/token-deployments/", None, 1),
+        Case("GET", "/api/token-deployments/{token}", None, 1),
+        Case("GET", "/api/token-deployments/by-contract/{contract}", None, 1),
+    ],
+    "token_share_users": [
+        Case("GET", "/api/token-share-users/token/{token}", "admin", 2),
+        Case("GET", "/api/token-share-users/check-email/{token_user_email}?token_deployment_id={token}", "admin", 3),
+    ],
+    "token_user_auth": [
+        Case("POST", "/api/token-user-auth/login", None, 5, json={"email": "holder0@example.com", "password": "Secret123!"}),
+    ],
+    "user_shares": [
+        Case("GET", "/api/my-shares", "token_user", 2),
+        Case("GET", "/api/my-shares/history", "token_user", 2),
+    ],
+}
+
+CASES = [
+    pytest.param(case, id=f"{router}:{case.method} {case.path}")
+    for router, cases in BUDGETS.items()
+    for case in cases
+]
+
+
+def _describe(statements: list[str]) -> str:
+    counts = Counter(" ".join(s.split())[:120] for s in statements)
+    return "\n".join(f"  {n}x {s}" for s, n in counts.most_common(10))
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_query_budget(api_env, case: Case):
+    counts = {}
+    for n in FAN_OUT:
+        env = api_env(n)
+        if case.auth == "desktop":
+            headers = env.desktop_headers()
+        elif case.auth:
+            headers = env.bearer(case.auth)
+        else:
+            headers = {}
+        with env.count_queries() as statements:
+            response = env.client.request(case.method, case.path.format(**env.ids), headers=headers, json=case.json)
+        assert response.status_code == 200, response.text
+        counts[n] = len(statements)
+        assert counts[n] <= case.budget, (
+            f"{counts[n]} statements at fan-out {n}, budget {case.budget}:\n{_describe(statements)}"
+        )
+    assert counts[100] == counts[10], f"statement count grows with fan-out {counts}:\n{_describe(statements)}"
+
+
+def test_every_router_has_a_budget():
+    modules = {m.name for m in pkgutil.iter_modules(routers.__path__)} - UNBUDGETED_ROUTERS
+    assert modules == set(BUDGETS)
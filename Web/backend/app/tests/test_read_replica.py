@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.db import session as db_session
+
+
+@pytest.fixture()
+def engines(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}", future=True)
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", future=True)
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture()
+def routed(engines, monkeypatch):
+    primary, replica = engines
+    health = db_session.ReplicaHealth(replica, max_lag_seconds=5, check_interval=0)
+    monkeypatch.setattr(db_session, "SessionLocal", sessionmaker(bind=primary, future=True))
+    monkeypatch.setattr(db_session, "ReadSessionLocal", sessionmaker(bind=replica, future=True))
+    monkeypatch.setattr(db_session, "replica_health", health)
+    return primary, replica, health
+
+
+def _read_bind():
+    gen = deps.get_read_db()
+    db = next(gen)
+    try:
+        return db.get_bind()
+    finally:
+        gen.close()
+
+
+def test_read_db_uses_healthy_replica(routed):
+    _, replica, _ = routed
+    assert _read_bind() is replica
+
+
+def test_read_db_falls_back_when_replica_lags(routed, monkeypatch):
+    primary, _, _ = routed
+    monkeypatch.setattr(db_session, "replication_lag_seconds", lambda conn: 30.0)
+    assert _read_bind() is primary
+
+
+def test_read_db_falls_back_when_replica_unreachable(routed, monkeypatch, tmp_path):
+    primary, _, health = routed
+    health.engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}", future=True)
+    assert _read_bind() is primary
+
+
+def test_read_db_without_replica_uses_primary(routed, monkeypatch):
+    primary, _, _ = routed
+    monkeypatch.setattr(db_session, "ReadSessionLocal", None)
+    monkeypatch.setattr(db_session, "replica_health", None)
+    assert _read_bind() is primary
+
+
+def test_replica_health_is_cached(engines, monkeypatch):
+    _, replica = engines
+    calls = []
+    monkeypatch.setattr(db_session, "replication_lag_seconds", lambda conn: calls.append(1) or 0.0)
+    health = db_session.ReplicaHealth(replica, max_lag_seconds=5, check_interval=60)
+    assert health.is_healthy()
+    assert health.is_healthy()
+    assert len(calls) == 1
+
+
+def test_stale_health_check_never_blocks_other_readers(engines, monkeypatch):
+    _, replica = engines
+    health = db_session.ReplicaHealth(replica, max_lag_seconds=5, check_interval=60)
+    assert health.is_healthy()
+
+    # Another thread is re-checking a stale state: use the primary rather than wait
+    health._checked_at = -60
+    health._lock.acquire()
+    try:
+        assert not health.is_healthy()
+    finally:
+        health._lock.release()
+    assert health.is_healthy()
+
+
+def _route_dependencies(router, path):
+    route = next(r for r in router.routes if r.path == path)
+    return {d.call for d in route.dependant.dependencies}
+
+
+@pytest.mark.parametrize("router_name, path", [
+    ("governance", "/api/governance/desktops"),
+    ("governance", "/api/governance/desktops/{desktop_app_id}/history"),
+    ("user_shares", "/api/my-shares/history"),
+])
+def test_read_your_writes_routes_stay_on_primary(router_name, path):
+    from app.api import routers
+
+    calls = _route_dependencies(getattr(routers, router_name).router, path)
+    assert deps.get_db in calls
+    assert deps.get_read_db not in calls
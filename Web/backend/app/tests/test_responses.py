@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, Field, TypeAdapter
+from sqlalchemy import func, select
+
+from app.api.routers.token_deployment import TokenDeploymentResponse
+from app.core.responses import OrjsonResponse
+from app.models import AuditLog, SessionStatus, TokenDeployment
+from app.schemas.audit import AuditPage
+
+ROWS = [
+    {"at": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc), "status": SessionStatus.UNLOCKED, "amount": Decimal("1.50"), "note": "héllo"},
+    {"at": datetime(2025, 1, 2, 3, 4, 5, 120000), "status": SessionStatus.PENDING, "amount": Decimal("0"), "note": None},
+    {"at": datetime(2025, 1, 2, tzinfo=timezone(timedelta(hours=-5))), "status": SessionStatus.NONE, "amount": Decimal("-2.25"), "note": "\"q\""},
+]
+
+
+class Row(BaseModel):
+    at: datetime
+    status: SessionStatus
+    amount: Decimal
+    note: Optional[str] = Field(None)
+
+
+def test_raw_rows_match_validated_response_model():
+    app = FastAPI()
+
+    @app.get("/validated", response_model=list[Row], response_class=JSONResponse)
+    def validated():
+        return ROWS
+
+    @app.get("/default", response_model=list[Row], response_class=OrjsonResponse)
+    def default():
+        return ROWS
+
+    @app.get("/raw", response_model=list[Row])
+    def raw():
+        return OrjsonResponse(ROWS)
+
+    client = TestClient(app)
+    expected = client.get("/validated").content
+    assert client.get("/default").content == expected
+    assert client.get("/raw").content == expected
+
+
+def _starlette_body(model, objects) -> bytes:
+    adapter = TypeAdapter(model)
+    content = adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json", by_alias=True)
+    return JSONResponse(content).body
+
+
+def test_projected_list_endpoints_are_byte_compatible(api_env):
+    env = api_env(10)
+    with env.engine.connect() as conn:
+        deployments = conn.execute(TokenDeployment.__table__.select().order_by(TokenDeployment.created_at_utc.desc())).all()
+        logs = conn.execute(AuditLog.__table__.select().order_by(AuditLog.at_utc.desc()).limit(20)).all()
+        total = conn.scalar(select(func.count()).select_from(AuditLog.__table__))
+
+    response = env.client.get("/api/token-deployments/")
+    assert response.content == _starlette_body(list[TokenDeploymentResponse], deployments)
+
+    response = env.client.get("/api/admin/audit", headers=env.bearer("admin"))
+    page = {"items": logs, "total": total, "page": 1, "pageSize": 20}
+    assert response.content == _starlette_body(AuditPage, page)
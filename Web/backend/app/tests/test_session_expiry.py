@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.time import utcnow
+from app.models import ApprovalSession, Desktop, SessionStatus
+from app.models.desktop import DesktopStatus
+from app.services import approval_service
+
+
+def test_lapsed_unlocks_expire_in_one_update_and_one_commit(api_env):
+    env = api_env(4)
+    now = utcnow()
+    with Session(env.engine, expire_on_commit=False) as db:
+        desktops = [
+            Desktop(desktop_app_id=f"expiry-{i}", status=DesktopStatus.ACTIVE, required_approvals_n=1, unlock_minutes=15)
+            for i in range(4)
+        ]
+        db.add_all(desktops)
+        db.flush()
+        # Three lapsed unlocks and one that is still open
+        for i, desktop in enumerate(desktops):
+            db.add(ApprovalSession(
+                desktop_id=desktop.id,
+                desktop_app_id=desktop.desktop_app_id,
+                required_approvals_snapshot=1,
+                status=SessionStatus.UNLOCKED,
+                unlocked_at_utc=now - timedelta(minutes=30),
+                unlocked_until_utc=now + timedelta(minutes=5 if i == 3 else -5),
+            ))
+        db.commit()
+
+        commits = []
+
+        def record_commit(conn):
+            commits.append(conn)
+
+        event.listen(env.engine, "commit", record_commit)
+        try:
+            with env.count_queries() as statements:
+                sessions = approval_service.get_latest_sessions(db, desktops)
+        finally:
+            event.remove(env.engine, "commit", record_commit)
+
+    assert [sessions[(d.desktop_app_id, d.app_type)].status for d in desktops] == [SessionStatus.EXPIRED] * 3 + [SessionStatus.UNLOCKED]
+    assert len([s for s in statements if s.lstrip().upper().startswith("UPDATE")]) == 1
+    assert len(commits) == 1
+    with Session(env.engine) as db:
+        stored = {s.desktop_app_id: s.status for s in db.query(ApprovalSession).filter(ApprovalSession.desktop_app_id.like("expiry-%"))}
+    assert stored == {"expiry-0": SessionStatus.EXPIRED, "expiry-1": SessionStatus.EXPIRED,
+                      "expiry-2": SessionStatus.EXPIRED, "expiry-3": SessionStatus.UNLOCKED}
@@ -0,0 +1,142 @@
+import itertools
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models import ShareAssignment, ShareFile, TokenUser
+
+URL = "/api/admin/share-assignments/bulk"
+_share_numbers = itertools.count(1000)
+
+
+@pytest.fixture()
+def env(api_env):
+    return api_env(3)
+
+
+def _share_files(env, count: int, active: bool = True) -> list[str]:
+    """Fresh share files of the seeded token, so every test starts without assignments."""
+    with Session(env.engine) as db:
+        files = [
+            ShareFile(
+                token_deployment_id=env.ids["token"],
+                share_number=next(_share_numbers),
+                file_name="share.json",
+                encrypted_content="x",
+                is_active=active,
+            )
+            for _ in range(count)
+        ]
+        db.add_all(files)
+        db.commit()
+        return [f.id for f in files]
+
+
+def _users(env) -> list[str]:
+    with Session(env.engine) as db:
+        return [u.id for u in db.query(TokenUser).order_by(TokenUser.email)]
+
+
+def _assigned_pairs(env, share_file_ids) -> set[tuple[str, str]]:
+    with Session(env.engine) as db:
+        return set(
+            db.query(ShareAssignment.share_file_id, ShareAssignment.user_id)
+            .filter(ShareAssignment.share_file_id.in_(share_file_ids))
+            .all()
+        )
+
+
+def test_valid_pairs_are_assigned_with_one_insert_and_one_commit(env):
+    files = _share_files(env, 2)
+    users = _users(env)
+    items = [{"share_file_id": f, "user_id": u} for f in files for u in users[:2]]
+
+    commits = []
+
+    def record_commit(conn):
+        commits.append(conn)
+
+    event.listen(env.engine, "commit", record_commit)
+    try:
+        with env.count_queries() as statements:
+            r = env.client.post(URL, json={"items": items}, headers=env.bearer("admin"))
+    finally:
+        event.remove(env.engine, "commit", record_commit)
+
+    assert r.status_code == 200
+    assert len(commits) == 1
+    body = r.json()
+    assert (body["created"], body["failed"]) == (4, 0)
+    assert all(item["success"] and item["assignment_id"] for item in body["results"])
+    assert _assigned_pairs(env, files) == {(i["share_file_id"], i["user_id"]) for i in items}
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT INTO SHARE_ASSIGNMENTS")]
+    assert len(inserts) == 1
+    # Auth lookup, share files, users and existing pairs, then the insert
+    assert len(statements) == 5
+
+
+def test_invalid_items_are_reported_without_blocking_the_rest(env):
+    active, = _share_files(env, 1)
+    inactive, = _share_files(env, 1, active=False)
+    user = _users(env)[1]
+    items = [
+        {"share_file_id": active, "user_id": user},
+        {"share_file_id": "missing-share", "user_id": user},
+        {"share_file_id": inactive, "user_id": user},
+        {"share_file_id": active, "user_id": "missing-user"},
+    ]
+
+    body = env.client.post(URL, json={"items": items}, headers=env.bearer("admin")).json()
+
+    assert (body["created"], body["failed"]) == (1, 3)
+    assert [r["error"] for r in body["results"]] == [
+        None, "Share file not found", "Share file not found", "User not found",
+    ]
+    assert [r["index"] for r in body["results"]] == [0, 1, 2, 3]
+    assert _assigned_pairs(env, [active, inactive]) == {(active, user)}
+
+
+def test_duplicates_in_the_request_and_against_existing_rows_are_rejected(env):
+    files = _share_files(env, 2)
+    user = _users(env)[2]
+    headers = env.bearer("admin")
+    assert env.client.post(URL, json={"items": [{"share_file_id": files[0], "user_id": user}]}, headers=headers).json()["created"] == 1
+
+    items = [
+        {"share_file_id": files[0], "user_id": user},
+        {"share_file_id": files[1], "user_id": user},
+        {"share_file_id": files[1], "user_id": user},
+    ]
+    body = env.client.post(URL, json={"items": items}, headers=headers).json()
+
+    assert (body["created"], body["failed"]) == (1, 2)
+    errors = [r["error"] for r in body["results"]]
+    assert errors[0].startswith("Share #") and "already assigned" in errors[0]
+    assert errors[1:] == [None, "Duplicate pair in request"]
+    assert len(_assigned_pairs(env, files)) == 2
+
+
+def test_nothing_to_insert_does_not_write(env):
+    with env.count_queries() as statements:
+        body = env.client.post(
+            URL, json={"items": [{"share_file_id": "missing", "user_id": "missing"}]}, headers=env.bearer("admin")
+        ).json()
+    assert body["created"] == 0
+    assert not [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+
+
+def test_only_super_admins_may_bulk_assign(env):
+    files = _share_files(env, 1)
+    items = [{"share_file_id": files[0], "user_id": _users(env)[0]}]
+
+    assert env.client.post(URL, json={"items": items}, headers=env.bearer("gov")).status_code == 403
+    assert env.client.post(URL, json={"items": items}).status_code == 401
+    assert _assigned_pairs(env, files) == set()
+
+
+def test_request_size_is_bounded(env):
+    headers = env.bearer("admin")
+    assert env.client.post(URL, json={"items": []}, headers=headers).status_code == 422
+    items = [{"share_file_id": "x", "user_id": "y"}] * 501
+    assert env.client.post(URL, json={"items": items}, headers=headers).status_code == 422
@@ -0,0 +1,54 @@
+import json
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.sql_timing import SQLTimingMiddleware
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'timing.db'}", future=True)
+    yield engine
+    engine.dispose()
+
+
+def _client(engine, **options) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        # Sync handler: runs in the threadpool like the real routers
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    app.add_middleware(SQLTimingMiddleware, **options)
+    return TestClient(app)
+
+
+def test_server_timing_counts_queries_from_threadpool(engine):
+    response = _client(engine, slow_request_ms=10_000).get("/items/1")
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert 'desc="3 queries"' in timing
+    assert "db-slowest;dur=" in timing
+
+
+def test_unsampled_requests_are_not_instrumented(engine):
+    response = _client(engine, sample_rate=0.0).get("/items/1")
+    assert "server-timing" not in response.headers
+
+
+def test_slow_request_is_logged_with_route_template(engine, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.core.sql_timing"):
+        _client(engine, slow_request_ms=0, server_timing=False).get("/items/7")
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["route"] == "/items/{item_id}"
+    assert record["status"] == 200
+    assert record["queries"] == 3
+    assert record["slowest_query"] == "SELECT 1"
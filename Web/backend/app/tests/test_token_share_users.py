@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import create_mock_engine
+
+from app.models import TokenUser
+
+
+def test_listing_is_unpaginated_unless_asked(api_env):
+    env = api_env(10)
+    url = f"/api/token-share-users/token/{env.ids['token']}"
+    headers = env.bearer("admin")
+
+    everyone = env.client.get(url, headers=headers)
+    assert everyone.status_code == 200
+    assert len(everyone.json()) == 10
+    assert everyone.headers["x-total-count"] == "10"
+
+    page = env.client.get(url, params={"page": 2, "page_size": 4}, headers=headers)
+    assert [u["name"] for u in page.json()] == [u["name"] for u in everyone.json()[4:8]]
+    assert page.headers["x-total-count"] == "10"
+
+
+def test_prefix_search_ignores_case(api_env):
+    env = api_env(10)
+    url = f"/api/token-share-users/token/{env.ids['token']}"
+    headers = env.bearer("admin")
+
+    by_name = env.client.get(url, params={"q": "hOLDER 00"}, headers=headers)
+    assert [u["name"] for u in by_name.json()] == [f"Holder {i:03d}" for i in range(10)]
+    by_email = env.client.get(url, params={"q": "HOLDER3@"}, headers=headers)
+    assert [u["email"] for u in by_email.json()] == ["holder3@example.com"]
+    assert env.client.get(url, params={"q": "holder_"}, headers=headers).json() == []
+
+
+def test_emails_are_normalized_on_create_and_login(api_env):
+    env = api_env(2)
+    headers = env.bearer("admin")
+    body = {"token_deployment_id": env.ids["token"], "name": "Mixed", "email": "Mixed.Case@Example.com", "password": "Passw0rd!"}
+
+    created = env.client.post("/api/token-share-users/", json=body, headers=headers)
+    assert created.status_code == 200
+    assert created.json()["email"] == "mixed.case@example.com"
+
+    # The same address in another case is the same user
+    again = env.client.post("/api/token-share-users/", json={**body, "email": "MIXED.case@example.com"}, headers=headers)
+    assert again.status_code == 400
+    exists = env.client.get(
+        "/api/token-share-users/check-email/MIXED.CASE@example.com",
+        params={"token_deployment_id": env.ids["token"]}, headers=headers,
+    )
+    assert exists.json()["already_assigned"] is True
+
+    for email in ("mixed.case@example.com", "Mixed.Case@EXAMPLE.com"):
+        login = env.client.post("/api/token-user-auth/login", json={"email": email, "password": "Passw0rd!"})
+        assert login.status_code == 200, email
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("postgresql://", {
+        "CREATE INDEX ix_token_users_name ON token_users (lower(name) varchar_pattern_ops)",
+        "CREATE INDEX ix_token_users_email_prefix ON token_users (lower(email) varchar_pattern_ops)",
+    }),
+    ("sqlite://", {"CREATE INDEX ix_token_users_name ON token_users (name)"}),
+])
+def test_model_search_indexes_match_migration_021(url, expected):
+    statements = []
+    engine = create_mock_engine(url, lambda sql, *a, **kw: statements.append(str(sql.compile(dialect=engine.dialect)).strip()))
+    TokenUser.__table__.create(engine, checkfirst=False)
+
+    indexes = {s for s in statements if s.startswith("CREATE INDEX")}
+    assert indexes == expected
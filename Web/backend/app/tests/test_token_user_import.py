@@ -0,0 +1,102 @@
+import io
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import security
+from app.core.config import get_settings
+from app.models import TokenUser, TokenUserAssignment
+from app.services import token_user_import_service
+
+TOKEN = "token-1"
+
+
+@pytest.fixture()
+def db(monkeypatch):
+    # Real hashing runs in a spawned process pool; the import logic is what is under test
+    monkeypatch.setattr(token_user_import_service, "hash_passwords", lambda passwords: [f"hash:{p}" for p in passwords])
+    monkeypatch.setattr(get_settings(), "import_batch_size", 2)
+    engine = create_engine("sqlite:///:memory:", future=True)
+    TokenUser.__table__.create(engine)
+    TokenUserAssignment.__table__.create(engine)
+    with sessionmaker(bind=engine, expire_on_commit=False, future=True)() as session:
+        session.add_all([
+            TokenUser(id="u-assigned", email="Assigned@Example.com", name="Assigned", password_hash="old"),
+            TokenUser(id="u-other", email="other@example.com", name="Other", password_hash="old"),
+        ])
+        session.add(TokenUserAssignment(user_id="u-assigned", token_deployment_id=TOKEN))
+        session.commit()
+        yield session
+
+
+def _import(db, csv_text: str, update_existing: bool = False) -> dict:
+    return token_user_import_service.import_token_users(db, TOKEN, io.BytesIO(csv_text.encode()), "csv", update_existing)
+
+
+def _statuses(result: dict) -> dict[int, str]:
+    return {entry["row"]: entry["status"] for entry in result["rows"]}
+
+
+def test_rows_are_reported_per_outcome_and_emails_match_case_insensitively(db):
+    result = _import(db, "\n".join([
+        "name,email,phone,password",
+        "New,New@Example.com,,password1",
+        "Assigned,assigned@example.COM,,password2",
+        "Other,OTHER@example.com,,password3",
+        "Dup,new@example.com,,password4",
+        "Bad,not-an-email,,password5",
+    ]))
+    assert _statuses(result) == {2: "created", 3: "already_assigned", 4: "assigned", 5: "invalid", 6: "invalid"}
+    assert result["rows"][0]["email"] == "new@example.com"
+    assert result["rows"][3]["error"] == "Duplicate email in file"
+    assert db.query(TokenUser).count() == 3
+    assert db.query(TokenUserAssignment).filter_by(token_deployment_id=TOKEN).count() == 3
+
+
+def test_update_existing_separates_new_assignments(db):
+    result = _import(db, "name,email,phone,password\nA,ASSIGNED@example.com,,password1\nO,other@example.com,,password2\n", update_existing=True)
+    assert _statuses(result) == {2: "updated", 3: "updated_assigned"}
+    assert (result["updated"], result["updated_assigned"]) == (1, 1)
+    assert db.get(TokenUser, "u-other").password_hash == "hash:password2"
+
+
+def test_failed_batch_is_reported_and_other_batches_are_kept(db, monkeypatch):
+    def hash_passwords(passwords):
+        if "boom-boom" in passwords:
+            raise RuntimeError("hashing pool died")
+        return [f"hash:{p}" for p in passwords]
+
+    monkeypatch.setattr(token_user_import_service, "hash_passwords", hash_passwords)
+    result = _import(db, "\n".join([
+        "name,email,phone,password",
+        "A,a@example.com,,password1",
+        "B,b@example.com,,password2",
+        "C,c@example.com,,boom-boom",
+        "D,d@example.com,,password4",
+        "E,e@example.com,,password5",
+    ]))
+    assert _statuses(result) == {2: "created", 3: "created", 4: "failed", 5: "failed", 6: "created"}
+    assert result["failed"] == 2
+    assert "hashing pool died" in result["rows"][2]["error"]
+    assert {u.email for u in db.query(TokenUser)} >= {"a@example.com", "b@example.com", "e@example.com"}
+    assert db.query(TokenUser).filter(TokenUser.email.in_(["c@example.com", "d@example.com"])).count() == 0
+
+
+def test_hashing_pool_is_small_and_shut_down(monkeypatch):
+    monkeypatch.setattr(get_settings(), "import_hash_workers", 1)
+    hashes = token_user_import_service.hash_passwords(["password1", "password2"])
+    assert [security.verify_password(p, h) for p, h in zip(["password1", "password2"], hashes)] == [True, True]
+    pool = token_user_import_service._hash_pool
+    assert pool is not None and pool._max_workers == 1
+
+    token_user_import_service.shutdown_hash_pool()
+    assert token_user_import_service._hash_pool is None
+    token_user_import_service.shutdown_hash_pool()
+
+
+def test_hashing_without_a_pool(monkeypatch):
+    monkeypatch.setattr(get_settings(), "import_hash_workers", 0)
+    hashes = token_user_import_service.hash_passwords(["password1", "password2"])
+    assert security.verify_password("password2", hashes[1])
+    assert token_user_import_service._hash_pool is None
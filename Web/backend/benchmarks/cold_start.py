@@ -0,0 +1,108 @@
+"""
+Benchmark: cold start of the Web API per startup profile.
+
+Each run is a fresh interpreter (as a gunicorn master with `preload_app` is)
+that imports `app.main` and runs the startup handler against a throwaway
+SQLite database that is already at the Alembic head revision:
+
+- "dev": create_all, super-admin password rehash and seed data
+- "production": Alembic revision check only
+
+Import time covers the whole application import; the report also lists which
+of the heavy optional modules (qrcode/PIL, pycryptodome, x509) were loaded by
+it, which should be none now that they are imported on first use.
+
+Usage (from Web/backend):
+    python -m benchmarks.cold_start --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("qrcode", "PIL", "Crypto", "cryptography.x509")
+
+
+def child() -> None:
+    started = time.perf_counter()
+    from app.main import on_startup
+
+    imported = time.perf_counter()
+    on_startup()
+    finished = time.perf_counter()
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "startup_ms": (finished - imported) * 1000,
+        "heavy": [name for name in HEAVY_MODULES if name in sys.modules],
+    }))
+
+
+def prepare_database(workdir: str) -> None:
+    """Create the schema and stamp it at head, as `alembic upgrade head` would leave it."""
+    code = (
+        "from alembic import command\n"
+        "from alembic.config import Config\n"
+        "import app.models\n"
+        "from app.db.base import Base\n"
+        "from app.db.session import engine\n"
+        "Base.metadata.create_all(engine)\n"
+        "config = Config('alembic.ini')\n"
+        "command.stamp(config, 'head')\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=child_env(workdir, "dev"), check=True)
+
+
+def child_env(workdir: str, profile: str) -> dict[str, str]:
+    env = dict(os.environ)
+    env["TOKENCONTROL_DATABASE_URL"] = f"sqlite:///{workdir}/web.db"
+    env.setdefault("TOKENCONTROL_JWT_SECRET", "bench-secret")
+    env["TOKENCONTROL_STARTUP_PROFILE"] = profile
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+    return env
+
+
+def run_once(workdir: str, profile: str) -> dict:
+    # Run outside Web/backend so the production logging.conf (fixed log paths) is not picked up
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.cold_start", "--child"],
+        cwd=workdir,
+        env=child_env(workdir, profile),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    workdir = tempfile.mkdtemp(prefix="web-bench-")
+    prepare_database(workdir)
+
+    for profile in ("dev", "production"):
+        runs = [run_once(workdir, profile) for _ in range(args.runs)]
+        import_ms = statistics.median(r["import_ms"] for r in runs)
+        startup_ms = statistics.median(r["startup_ms"] for r in runs)
+        heavy = ", ".join(runs[-1]["heavy"]) or "none"
+        print(
+            f"{profile:<11} import={import_ms:8.1f}ms  startup={startup_ms:8.1f}ms  "
+            f"total={import_ms + startup_ms:8.1f}ms  heavy modules loaded: {heavy}"
+        )
+
+
+if __name__ == "__main__":
+    main()
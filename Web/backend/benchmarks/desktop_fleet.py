@@ -0,0 +1,395 @@
+"""
+Load test: a fleet of TokenControl and Mint desktops against one API node.
+
+Registers N desktops through the public registration endpoint, activates
+them and creates governance approvers through the admin API, then for the
+requested duration:
+
+- every desktop sends HMAC-signed heartbeats and unlock-status polls at the
+  configured intervals (signatures are built exactly as the desktop apps
+  build them, `{desktop_app_id}:{timestamp}:{body}`, and rotated keys
+  returned by unlock-status are picked up); polls revalidate with the last
+  ETag unless `--no-etag` is given
+- every approver lists its assigned desktops and approves one that still
+  needs an approval
+
+Latency percentiles, throughput, status codes and error rates are reported
+per endpoint and written to a JSON file; `--compare` prints the change
+against an earlier result file.
+
+The server is either already running (`--base-url`, admin credentials
+default to the dev seed) or started here with `--start-server`, which runs
+uvicorn in a temp directory against `--database-url` (a fresh SQLite file by
+default; a local Postgres URL works too) with the dev startup profile.
+
+Usage (from Web/backend):
+    python -m benchmarks.desktop_fleet --start-server --desktops 200 --mint-ratio 0.1 \\
+        --approvers 5 --duration 60 --poll-interval 5 --heartbeat-interval 30
+    python -m benchmarks.desktop_fleet --base-url http://127.0.0.1:8000 --compare previous.json
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import pyotp
+
+from benchmarks.stats import percentile
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+REGISTER = "POST /api/desktop/register"
+HEARTBEAT = "POST /api/desktop/{id}/heartbeat"
+UNLOCK_STATUS = "GET /api/desktop/{id}/unlock-status"
+GOV_LIST = "GET /api/governance/desktops"
+GOV_APPROVE = "POST /api/governance/desktops/{id}/approve"
+
+
+@dataclass
+class FleetDesktop:
+    app_id: str
+    app_type: str
+    secret_key: str
+    unlock_etag: str | None = None
+
+
+def desktop_headers(desktop: FleetDesktop, body: str = "") -> dict[str, str]:
+    """HMAC headers as checked by app.core.hmac_auth.verify_desktop_signature."""
+    timestamp = str(int(time.time()))
+    message = f"{desktop.app_id}:{timestamp}:{body}".encode()
+    digest = hmac.new(base64.b64decode(desktop.secret_key), message, hashlib.sha256).digest()
+    return {
+        "X-Desktop-Id": desktop.app_id,
+        "X-App-Type": desktop.app_type,
+        "X-Desktop-Timestamp": timestamp,
+        "X-Desktop-Signature": base64.b64encode(digest).decode(),
+    }
+
+
+class Recorder:
+    """Latency and outcome per endpoint label."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+        self.errors: Counter = Counter()
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str, expected=(200,), **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.latencies[label].append((time.perf_counter() - started) * 1000)
+            self.statuses[label][type(e).__name__] += 1
+            self.errors[label] += 1
+            return None
+        self.latencies[label].append((time.perf_counter() - started) * 1000)
+        self.statuses[label][str(response.status_code)] += 1
+        if response.status_code not in expected:
+            self.errors[label] += 1
+        return response
+
+    def summary(self, duration: float) -> dict:
+        endpoints = {}
+        for label, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+
+            endpoints[label] = {
+                "requests": len(ordered),
+                "throughput_rps": round(len(ordered) / duration, 2),
+                "errors": self.errors[label],
+                "error_rate": round(self.errors[label] / len(ordered), 4),
+                "p50_ms": round(statistics.median(ordered), 2),
+                "p95_ms": round(percentile(ordered, 0.95), 2),
+                "p99_ms": round(percentile(ordered, 0.99), 2),
+                "max_ms": round(ordered[-1], 2),
+                "statuses": dict(self.statuses[label]),
+            }
+        return endpoints
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str, mfa_secret: str) -> dict[str, str]:
+    response = await client.post("/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    challenge = response.json()
+    secret = challenge.get("mfa_secret_base32") or mfa_secret
+    response = await client.post(
+        "/auth/verify-otp", json={"challenge_id": challenge["challenge_id"], "otp": pyotp.TOTP(secret).now()}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def register_fleet(client: httpx.AsyncClient, recorder: Recorder, args) -> list[FleetDesktop]:
+    rng = random.Random(args.seed)
+    mint_count = round(args.desktops * args.mint_ratio)
+    run_id = uuid.uuid4().hex[:8]
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def register(i: int) -> FleetDesktop | None:
+        app_type = "Mint" if i < mint_count else "TokenControl"
+        app_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        body = {
+            "desktopAppId": app_id,
+            "appType": app_type,
+            "machineName": f"fleet-{run_id}-{i:05d}",
+            "nameLabel": f"Fleet {run_id} #{i}",
+            "osUser": "loadtest",
+            "tokenControlVersion": "loadtest",
+        }
+        async with semaphore:
+            response = await recorder.request(client, REGISTER, "POST", "/api/desktop/register", json=body)
+        if response is None or response.status_code != 200 or not response.json().get("secretKey"):
+            return None
+        return FleetDesktop(app_id, app_type, response.json()["secretKey"])
+
+    registered = await asyncio.gather(*(register(i) for i in range(args.desktops)))
+    return [d for d in registered if d is not None]
+
+
+async def prepare_governance(client: httpx.AsyncClient, args, fleet: list[FleetDesktop]) -> list[dict[str, str]]:
+    """Activate the fleet and create approvers assigned to every TokenControl desktop; returns their auth headers."""
+    admin = await login(client, args.admin_email, args.admin_password, args.admin_mfa_secret)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def activate(desktop: FleetDesktop):
+        async with semaphore:
+            response = await client.post(
+                f"/api/admin/desktops/{desktop.app_id}/approve",
+                params={"app_type": desktop.app_type},
+                json={"requiredApprovalsN": args.required_approvals, "unlockMinutes": args.unlock_minutes},
+                headers=admin,
+            )
+            response.raise_for_status()
+
+    await asyncio.gather(*(activate(d) for d in fleet))
+
+    response = await client.get("/api/admin/desktops", headers=admin)
+    response.raise_for_status()
+    fleet_ids = {d.app_id for d in fleet if d.app_type == "TokenControl"}
+    # DesktopAdminOut is serialized by alias (snake_case)
+    desktop_uuids = [
+        d["id"] for d in response.json() if d["desktop_app_id"] in fleet_ids and d["app_type"] == "TokenControl"
+    ]
+
+    approvers = []
+    for i in range(args.approvers):
+        secret = pyotp.random_base32()
+        password = f"Fleet-{uuid.uuid4().hex[:12]}!"
+        response = await client.post(
+            "/api/admin/users",
+            json={
+                "email": f"fleet-approver-{uuid.uuid4().hex[:8]}-{i}@example.com",
+                "role": "GovernanceAuthority",
+                "password": password,
+                "mfa_secret": secret,
+            },
+            headers=admin,
+        )
+        response.raise_for_status()
+        user = response.json()
+        response = await client.post(
+            f"/api/admin/users/{user['id']}/assignments", json={"desktopAppIds": desktop_uuids}, headers=admin
+        )
+        response.raise_for_status()
+        approvers.append(await login(client, user["email"], password, secret))
+    return approvers
+
+
+async def desktop_loop(client, recorder: Recorder, desktop: FleetDesktop, args, deadline: float) -> None:
+    loop = asyncio.get_running_loop()
+    next_poll = loop.time() + random.uniform(0, args.poll_interval)
+    next_heartbeat = loop.time() + random.uniform(0, args.heartbeat_interval)
+    while True:
+        due = min(next_poll, next_heartbeat)
+        if due >= deadline:
+            return
+        await asyncio.sleep(max(0.0, due - loop.time()))
+        if next_heartbeat <= next_poll:
+            next_heartbeat += args.heartbeat_interval
+            body = json.dumps({"machineName": f"fleet-{desktop.app_id[:8]}", "tokenControlVersion": "loadtest"})
+            await recorder.request(
+                client, HEARTBEAT, "POST", f"/api/desktop/{desktop.app_id}/heartbeat",
+                content=body, headers={**desktop_headers(desktop, body), "Content-Type": "application/json"},
+            )
+        else:
+            next_poll += args.poll_interval
+            headers = desktop_headers(desktop)
+            if desktop.unlock_etag and not args.no_etag:
+                headers["If-None-Match"] = desktop.unlock_etag
+            response = await recorder.request(
+                client, UNLOCK_STATUS, "GET", f"/api/desktop/{desktop.app_id}/unlock-status",
+                expected=(200, 304), headers=headers,
+            )
+            if response is not None and response.status_code == 200:
+                desktop.unlock_etag = response.headers.get("etag")
+                new_key = response.json().get("newSecretKey")
+                if new_key:
+                    desktop.secret_key = new_key
+
+
+async def approver_loop(client, recorder: Recorder, headers: dict[str, str], args, deadline: float) -> None:
+    loop = asyncio.get_running_loop()
+    next_run = loop.time() + random.uniform(0, args.approve_interval)
+    while next_run < deadline:
+        await asyncio.sleep(max(0.0, next_run - loop.time()))
+        next_run += args.approve_interval
+        response = await recorder.request(client, GOV_LIST, "GET", "/api/governance/desktops", headers=headers)
+        if response is None or response.status_code != 200:
+            continue
+        candidates = [
+            d for d in response.json()
+            if d["status"] == "Active" and not d["alreadyApproved"] and d["sessionStatus"] != "Unlocked"
+        ]
+        if candidates:
+            target = random.choice(candidates)
+            # 409: another approver completed the same session first
+            await recorder.request(
+                client, GOV_APPROVE, "POST", f"/api/governance/desktops/{target['desktopAppId']}/approve",
+                expected=(200, 409), headers=headers,
+            )
+
+
+def start_server(args) -> tuple[subprocess.Popen, str]:
+    workdir = tempfile.mkdtemp(prefix="web-fleet-")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    env = dict(os.environ)
+    env["TOKENCONTROL_DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/web.db"
+    env.setdefault("TOKENCONTROL_JWT_SECRET", "fleet-secret")
+    env["TOKENCONTROL_STARTUP_PROFILE"] = "dev"  # seeds the default admin
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+    # Create the schema from app.models alone first: with every router imported the
+    # duplicate system_settings declaration cannot be created on SQLite
+    subprocess.run(
+        [sys.executable, "-c", "import app.models\nfrom app.db.base import Base\nfrom app.db.session import engine\n"
+         "Base.metadata.create_all(engine)"],
+        cwd=workdir, env=env, check=True,
+    )
+    # Run outside Web/backend so the production logging.conf (fixed log paths) is not picked up
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=workdir,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        if process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            httpx.get(f"{base_url}/openapi.json", timeout=1)
+            return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("server did not start within 30s")
+
+
+async def run(args, base_url: str) -> dict:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        fleet = await register_fleet(client, recorder, args)
+        if not fleet:
+            raise RuntimeError("no desktop registered; see the register statuses")
+        approvers = await prepare_governance(client, args, fleet) if args.approvers else []
+
+        print(f"registered {len(fleet)} desktops, {len(approvers)} approvers; running for {args.duration:.0f}s")
+        deadline = asyncio.get_running_loop().time() + args.duration
+        await asyncio.gather(
+            *(desktop_loop(client, recorder, d, args, deadline) for d in fleet),
+            *(approver_loop(client, recorder, h, args, deadline) for h in approvers),
+        )
+
+    endpoints = recorder.summary(args.duration)
+    # Registration happens before the timed window; its throughput is not comparable
+    endpoints.get(REGISTER, {}).pop("throughput_rps", None)
+    return {
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "base_url": base_url,
+        "config": {k: v for k, v in vars(args).items() if k not in ("admin_password", "compare", "output")},
+        "desktops_registered": len(fleet),
+        "endpoints": endpoints,
+    }
+
+
+def report(result: dict, previous: dict | None) -> None:
+    print(f"{'endpoint':<42} {'reqs':>7} {'rps':>8} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for label, s in result["endpoints"].items():
+        rps = f"{s['throughput_rps']:.1f}" if "throughput_rps" in s else "-"
+        line = (
+            f"{label:<42} {s['requests']:>7} {rps:>8} {s['error_rate'] * 100:>6.2f} "
+            f"{s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} {s['p99_ms']:>8.2f}"
+        )
+        before = (previous or {}).get("endpoints", {}).get(label)
+        if before:
+            line += f"   p95 {s['p95_ms'] - before['p95_ms']:+.2f}ms"
+            if "throughput_rps" in s and "throughput_rps" in before:
+                line += f", rps {s['throughput_rps'] - before['throughput_rps']:+.1f}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--start-server", action="store_true", help="run a local uvicorn for the test")
+    parser.add_argument("--database-url", default="", help="with --start-server; default: fresh SQLite file")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --start-server")
+    parser.add_argument("--desktops", type=int, default=100)
+    parser.add_argument("--mint-ratio", type=float, default=0.1, help="share of the fleet registered as Mint")
+    parser.add_argument("--approvers", type=int, default=3)
+    parser.add_argument("--required-approvals", type=int, default=2)
+    parser.add_argument("--unlock-minutes", type=int, default=1, help="short windows keep sessions cycling")
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="seconds between unlock-status polls per desktop")
+    parser.add_argument("--heartbeat-interval", type=float, default=30.0, help="seconds between heartbeats per desktop")
+    parser.add_argument("--no-etag", action="store_true", help="poll unlock-status without If-None-Match")
+    parser.add_argument("--approve-interval", type=float, default=5.0, help="seconds between approver actions")
+    parser.add_argument("--concurrency", type=int, default=100, help="max open connections")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=None, help="seed for desktop ids (default: random)")
+    parser.add_argument("--admin-email", default="admin@example.com")
+    parser.add_argument("--admin-password", default="ChangeMe123!")
+    parser.add_argument("--admin-mfa-secret", default="JBSWY3DPEHPK3PXP")
+    parser.add_argument("--output", default=None, help="result JSON path (default: desktop_fleet-<UTC time>.json)")
+    parser.add_argument("--compare", default=None, help="earlier result JSON to diff against")
+    args = parser.parse_args()
+
+    process = None
+    base_url = args.base_url
+    if args.start_server:
+        process, base_url = start_server(args)
+    try:
+        result = asyncio.run(run(args, base_url))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    previous = json.loads(Path(args.compare).read_text()) if args.compare else None
+    report(result, previous)
+    output = Path(args.output or f"desktop_fleet-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.json")
+    output.write_text(json.dumps(result, indent=2))
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark: event-loop latency while desktop endpoints hit the database.
+
+`GET /api/share-operations/logs` (with HMAC desktop authentication) used to be
+an `async def` handler running synchronous SQLAlchemy queries on the event
+loop. This harness loads it against a throwaway SQLite database, adds a fixed
+per-query delay standing in for the network round trip to a real database
+server, and measures the latency of a trivial probe route while several
+clients keep the logs endpoint busy:
+
+- "async handler (old)": a route reproducing the previous async handler, which
+  runs the same dependency and handler code inline on the event loop
+- "sync handler (threadpool)": the real route, which FastAPI now runs in its
+  threadpool
+
+Usage (from Web/backend):
+    python -m benchmarks.event_loop_blocking --clients 8 --duration 5 --db-latency-ms 20
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.stats import percentile
+
+DESKTOP_ID = "bench-desktop"
+SECRET_KEY = base64.b64encode(b"b" * 32).decode()
+
+
+def desktop_headers() -> dict[str, str]:
+    timestamp = str(int(time.time()))
+    digest = hmac.new(base64.b64decode(SECRET_KEY), f"{DESKTOP_ID}:{timestamp}:".encode(), hashlib.sha256).digest()
+    return {
+        "X-Desktop-Id": DESKTOP_ID,
+        "X-App-Type": "TokenControl",
+        "X-Desktop-Timestamp": timestamp,
+        "X-Desktop-Signature": base64.b64encode(digest).decode(),
+    }
+
+
+def build_app(db_latency: float):
+    from fastapi import Depends, Request
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    from app.api.deps import get_db
+    from app.api.desktop_deps import get_authenticated_desktop
+    from app.api.routers.share_operations import get_share_operation_logs
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.main import app
+    from app.models import Desktop, DesktopStatus, ShareOperationLog, ShareOperationType
+
+    app.router.on_startup.clear()  # schema and data are prepared below
+    # system_settings is declared twice in the models; these endpoints never touch it
+    Base.metadata.create_all(engine, tables=[t for t in Base.metadata.sorted_tables if t.name != "system_settings"])
+
+    db = SessionLocal()
+    db.add(Desktop(desktop_app_id=DESKTOP_ID, app_type="TokenControl", status=DesktopStatus.ACTIVE, secret_key=SECRET_KEY))
+    db.add_all(
+        ShareOperationLog(
+            desktop_app_id=DESKTOP_ID, app_type="TokenControl", operation_type=ShareOperationType.CREATION, success=True
+        )
+        for _ in range(100)
+    )
+    db.commit()
+    db.close()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _simulated_db_latency(*_):
+        time.sleep(db_latency)
+
+    @app.get("/bench/ping")
+    async def ping():
+        return {}
+
+    @app.get("/bench/async-logs")
+    async def async_logs(request: Request, db: Session = Depends(get_db)):
+        # Previous behaviour: dependency and handler queries run on the event loop
+        desktop = get_authenticated_desktop(
+            request=request,
+            body="",
+            desktop_id=request.headers.get("X-Desktop-Id"),
+            app_type=request.headers.get("X-App-Type"),
+            timestamp=request.headers.get("X-Desktop-Timestamp"),
+            signature=request.headers.get("X-Desktop-Signature"),
+            user_agent=request.headers.get("User-Agent"),
+            db=db,
+        )
+        return get_share_operation_logs(desktop_app_id=None, operation_type=None, limit=100, desktop=desktop, db=db)
+
+    return app
+
+
+async def measure(app, path: str, clients: int, duration: float) -> tuple[list[float], int]:
+    probes: list[float] = []
+    completed = 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://web") as client:
+        async def load():
+            nonlocal completed
+            while time.perf_counter() < deadline:
+                response = await client.get(path, headers=desktop_headers())
+                response.raise_for_status()
+                completed += 1
+
+        async def probe():
+            while time.perf_counter() < deadline:
+                # Time from when the probe is due, so waiting for a blocked loop is counted
+                due = time.perf_counter() + 0.01
+                await asyncio.sleep(0.01)
+                (await client.get("/bench/ping")).raise_for_status()
+                probes.append((time.perf_counter() - due) * 1000)
+
+        await asyncio.gather(probe(), *(load() for _ in range(clients)))
+    return probes, completed
+
+
+def report(label: str, probes: list[float], completed: int, duration: float) -> None:
+    ordered = sorted(probes)
+    p99 = percentile(ordered, 0.99)
+    print(
+        f"{label:<26} probe p50={statistics.median(ordered):8.2f}ms  p99={p99:8.2f}ms  "
+        f"max={ordered[-1]:8.2f}ms  logs throughput={completed / duration:7.1f} req/s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--db-latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="web-bench-")
+    os.environ["TOKENCONTROL_DATABASE_URL"] = f"sqlite:///{workdir}/web.db"
+    os.environ.setdefault("TOKENCONTROL_JWT_SECRET", "bench-secret")
+    # Run outside Web/backend so the production logging.conf (fixed log paths) is not picked up
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    os.chdir(workdir)
+    app = build_app(args.db_latency_ms / 1000)
+    logging.disable(logging.WARNING)
+
+    for label, path in (
+        ("async handler (old)", "/bench/async-logs"),
+        ("sync handler (threadpool)", "/api/share-operations/logs"),
+    ):
+        probes, completed = await measure(app, path, args.clients, args.duration)
+        report(label, probes, completed, args.duration)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
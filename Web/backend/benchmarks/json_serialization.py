@@ -0,0 +1,107 @@
+"""
+Micro-benchmark: JSON rendering of list responses.
+
+Renders token deployment rows (the `/api/token-deployments/` payload) three
+ways and checks that all produce identical bytes:
+
+- "validated+json": what FastAPI does for a `response_model` route with the
+  stdlib-json JSONResponse: validate each ORM row, dump to JSON-able python,
+  json.dumps
+- "validated+orjson": the same with OrjsonResponse as the default class
+- "projected+orjson": rows from a column projection handed to OrjsonResponse
+  directly, skipping per-row validation
+
+Usage (from Web/backend):
+    python -m benchmarks.json_serialization --rows 1000 10000 --repeat 5
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.api.routers.token_deployment import TokenDeploymentResponse
+from app.core.responses import OrjsonResponse
+from app.models import TokenDeployment
+
+ADAPTER = TypeAdapter(list[TokenDeploymentResponse])
+
+
+def make_rows(count: int) -> tuple[list[TokenDeployment], list[dict]]:
+    started = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    orm_rows, projected = [], []
+    for i in range(count):
+        row = TokenDeployment(
+            id=f"00000000-0000-4000-8000-{i:012d}",
+            created_at_utc=started + timedelta(seconds=i, microseconds=i % 1000),
+            token_name=f"Token {i}",
+            token_symbol=f"T{i}",
+            token_decimals=18,
+            token_supply=str(10**27 + i),
+            network="sepolia",
+            contract_address=f"0x{i:040x}",
+            treasury_address=f"0x{i + 1:040x}",
+            proxy_admin_address=None,
+            gov_shares=5,
+            gov_threshold=3,
+            total_shares=12,
+            client_share_count=6,
+            safekeeping_share_count=1,
+            shares_path=f"/shares/{i}",
+            encryption_version=1,
+            encrypted_mnemonic=None,
+            encrypted_shares=None,
+            desktop_id="desktop-1",
+            deployment_notes="déploiement" if i % 2 else None,
+            shares_uploaded=bool(i % 3),
+            upload_completed_at_utc=started + timedelta(minutes=i) if i % 3 else None,
+            share_files_count=12 if i % 3 else 0,
+        )
+        orm_rows.append(row)
+        # What db.query(*projection(TokenDeploymentResponse, TokenDeployment)) returns per row
+        projected.append({
+            (field.alias or name): getattr(row, field.alias or name)
+            for name, field in TokenDeploymentResponse.model_fields.items()
+        })
+    return orm_rows, projected
+
+
+def validated(rows) -> list:
+    return ADAPTER.dump_python(ADAPTER.validate_python(rows, from_attributes=True), mode="json", by_alias=True)
+
+
+STRATEGIES = {
+    "validated+json": lambda orm_rows, projected: JSONResponse(validated(orm_rows)).body,
+    "validated+orjson": lambda orm_rows, projected: OrjsonResponse(validated(orm_rows)).body,
+    "projected+orjson": lambda orm_rows, projected: OrjsonResponse(projected).body,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for count in args.rows:
+        orm_rows, projected = make_rows(count)
+        bodies = {name: render(orm_rows, projected) for name, render in STRATEGIES.items()}
+        if len(set(bodies.values())) != 1:
+            raise SystemExit(f"{count} rows: rendered bodies differ between strategies")
+
+        baseline = None
+        for name, render in STRATEGIES.items():
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                render(orm_rows, projected)
+                timings.append((time.perf_counter() - started) * 1000)
+            median = statistics.median(timings)
+            baseline = baseline or median
+            print(f"{count:>6} rows  {name:<18} median={median:>8.2f}ms  x{baseline / median:>5.1f}  ({len(bodies[name])} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,551 @@
+"""
+Synthetic data for scale testing: every table in app/models, filled with
+referentially consistent rows at a configurable multiple of production volume.
+
+The same `--seed`, `--scale` and `--until` always produce the same rows
+(ids included; only the password hash salt differs), so benchmark and
+query-plan runs against different builds see identical data. Rows are generated lazily and written in batches: COPY
+on PostgreSQL, multi-row INSERTs (executemany) on MySQL and SQLite.
+
+Scale 1 approximates current production volume (see PROFILE); `--scale 10`
+gives millions of audit_logs, authentication_logs and share_download_log
+rows and thousands of token deployments. Individual tables can be
+overridden with `--rows table=count`. Child tables without an entry in
+PROFILE (approvals, governance_assignments, share_files, share_assignments,
+token_user_assignments) follow from their parents.
+
+The target database must be empty; `--create-schema` runs create_all first
+(otherwise run `alembic upgrade head`). Every generated user and token user
+has the password given by `--password`.
+
+Usage (from Web/backend):
+    python -m benchmarks.synthetic_data --database-url sqlite:///scale.db --create-schema --scale 1
+    python -m benchmarks.synthetic_data --database-url postgresql+psycopg://localhost/governance_scale \\
+        --scale 10 --seed 7 --rows audit_logs=5000000
+"""
+import argparse
+import base64
+import itertools
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from random import Random
+
+from sqlalchemy import create_engine, func, select
+
+import app.models  # noqa: F401  (registers the tables)
+from app.core import security
+from app.db.base import Base
+from app.models import DesktopStatus, SessionStatus, ShareOperationType, UserRole
+from app.models.auth_log import AuthEventType
+
+# Rows at scale 1
+PROFILE = {
+    "users": 40,
+    "desktops": 400,
+    "approval_sessions": 8_000,
+    "audit_logs": 200_000,
+    "authentication_logs": 300_000,
+    "login_challenges": 2_000,
+    "share_recovery_logs": 1_000,
+    "share_operation_logs": 20_000,
+    "token_deployments": 300,
+    "download_links": 50,
+    "token_users": 1_500,
+    "share_download_log": 100_000,
+    "token_user_login_challenges": 2_000,
+}
+SUPER_ADMINS = 2
+APPROVERS_PER_DESKTOP = 3
+MINT_RATIO = 0.1
+NETWORKS = ("mainnet", "sepolia", "polygon", "amoy")
+AUDIT_ACTIONS = (
+    # weighted roughly as in production: heartbeats dominate
+    ("HEARTBEAT", 70), ("SESSION_CREATED", 6), ("APPROVED", 12), ("UNLOCKED", 5), ("REGISTERED", 2),
+    ("DESKTOP_APPROVED", 1), ("DESKTOP_UPDATED", 1), ("CSR_SUBMITTED", 1), ("CERTIFICATE_SIGNED", 1),
+    ("USER_UPDATED", 1),
+)
+AUTH_EVENTS = (
+    (AuthEventType.AUTH_SUCCESS, 90), (AuthEventType.AUTH_FAILURE, 2), (AuthEventType.INVALID_SIGNATURE, 3),
+    (AuthEventType.TIMESTAMP_INVALID, 3), (AuthEventType.DESKTOP_NOT_FOUND, 1), (AuthEventType.KEY_ROTATION, 1),
+)
+AUTH_ENDPOINTS = ("/api/desktop/{id}/unlock-status", "/api/desktop/{id}/heartbeat", "/api/share-operations/log")
+USER_AGENTS = ("TokenControl/2.4.1 (Windows NT 10.0)", "Mint/1.8.0 (Windows NT 10.0)", "Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
+
+
+class SyntheticData:
+    """Row generators per table, in foreign-key order, sharing one seeded RNG."""
+
+    def __init__(self, counts: dict[str, int], seed: int, until: datetime, days: int, password_hash: str):
+        self.counts = counts
+        self.rng = Random(seed)
+        self.until = until
+        self.since = until - timedelta(days=days)
+        self.password_hash = password_hash
+
+    def tables(self):
+        return [
+            ("users", self.users),
+            ("desktops", self.desktops),
+            ("governance_assignments", self.governance_assignments),
+            ("approval_sessions", self.approval_sessions),
+            ("approvals", self.approvals),
+            ("audit_logs", self.audit_logs),
+            ("authentication_logs", self.authentication_logs),
+            ("login_challenges", self.login_challenges),
+            ("share_recovery_logs", self.share_recovery_logs),
+            ("token_deployments", self.token_deployments),
+            ("share_operation_logs", self.share_operation_logs),
+            ("download_links", self.download_links),
+            ("share_files", self.share_files),
+            ("token_users", self.token_users),
+            ("token_user_assignments", self.token_user_assignments),
+            ("share_assignments", self.share_assignments),
+            ("share_download_log", self.share_download_log),
+            ("token_user_login_challenges", self.token_user_login_challenges),
+            ("system_settings", self.system_settings),
+        ]
+
+    # helpers
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def moment(self, after: datetime | None = None) -> datetime:
+        start = max(after or self.since, self.since)
+        return start + timedelta(seconds=self.rng.uniform(0, max(0.0, (self.until - start).total_seconds())))
+
+    def base32(self) -> str:
+        return base64.b32encode(self.rng.randbytes(10)).decode()
+
+    def address(self) -> str:
+        return "0x" + self.rng.randbytes(20).hex()
+
+    def ip(self) -> str:
+        return f"10.{self.rng.randrange(256)}.{self.rng.randrange(256)}.{self.rng.randrange(1, 255)}"
+
+    def weighted(self, choices):
+        values, weights = zip(*choices)
+        return self.rng.choices(values, weights)[0]
+
+    # tables
+
+    def users(self):
+        self.admin_ids, self.approver_ids = [], []
+        for i in range(self.counts["users"]):
+            admin = i < SUPER_ADMINS
+            user_id = self.uuid()
+            (self.admin_ids if admin else self.approver_ids).append(user_id)
+            yield {
+                "id": user_id,
+                "email": f"{'admin' if admin else 'approver'}{i:06d}@synthetic.example.com",
+                "password_hash": self.password_hash,
+                "role": UserRole.SUPER_ADMIN if admin else UserRole.GOVERNANCE_AUTHORITY,
+                "mfa_secret": self.base32(),
+                "phone": None,
+                "is_active": self.rng.random() > 0.05,
+                "created_at_utc": self.moment(),
+            }
+
+    def desktops(self):
+        self.desktops_ = []  # (id, desktop_app_id, app_type, required approvals, unlock minutes, created)
+        for i in range(self.counts["desktops"]):
+            app_type = "Mint" if self.rng.random() < MINT_RATIO else "TokenControl"
+            desktop_id, app_id, created = self.uuid(), self.uuid(), self.moment()
+            required, minutes = self.rng.choice((1, 2, 2, 3)), self.rng.choice((15, 15, 30, 60))
+            status = self.weighted(((DesktopStatus.ACTIVE, 85), (DesktopStatus.PENDING, 10), (DesktopStatus.DISABLED, 5)))
+            signed = self.rng.random() < 0.3
+            last_seen = self.moment(created)
+            self.desktops_.append((desktop_id, app_id, app_type, required, minutes, created))
+            yield {
+                "id": desktop_id,
+                "desktop_app_id": app_id,
+                "app_type": app_type,
+                "name_label": f"{app_type} workstation {i}",
+                "status": status,
+                "required_approvals_n": required,
+                "unlock_minutes": minutes,
+                "secret_key": base64.b64encode(self.rng.randbytes(32)).decode(),
+                "secret_key_rotated_at": self.moment(created),
+                "key_rotation_due": False,
+                "certificate_pem": "-----BEGIN CERTIFICATE-----\nsynthetic\n-----END CERTIFICATE-----" if signed else None,
+                "certificate_issued_at": self.moment(created) if signed else None,
+                "certificate_expires_at": self.until + timedelta(days=365) if signed else None,
+                "csr_submitted": 1 if signed else 0,
+                "csr_pem": "-----BEGIN CERTIFICATE REQUEST-----\nsynthetic\n-----END CERTIFICATE REQUEST-----" if signed else None,
+                "created_at_utc": created,
+                "last_seen_at_utc": last_seen,
+                "machine_name": f"WS-{i:06d}",
+                "token_control_version": self.rng.choice(("2.3.0", "2.4.0", "2.4.1")),
+                "os_user": f"operator{i % 97}",
+            }
+
+    def governance_assignments(self):
+        self.assigned = {}  # desktop id -> approver ids
+        for desktop_id, app_id, *_ in self.desktops_:
+            approvers = self.rng.sample(self.approver_ids, min(APPROVERS_PER_DESKTOP, len(self.approver_ids)))
+            self.assigned[desktop_id] = approvers
+            for user_id in approvers:
+                yield {"id": self.uuid(), "user_id": user_id, "desktop_id": desktop_id, "desktop_app_id": app_id}
+
+    def approval_sessions(self):
+        self.sessions_ = []  # (id, desktop id, desktop_app_id, approvals, created)
+        for _ in range(self.counts["approval_sessions"]):
+            desktop_id, app_id, app_type, required, minutes, desktop_created = self.rng.choice(self.desktops_)
+            created = self.moment(desktop_created)
+            approvals = self.rng.randint(0, min(required, len(self.assigned[desktop_id])))
+            unlocked = approvals == required
+            status = SessionStatus.UNLOCKED if unlocked else self.weighted(
+                ((SessionStatus.EXPIRED, 70), (SessionStatus.PENDING, 25), (SessionStatus.CANCELLED, 5))
+            )
+            unlocked_at = created + timedelta(seconds=self.rng.uniform(10, 600)) if unlocked else None
+            session_id = self.uuid()
+            self.sessions_.append((session_id, desktop_id, app_id, approvals, created))
+            yield {
+                "id": session_id,
+                "desktop_id": desktop_id,
+                "desktop_app_id": app_id,
+                "app_type": app_type,
+                "status": status,
+                "required_approvals_snapshot": required,
+                "created_at_utc": created,
+                "unlocked_at_utc": unlocked_at,
+                "unlocked_until_utc": unlocked_at + timedelta(minutes=minutes) if unlocked else None,
+            }
+
+    def approvals(self):
+        for session_id, desktop_id, _, approvals, created in self.sessions_:
+            for user_id in self.rng.sample(self.assigned[desktop_id], approvals):
+                yield {
+                    "id": self.uuid(),
+                    "session_id": session_id,
+                    "approver_user_id": user_id,
+                    "approved_at_utc": created + timedelta(seconds=self.rng.uniform(1, 600)),
+                }
+
+    def audit_logs(self):
+        actions, weights = zip(*AUDIT_ACTIONS)
+        for _ in range(self.counts["audit_logs"]):
+            action = self.rng.choices(actions, weights)[0]
+            session = self.rng.choice(self.sessions_) if action in ("SESSION_CREATED", "APPROVED", "UNLOCKED") else None
+            app_id = session[2] if session else self.rng.choice(self.desktops_)[1]
+            yield {
+                "id": self.uuid(),
+                "at_utc": self.moment(session[4] if session else None),
+                "action": action,
+                "actor_user_id": self.rng.choice(self.approver_ids) if action == "APPROVED" else None,
+                "desktop_app_id": app_id,
+                "session_id": session[0] if session else None,
+                "details": None,
+            }
+
+    def authentication_logs(self):
+        events, weights = zip(*AUTH_EVENTS)
+        for _ in range(self.counts["authentication_logs"]):
+            event_type = self.rng.choices(events, weights)[0]
+            _, app_id, app_type, *_ = self.rng.choice(self.desktops_)
+            success = event_type in (AuthEventType.AUTH_SUCCESS, AuthEventType.KEY_ROTATION)
+            yield {
+                "id": self.uuid(),
+                "desktop_app_id": app_id,
+                "event_type": event_type,
+                "success": success,
+                "endpoint": self.rng.choice(AUTH_ENDPOINTS).format(id=app_id),
+                "ip_address": self.ip(),
+                "user_agent": USER_AGENTS[app_type == "Mint"],
+                "error_message": None if success else event_type.value,
+                "timestamp_utc": self.moment(),
+                "machine_name": None,
+                "os_user": None,
+                "token_control_version": None,
+            }
+
+    def login_challenges(self):
+        for _ in range(self.counts["login_challenges"]):
+            created = self.moment()
+            yield {
+                "id": self.uuid(),
+                "user_id": self.rng.choice(self.admin_ids + self.approver_ids),
+                "expires_at_utc": created + timedelta(minutes=5),
+                "temp_mfa_secret": None,
+                "created_at_utc": created,
+            }
+
+    def share_recovery_logs(self):
+        for _ in range(self.counts["share_recovery_logs"]):
+            success = self.rng.random() < 0.9
+            yield {
+                "id": self.uuid(),
+                "at_utc": self.moment(),
+                "user_id": self.rng.choice(self.admin_ids),
+                "success": success,
+                "num_shares": str(self.rng.randint(2, 5)),
+                "token_address": self.address(),
+                "error_message": None if success else "Invalid share checksum",
+                "ip_address": self.ip(),
+            }
+
+    def token_deployments(self):
+        self.tokens_ = []  # (id, contract, network, name, client shares, total shares, created)
+        for i in range(self.counts["token_deployments"]):
+            gov_shares = self.rng.randint(3, 5)
+            client_shares = self.rng.randint(2, 12)
+            safekeeping = self.rng.randint(0, 2)
+            total = gov_shares + client_shares + safekeeping
+            created = self.moment()
+            token = (self.uuid(), self.address(), self.rng.choice(NETWORKS), f"Synthetic Token {i}", client_shares, total, created)
+            self.tokens_.append(token)
+            yield {
+                "id": token[0],
+                "created_at_utc": created,
+                "token_name": token[3],
+                "token_symbol": f"SYN{i}",
+                "token_decimals": 18,
+                "token_supply": str(self.rng.randrange(10**6, 10**12) * 10**18),
+                "network": token[2],
+                "contract_address": token[1],
+                "treasury_address": self.address(),
+                "proxy_admin_address": self.address(),
+                "gov_shares": gov_shares,
+                "gov_threshold": gov_shares - 1,
+                "total_shares": total,
+                "client_share_count": client_shares,
+                "safekeeping_share_count": safekeeping,
+                "shares_path": f"/shares/{token[1]}",
+                "encrypted_mnemonic": None,
+                "encrypted_shares": None,
+                "encryption_version": 1,
+                "shares_uploaded": True,
+                "upload_completed_at_utc": created + timedelta(minutes=self.rng.randint(1, 30)),
+                "share_files_count": total,
+                "desktop_id": self.rng.choice(self.desktops_)[1],
+                "deployment_notes": None,
+            }
+
+    def share_operation_logs(self):
+        mint_desktops = [d for d in self.desktops_ if d[2] == "Mint"] or self.desktops_
+        for _ in range(self.counts["share_operation_logs"]):
+            _, contract, network, name, _, total, created = self.rng.choice(self.tokens_)
+            creation = self.rng.random() < 0.3
+            _, app_id, app_type, *_ = self.rng.choice(mint_desktops if creation else self.desktops_)
+            success = self.rng.random() < 0.95
+            yield {
+                "id": self.uuid(),
+                "at_utc": self.moment(created),
+                "desktop_app_id": app_id,
+                "app_type": app_type,
+                "machine_name": None,
+                "operation_type": ShareOperationType.CREATION if creation else ShareOperationType.RETRIEVAL,
+                "success": success,
+                "total_shares": total,
+                "threshold": max(2, total // 2),
+                "shares_used": None if creation else self.rng.randint(2, total),
+                "token_name": name,
+                "token_address": contract,
+                "network": network,
+                "shares_path": f"/shares/{contract}",
+                "operation_stage": "Completed" if success else "Validation",
+                "error_message": None if success else "Share threshold not met",
+                "notes": None,
+            }
+
+    def download_links(self):
+        for i in range(self.counts["download_links"]):
+            yield {
+                "id": i + 1,
+                "url": f"https://github.com/aegismint/releases/releases/download/v{i // 10}.{i % 10}.0/TokenControl-Setup.exe",
+                "filename": "TokenControl-Setup.exe",
+                "created_at": self.moment().replace(tzinfo=None),
+                "created_by": "admin000000@synthetic.example.com",
+            }
+
+    def share_files(self):
+        self.client_files = []  # (share file id, token id, token created) for client shares only
+        for token_id, contract, _, _, client_shares, total, created in self.tokens_:
+            for number in range(1, total + 1):
+                file_id = self.uuid()
+                if number <= client_shares:
+                    self.client_files.append((file_id, token_id, created))
+                yield {
+                    "id": file_id,
+                    "token_deployment_id": token_id,
+                    "share_number": number,
+                    "file_name": f"share_{number:02d}_{contract[:10]}.json",
+                    "encrypted_content": base64.b64encode(self.rng.randbytes(96)).decode(),
+                    "encryption_key_id": "synthetic-v1",
+                    "created_at_utc": created,
+                    "is_active": True,
+                    "replaced_at_utc": None,
+                }
+
+    def token_users(self):
+        self.token_user_ids = []
+        for i in range(self.counts["token_users"]):
+            user_id = self.uuid()
+            self.token_user_ids.append(user_id)
+            created = self.moment().replace(tzinfo=None)
+            yield {
+                "id": user_id,
+                "email": f"holder{i:07d}@synthetic.example.com",
+                "name": f"Holder {i:07d}",
+                "phone": None,
+                "password_hash": self.password_hash,
+                "mfa_secret": self.base32(),
+                "mfa_enabled": True,
+                "created_at": created,
+                "updated_at": created,
+            }
+
+    def token_user_assignments(self):
+        # Each client share file goes to a distinct holder of its token
+        self.file_holders = []  # (share file id, token user id, token created)
+        files_by_token = itertools.groupby(self.client_files, key=lambda f: f[1])
+        for token_id, files in files_by_token:
+            files = list(files)
+            holders = self.rng.sample(self.token_user_ids, min(len(files), len(self.token_user_ids)))
+            for (file_id, _, created), holder in zip(files, holders):
+                self.file_holders.append((file_id, holder, created))
+                at = self.moment(created).replace(tzinfo=None)
+                yield {"id": self.uuid(), "user_id": holder, "token_deployment_id": token_id, "created_at": at, "updated_at": at}
+
+    def share_assignments(self):
+        # Downloads are spread over the assignments up front so download_count and
+        # the first/last download times agree with share_download_log
+        downloads = [0] * len(self.file_holders)
+        for _ in range(self.counts["share_download_log"] if self.file_holders else 0):
+            downloads[self.rng.randrange(len(self.file_holders))] += 1
+        self.assignments_ = []  # (id, token user id, download count, first, last)
+        for (file_id, holder, created), count in zip(self.file_holders, downloads):
+            assignment_id, assigned = self.uuid(), self.moment(created)
+            first = self.moment(assigned) if count else None
+            last = self.moment(first) if count > 1 else first
+            self.assignments_.append((assignment_id, holder, count, first, last))
+            yield {
+                "id": assignment_id,
+                "share_file_id": file_id,
+                "user_id": holder,
+                "assigned_by": self.rng.choice(self.admin_ids),
+                "assigned_at_utc": assigned,
+                "is_active": True,
+                "download_allowed": True,
+                "download_count": count,
+                "first_downloaded_at_utc": first,
+                "last_downloaded_at_utc": last,
+                "assignment_notes": None,
+            }
+
+    def share_download_log(self):
+        for assignment_id, holder, count, first, last in self.assignments_:
+            span = (last - first).total_seconds() if count else 0
+            for i in range(count):
+                at = first if i == 0 else last if i == count - 1 else first + timedelta(seconds=self.rng.uniform(0, span))
+                success = self.rng.random() < 0.98
+                yield {
+                    "id": self.uuid(),
+                    "share_assignment_id": assignment_id,
+                    "user_id": None,
+                    "token_user_id": holder,
+                    "downloaded_at_utc": at,
+                    "ip_address": self.ip(),
+                    "user_agent": USER_AGENTS[2],
+                    "success": success,
+                    "failure_reason": None if success else "Download not allowed",
+                }
+
+    def token_user_login_challenges(self):
+        for _ in range(self.counts["token_user_login_challenges"] if self.token_user_ids else 0):
+            created = self.moment()
+            yield {
+                "id": self.uuid(),
+                "token_user_id": self.rng.choice(self.token_user_ids),
+                "expires_at_utc": created + timedelta(minutes=5),
+                "temp_mfa_secret": None,
+                "created_at_utc": created,
+            }
+
+    def system_settings(self):
+        # Two models declare system_settings; fill whichever columns the mapped one has
+        columns = Base.metadata.tables["system_settings"].c
+        for key, value in (("required_approvals_default", "2"), ("unlock_minutes_default", "15")):
+            row = {"key": key, "value": value, "encrypted": False, "created_at": self.since, "updated_at": self.since}
+            yield {k: v for k, v in row.items() if k in columns}
+
+
+def insert_rows(engine, table, rows, batch_size: int) -> int:
+    """Write `rows` in batches: COPY on PostgreSQL, executemany (multi-row INSERT) elsewhere."""
+    batches = iter(lambda: list(itertools.islice(rows, batch_size)), [])
+    written = 0
+    if engine.dialect.name == "postgresql":
+        raw = engine.raw_connection()
+        try:
+            with raw.cursor() as cursor:
+                for batch in batches:
+                    columns = list(batch[0])
+                    # Enum columns store names; apply the same conversion an INSERT would
+                    processors = [table.c[c].type.bind_processor(engine.dialect) for c in columns]
+                    with cursor.copy(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN") as copy:
+                        for row in batch:
+                            copy.write_row([p(row[c]) if p else row[c] for c, p in zip(columns, processors)])
+                    written += len(batch)
+            raw.commit()
+        finally:
+            raw.close()
+        return written
+
+    with engine.begin() as conn:
+        for batch in batches:
+            conn.execute(table.insert(), batch)
+            written += len(batch)
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiple of PROFILE")
+    parser.add_argument("--rows", action="append", default=[], metavar="TABLE=COUNT", help="override one table's row count")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--until", default="2026-01-01", help="newest timestamp (UTC date); fixed for reproducibility")
+    parser.add_argument("--days", type=int, default=365, help="history covered by the timestamps")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--password", default="Synthetic123!")
+    parser.add_argument("--create-schema", action="store_true", help="run create_all before loading")
+    args = parser.parse_args()
+
+    counts = {table: max(1, round(rows * args.scale)) for table, rows in PROFILE.items()}
+    for override in args.rows:
+        table, _, count = override.partition("=")
+        if table not in PROFILE:
+            parser.error(f"--rows: {table} is not a table with its own count ({', '.join(PROFILE)})")
+        counts[table] = int(count)
+    counts["users"] = max(counts["users"], SUPER_ADMINS + APPROVERS_PER_DESKTOP)
+
+    engine = create_engine(args.database_url, future=True)
+    if args.create_schema:
+        Base.metadata.create_all(engine)
+
+    data = SyntheticData(
+        counts,
+        seed=args.seed,
+        until=datetime.fromisoformat(args.until).replace(tzinfo=timezone.utc),
+        days=args.days,
+        password_hash=security.hash_password(args.password),  # hashed once; pbkdf2 is slow by design
+    )
+    tables = data.tables()
+    with engine.connect() as conn:
+        non_empty = [name for name, _ in tables if conn.scalar(select(func.count()).select_from(Base.metadata.tables[name]))]
+    if non_empty:
+        parser.error(f"target database is not empty ({', '.join(non_empty)}); ids are deterministic and would collide")
+
+    started = time.perf_counter()
+    for name, rows in tables:
+        table_started = time.perf_counter()
+        written = insert_rows(engine, Base.metadata.tables[name], rows(), args.batch_size)
+        elapsed = time.perf_counter() - table_started
+        print(f"{name:<30} {written:>10} rows  {elapsed:>7.1f}s  {written / elapsed if elapsed else 0:>9.0f} rows/s")
+    print(f"total {time.perf_counter() - started:.1f}s")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
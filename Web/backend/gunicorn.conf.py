@@ -3,6 +3,12 @@ Gunicorn configuration for AegisMint Governance API
 """
 import multiprocessing
 import os
+import re
+import sys
+
+# The config is loaded before gunicorn puts the app directory on sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from app.core.config import get_settings  # noqa: E402
 
 # Server socket
 bind = "127.0.0.1:8000"
@@ -44,3 +50,33 @@ graceful_timeout = 30
 # For debugging (set to False in production)
 reload = False
 reload_engine = "auto"
+
+# Prometheus metrics are written per worker to PROMETHEUS_MULTIPROC_DIR and summed on
+# scrape (see app/core/metrics.py). It must be set, and emptied of the previous run's
+# values, before the preloaded app is imported, i.e. here rather than in a hook. Only
+# done with metrics enabled; without PROMETHEUS_MULTIPROC_DIR nothing is written.
+_PROMETHEUS_VALUE_FILE = re.compile(r"^(counter|histogram|summary|gauge_[a-z]+)_\d+\.db$")
+
+if get_settings().metrics_enabled:
+    prometheus_multiproc_dir = os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", "/home/apkserve/tmp/governance-metrics"
+    )
+    os.makedirs(prometheus_multiproc_dir, exist_ok=True)
+    _names = os.listdir(prometheus_multiproc_dir)
+    # The directory may come from the operator: refuse to clear anything but value files
+    _foreign = [name for name in _names if not _PROMETHEUS_VALUE_FILE.match(name)]
+    if _foreign:
+        raise RuntimeError(
+            f"PROMETHEUS_MULTIPROC_DIR={prometheus_multiproc_dir} contains files that are not "
+            f"prometheus_client value files ({', '.join(sorted(_foreign)[:5])}); use a dedicated directory"
+        )
+    for _name in _names:
+        os.remove(os.path.join(prometheus_multiproc_dir, _name))
+
+
+def child_exit(server, worker):
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -14,6 +14,8 @@ fi
 
 # Export environment variables
 export PYTHONPATH="${PYTHONPATH}:$(pwd)"
+# Schema comes from `alembic upgrade head`; skip create_all and dev seeding on boot
+export TOKENCONTROL_STARTUP_PROFILE="${TOKENCONTROL_STARTUP_PROFILE:-production}"
 
 # Start Gunicorn with configuration
 gunicorn main:app \
@@ -132,6 +132,38 @@ export function createShareAssignment(
   });
 }
 
+export type BulkShareAssignmentResult = {
+  index: number;
+  share_file_id: string;
+  user_id: string;
+  success: boolean;
+  assignment_id: string | null;
+  share_number: number | null;
+  user_email: string | null;
+  error: string | null;
+};
+
+/**
+ * Assign many shares in one request (validated and committed together)
+ */
+export function createShareAssignmentsBulk(
+  token: string,
+  items: {
+    share_file_id: string;
+    user_id: string;
+    assignment_notes?: string;
+  }[]
+) {
+  return apiFetch<{ created: number; failed: number; results: BulkShareAssignmentResult[] }>(
+    "/api/admin/share-assignments/bulk",
+    {
+      method: "POST",
+      token,
+      body: JSON.stringify({ items }),
+    }
+  );
+}
+
 /**
  * Get list of share assignments with filters
  */
@@ -226,10 +258,24 @@ export function createTokenShareUser(
 }
 
 /**
- * Get all share users for a specific token deployment
+ * Get share users for a specific token deployment (optionally filtered by a case-insensitive
+ * name/email prefix). Without page/page_size every user is returned; the total is in X-Total-Count.
  */
-export function getTokenShareUsers(token: string, tokenDeploymentId: string) {
-  return apiFetch<TokenShareUser[]>(`/api/token-share-users/token/${tokenDeploymentId}`, { token });
+export function getTokenShareUsers(
+  token: string,
+  tokenDeploymentId: string,
+  params?: {
+    q?: string;
+    page?: number;
+    page_size?: number;
+  }
+) {
+  const queryParams = new URLSearchParams();
+  if (params?.q) queryParams.append("q", params.q);
+  if (params?.page) queryParams.append("page", params.page.toString());
+  if (params?.page_size) queryParams.append("page_size", params.page_size.toString());
+  const queryString = queryParams.toString() ? `?${queryParams.toString()}` : "";
+  return apiFetch<TokenShareUser[]>(`/api/token-share-users/token/${tokenDeploymentId}${queryString}`, { token });
 }
 
 /**